@@ -1,3 +1,12 @@
-from .agent import root_agent, get_agent
+from .agent import ROOT_AGENT, get_agent
+from .registry import agent_registry
 
-__all__ = ["root_agent", "get_agent"]
\ No newline at end of file
+
+def __getattr__(name: str):
+    # root_agent is built on first access, see registry.py
+    if name == "root_agent":
+        return get_agent()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+__all__ = ["root_agent", "get_agent", "agent_registry", "ROOT_AGENT"]
@@ -19,6 +19,7 @@ Current Sub-Agents:
     - Kubernetes Agent: Cluster exploration expert with MCP tools
     - Metrics Agent: Prometheus/Thanos metrics expert with MCP tools
     - Incident Detection Agent: Cluster health incident analysis with MCP tools
+    - Alerts Agent: Runs metrics and incident detection concurrently for alert questions
     - OpenShift Docs Agent: Documentation expert with Google Search
     - Future: Insights recommendations, korrel8r Agent
 
@@ -30,13 +31,21 @@ Current Status:
 """
 
 from google.adk.agents import LlmAgent
-from google.adk.models.lite_llm import LiteLlm
-from google.adk.tools import AgentTool
 from config import config
-from .kubernetes_agent import kubernetes_agent
-from .metrics_agent import metrics_agent
-from .openshift_docs_agent import openshift_docs_agent
-from .incident_detection_agent import incident_detection_agent
+# Imported for their agent_registry factories; agents are built on first use (registry.py)
+from . import (  # noqa: F401
+    alerts_agent,
+    incident_detection_agent,
+    kubernetes_agent,
+    metrics_agent,
+    openshift_docs_agent,
+)
+from .fast_router import fast_router
+from .relay import response_relay
+from .history import history_compactor
+from .registry import agent_registry
+
+ROOT_AGENT = "openshift_router"
 
 # TEMPORARY: Using sub_agents for better event propagation
 # TODO: Revert to AgentTool once PR #3991 merges
@@ -49,38 +58,33 @@ from .incident_detection_agent import incident_detection_agent
 # Current sub_agents approach shares InvocationContext, allowing
 # tool calls from kubernetes_agent to propagate to frontend
 
-# Wrap docs agent as AgentTool to isolate google_search from function calling
-# google_search cannot work in sub_agents due to function calling conflict
-docs_tool = AgentTool(agent=openshift_docs_agent)
-
-# Router agent - orchestrates all specialized agents
-root_agent = LlmAgent(
-    model=LiteLlm(model=f"openai/{config.OPENAI_MODEL}"),
-    name="openshift_router",
-    instruction="""
+_INSTRUCTION = """
 You are the orchestrator for an OpenShift/Kubernetes AI assistant system.
 
 Your responsibilities:
 1. Analyze user queries to determine which specialized agent should handle them
 2. Transfer control to appropriate agents (Kubernetes, Metrics, Incidents, or Documentation)
-3. Relay responses back to the user clearly and concisely
+3. Let specialist answers stand - they are shown to the user directly
 4. If a query spans multiple domains, coordinate between agents
 
 Current available agents and tools:
 - kubernetes_expert: Cluster state exploration (pods, namespaces, events, resources, logs)
 - metrics_expert: Prometheus/Thanos metrics queries (PromQL, time-series data, metrics analysis)
 - incident_detection_expert: Cluster health incidents and root cause analysis
+- alerts_expert: Firing alerts - queries metrics_expert and incident_detection_expert concurrently and combines them
 - openshift_docs_expert: Search official OpenShift 4.20 documentation (call this as a tool)
 
 Delegation pattern:
 - Use transfer_to_agent(agent_name='kubernetes_expert') for cluster resource queries
 - Use transfer_to_agent(agent_name='metrics_expert') for metrics/observability queries
 - Use transfer_to_agent(agent_name='incident_detection_expert') for incident analysis
+- Use transfer_to_agent(agent_name='alerts_expert') for questions about alerts
 - Use openshift_docs_expert tool for documentation questions (called as a regular tool, not transfer_to_agent)
-- The agent will return with its findings, then you relay to the user
+- The agent's answer is streamed to the user directly; you only respond again when answers
+  from several agents must be combined
 
 Guidelines:
-- Always relay agent responses without modification unless clarification is needed
+- Never repeat or rephrase a specialist's answer; only add text that combines answers from several agents
 - If unsure which agent to use, ask the user for clarification
 - Keep responses focused and actionable
 - IMPORTANT: Any question about OpenShift or Kubernetes concepts, features, or "how to" must go to openshift_docs_expert first
@@ -105,13 +109,10 @@ When to transfer to incident_detection_expert:
 - User asks "what incidents are firing", "explain this incident", etc.
 
 SPECIAL CASE - When user asks about alerts:
-- Transfer to BOTH metrics_expert AND incident_detection_expert
-- First get alerts from metrics_expert (Prometheus firing alerts)
-- Then get incidents from incident_detection_expert (detected health issues)
-- Combine both responses to give complete picture:
-  * metrics_expert provides: Which Prometheus alerts are firing, alert details, metrics
-  * incident_detection_expert provides: Detected incidents, root causes, remediation
-- Present both alert AND incident information together for comprehensive analysis
+- Transfer to alerts_expert (do NOT transfer to metrics_expert and incident_detection_expert one after the other)
+- alerts_expert runs both concurrently and combines them into one answer:
+  * Prometheus alerts firing, alert details, metrics (from metrics_expert)
+  * Detected incidents, root causes, remediation (from incident_detection_expert)
 
 When to use openshift_docs_expert tool:
 - User asks GENERIC "how do I..." questions about OpenShift/Kubernetes features or procedures
@@ -131,10 +132,47 @@ When to answer directly:
 - Greeting the user or acknowledging their message
 - Asking clarifying questions about what they need
 - Simple routing explanations ("I'll check the cluster state for you", etc.)
-""",
-    sub_agents=[kubernetes_agent, metrics_agent, incident_detection_agent],
-    tools=[docs_tool],
-)
+"""
+
+
+@agent_registry.register(ROOT_AGENT)
+def build_root_agent() -> LlmAgent:
+    from google.adk.models.lite_llm import LiteLlm
+    from google.adk.tools import AgentTool
+
+    # Wrap docs agent as AgentTool to isolate google_search from function calling
+    # google_search cannot work in sub_agents due to function calling conflict
+    docs_tool = AgentTool(agent=agent_registry.get("openshift_docs_expert"))
+
+    # Router agent - orchestrates all specialized agents
+    return LlmAgent(
+        model=LiteLlm(model=f"openai/{config.OPENAI_MODEL}"),
+        name=ROOT_AGENT,
+        instruction=_INSTRUCTION,
+        sub_agents=[
+            agent_registry.get(name)
+            for name in ("kubernetes_expert", "metrics_expert", "incident_detection_expert", "alerts_expert")
+        ],
+        tools=[docs_tool],
+        # Unambiguous queries are routed locally without the LLM call (see fast_router.py),
+        # single specialist answers are forwarded instead of re-generated (see relay.py)
+        before_model_callback=[
+            fast_router.before_model,
+            response_relay.before_model,
+            history_compactor.before_model,
+        ],
+        after_model_callback=fast_router.after_model,
+    )
+
+
+def _import_litellm() -> None:
+    # ADK imports LiteLLM on the first LLM call (~4s on a cold worker), i.e. during the
+    # first chat request; this is the same import with the same settings
+    from google.adk.models import lite_llm
+    lite_llm._ensure_litellm_imported()
+
+
+agent_registry.add_warmer("litellm", _import_litellm)
 
 
 def get_agent() -> LlmAgent:
@@ -144,4 +182,11 @@ def get_agent() -> LlmAgent:
     Returns:
         LlmAgent: The router agent (multi-agent orchestrator)
     """
-    return root_agent
+    return agent_registry.get(ROOT_AGENT)
+
+
+def __getattr__(name: str):
+    # root_agent is built on first access (adk web/run load it as agent.root_agent)
+    if name == "root_agent":
+        return get_agent()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,236 @@
+"""
+Alerts Agent - concurrent fan-out across metrics_expert and incident_detection_expert.
+
+"What alerts are firing?" needs both Prometheus alerts (obs-mcp) and detected incidents
+(incident detection MCP). Transferring to one specialist after the other doubles the
+wall-clock time, so alerts_expert runs both concurrently and merges their findings:
+
+    alerts_expert (FanOutAgent)
+        ├── alerts_prometheus (clone of metrics_expert)      ─┐ concurrent, own branch
+        ├── alerts_incidents (clone of incident_detection_expert) ─┘ and per-branch timeout
+        └── alerts_synthesizer (combines both findings into one answer)
+
+Each branch runs on its own ADK branch, so neither sees the other's tool calls, and
+its tool calls and results are yielded as they happen so the frontend shows progress
+from both. Branch text is not: AG-UI streams the text of an invocation as one assistant
+message, so two concurrent answers would interleave into it. Only the synthesizer
+streams text. Branch answers reach it through session state (output_key; the branch's
+final event is forwarded with its content stripped); a branch that fails or exceeds
+ALERTS_BRANCH_TIMEOUT_SECONDS records that instead, so the synthesizer still answers
+with what the other branch found.
+"""
+
+from typing import AsyncGenerator, Optional
+import asyncio
+import logging
+from google.adk.agents import BaseAgent, LlmAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event, EventActions
+from google.genai import types
+from config import config
+from .history import history_compactor
+from .registry import agent_registry
+from .tools import get_incident_snapshot, graph_timeseries_data
+
+logger = logging.getLogger(__name__)
+
+
+class _BranchDone:
+    """Queue marker emitted after one branch finishes."""
+
+
+def _branch_event(event: Event) -> Optional[Event]:
+    """
+    The part of a branch event to forward: tool calls and results, and state changes
+    (the branch's answer in output_key) without the text. None to drop the event.
+    """
+    if event.partial:
+        return None
+    parts = event.content.parts if event.content and event.content.parts else []
+    tool_parts = [p for p in parts if p.function_call or p.function_response]
+    if tool_parts:
+        if len(tool_parts) == len(parts):
+            return event
+        return event.model_copy(update={"content": types.Content(role=event.content.role, parts=tool_parts)})
+    if event.actions.state_delta:
+        return event.model_copy(update={"content": None})
+    return None
+
+
+class FanOutAgent(BaseAgent):
+    """
+    Runs all sub-agents but the last concurrently, then the last one.
+
+    The concurrent branches are expected to write their answer to session state via
+    output_key; the last sub-agent (the synthesizer) reads those keys from its
+    instruction. Branch failures and timeouts are written to the same keys.
+    """
+
+    branch_timeout_seconds: float = 90.0
+
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        *branches, synthesizer = self.sub_agents
+        queue: asyncio.Queue = asyncio.Queue()
+
+        async def run_branch(branch: BaseAgent) -> None:
+            branch_ctx = ctx.model_copy()
+            # Same dot-separated form as ADK's ParallelAgent branches
+            name = f"{self.name}.{branch.name}"
+            branch_ctx.branch = f"{ctx.branch}.{name}" if ctx.branch else name
+            started = asyncio.get_running_loop().time()
+            outcome = None
+            try:
+                async with asyncio.timeout(self.branch_timeout_seconds):
+                    async for event in branch.run_async(branch_ctx):
+                        event = _branch_event(event)
+                        if event is None:
+                            continue
+                        consumed = asyncio.Event()
+                        await queue.put((event, consumed))
+                        # Wait until the runner has processed the event (state, session)
+                        await consumed.wait()
+            except TimeoutError:
+                outcome = f"No result: timed out after {self.branch_timeout_seconds:.0f}s"
+                logger.warning(f"{self.name}: branch {branch.name} timed out")
+            except Exception as e:
+                outcome = f"No result: failed with {type(e).__name__}: {e}"
+                logger.warning(f"{self.name}: branch {branch.name} failed: {e}")
+            else:
+                elapsed = asyncio.get_running_loop().time() - started
+                logger.info(f"{self.name}: branch {branch.name} finished in {elapsed:.2f}s")
+
+            output_key = getattr(branch, "output_key", None)
+            if outcome and output_key:
+                await queue.put((
+                    Event(
+                        invocation_id=ctx.invocation_id,
+                        author=branch.name,
+                        branch=branch_ctx.branch,
+                        actions=EventActions(state_delta={output_key: outcome}),
+                    ),
+                    None,
+                ))
+            await queue.put((_BranchDone(), None))
+
+        tasks = [asyncio.create_task(run_branch(branch)) for branch in branches]
+        try:
+            pending = len(tasks)
+            while pending:
+                event, consumed = await queue.get()
+                if isinstance(event, _BranchDone):
+                    pending -= 1
+                    continue
+                yield event
+                if consumed is not None:
+                    consumed.set()
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        async for event in synthesizer.run_async(ctx):
+            yield event
+
+
+_DESCRIPTION = """
+    Answers questions about firing alerts by querying Prometheus alerts and detected
+    incidents concurrently and combining them into one analysis.
+    """
+
+_BRANCH_RULES = """
+
+## Alerts fan-out
+
+You are running as one branch of the alerts_expert fan-out, concurrently with another
+specialist. Do not transfer to other agents and do not draw charts. Collect the facts
+for your part of the question and answer concisely; another agent writes the final
+response to the user.
+"""
+
+_PROMETHEUS_PART = """
+Your part: the Prometheus alerts currently firing. Query ALERTS{alertstate="firing"} with
+execute_instant_query and report alert name, severity, namespace and the affected
+workload for each.
+"""
+
+_PROMETHEUS_SNAPSHOT_PART = """
+Your part: the Prometheus alerts currently firing. Call get_incident_snapshot and report
+alert name, severity, namespace and the affected workload for each of its firing_alerts,
+with their data_as_of time. Query ALERTS{alertstate="firing"} with execute_instant_query
+only if the snapshot returns an error.
+"""
+
+_INCIDENTS_PART = """
+Your part: the incidents currently detected, with severity, affected components and
+root cause.
+"""
+
+_SYNTHESIZER_INSTRUCTION = """
+You combine the findings of two specialists who just investigated the user's question
+about alerts in parallel.
+
+Prometheus alerts (from metrics_expert):
+{alerts_prometheus_findings?}
+
+Detected incidents (from incident_detection_expert):
+{alerts_incident_findings?}
+
+Answer the user's latest question with one response:
+1. **Summary**: How many alerts are firing and how many incidents are detected, overall severity
+2. **Alerts**: The firing alerts, most severe first
+3. **Incidents**: Each incident with severity, affected components and root cause
+4. **Correlation**: Which alerts belong to which incident
+5. **Next Steps**: Recommended investigation or remediation
+
+If one side has no result (timed out or failed), say so briefly and answer with the other.
+Do not invent alerts or incidents that are not in the findings.
+"""
+
+
+@agent_registry.register("alerts_expert")
+def build_alerts_agent() -> FanOutAgent:
+    from google.adk.models.lite_llm import LiteLlm
+
+    metrics_agent = agent_registry.get("metrics_expert")
+    incident_detection_agent = agent_registry.get("incident_detection_expert")
+    # With the incident snapshot, both branches answer from memory (tools/incident_snapshot.py)
+    snapshot = config.INCIDENT_SNAPSHOT_ENABLED
+
+    alerts_prometheus_agent = metrics_agent.clone(update={
+        "name": "alerts_prometheus",
+        "description": "Lists firing Prometheus alerts for the alerts fan-out.",
+        "instruction": metrics_agent.instruction + _BRANCH_RULES + (
+            _PROMETHEUS_SNAPSHOT_PART if snapshot else _PROMETHEUS_PART
+        ),
+        "tools": [t for t in metrics_agent.tools if t is not graph_timeseries_data]
+        + ([get_incident_snapshot] if snapshot else []),
+        "output_key": "alerts_prometheus_findings",
+        "disallow_transfer_to_parent": True,
+        "disallow_transfer_to_peers": True,
+    })
+
+    alerts_incidents_agent = incident_detection_agent.clone(update={
+        "name": "alerts_incidents",
+        "description": "Lists detected incidents for the alerts fan-out.",
+        "instruction": incident_detection_agent.instruction + _BRANCH_RULES + _INCIDENTS_PART,
+        "output_key": "alerts_incident_findings",
+        "disallow_transfer_to_parent": True,
+        "disallow_transfer_to_peers": True,
+    })
+
+    alerts_synthesizer = LlmAgent(
+        model=LiteLlm(model=f"openai/{config.OPENAI_MODEL}"),
+        name="alerts_synthesizer",
+        description="Combines firing alerts and detected incidents into one answer.",
+        instruction=_SYNTHESIZER_INSTRUCTION,
+        disallow_transfer_to_parent=True,
+        disallow_transfer_to_peers=True,
+        before_model_callback=history_compactor.before_model,
+    )
+
+    return FanOutAgent(
+        name="alerts_expert",
+        description=_DESCRIPTION,
+        sub_agents=[alerts_prometheus_agent, alerts_incidents_agent, alerts_synthesizer],
+        branch_timeout_seconds=config.ALERTS_BRANCH_TIMEOUT_SECONDS,
+    )
@@ -0,0 +1,87 @@
+"""
+Model callbacks shared by the agents.
+
+ADK runs before_model_callback right before each LLM call with the assembled
+LlmRequest. These callbacks rewrite what the model sees without touching the session
+events, so the frontend still receives the complete tool results over AG-UI.
+
+Callbacks:
+    strip_chart_data_for_llm: Replace raw chart series in graph tool results with their
+        summary statistics (the chart data is for the frontend, not for the model)
+"""
+
+from typing import Optional
+import json
+import logging
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models import LlmRequest, LlmResponse
+from google.genai import types
+
+logger = logging.getLogger(__name__)
+
+# Tools whose results carry full chart series for the frontend
+CHART_TOOLS = {"graph_timeseries_data"}
+
+
+def _compact_chart(chart: dict) -> dict:
+    """Drop the raw series of one chart payload, keep everything else (incl. summary)."""
+    compact = {k: v for k, v in chart.items() if k != "data"}
+    if "data" in chart and "summary" not in chart:
+        compact["note"] = "Chart rendered for the user; raw series omitted"
+    return compact
+
+
+def _compact_chart_result(response: dict) -> Optional[dict]:
+    """Compact a graph tool function response ({"result": "<json>"}); None if unchanged."""
+    raw = response.get("result")
+    if not isinstance(raw, str):
+        return None
+    try:
+        payload = json.loads(raw)
+    except json.JSONDecodeError:
+        return None
+    if not isinstance(payload, dict):
+        return None
+
+    if "data" not in payload:
+        return None
+    payload = _compact_chart(payload)
+    return {**response, "result": json.dumps(payload)}
+
+
+def strip_chart_data_for_llm(
+    callback_context: CallbackContext, llm_request: LlmRequest
+) -> Optional[LlmResponse]:
+    """
+    Replace chart series in graph tool results with their summaries before the LLM call.
+
+    The session keeps the full tool result (the frontend renders the chart from it);
+    only the copy sent to the model is compacted.
+    """
+    before = 0
+    after = 0
+    for i, content in enumerate(llm_request.contents):
+        if not content.parts:
+            continue
+        parts = list(content.parts)
+        changed = False
+        for j, part in enumerate(parts):
+            fr = part.function_response
+            if fr is None or fr.name not in CHART_TOOLS or not isinstance(fr.response, dict):
+                continue
+            compact = _compact_chart_result(fr.response)
+            if compact is None:
+                continue
+            before += len(fr.response["result"])
+            after += len(compact["result"])
+            # Build new objects - contents may share references with session events
+            parts[j] = types.Part(
+                function_response=types.FunctionResponse(id=fr.id, name=fr.name, response=compact)
+            )
+            changed = True
+        if changed:
+            llm_request.contents[i] = types.Content(role=content.role, parts=parts)
+
+    if before:
+        logger.debug(f"Compacted chart tool results for LLM: {before} -> {after} chars")
+    return None
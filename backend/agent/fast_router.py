@@ -0,0 +1,240 @@
+"""
+Deterministic fast-path router in front of the openshift_router LLM.
+
+Every user turn normally starts with a router LLM call whose only job is to pick a
+specialist. For clearly unambiguous queries ("what incidents are firing", "CPU usage of
+namespace X", "list pods in ns Y", "how do I configure ...") a local classifier makes
+the same decision in microseconds: the router's before_model_callback answers with the
+transfer_to_agent call (or the openshift_docs_expert tool call) itself, so the model
+round trip is skipped. Anything ambiguous falls through to the LLM router unchanged.
+
+The classifier is pluggable - anything with classify(text) -> Optional[RouteDecision]:
+
+    fast_router.classifier = MyClassifier()
+
+Every decision is logged with the rule that fired and the estimated time saved (the
+running average latency of router LLM calls), so routing accuracy can be audited.
+Counters are reported under fast_router in GET /health.
+"""
+
+from dataclasses import dataclass
+from typing import Optional, Protocol
+import logging
+import re
+import time
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models import LlmRequest, LlmResponse
+from google.genai import types
+from config import config
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RouteDecision:
+    """Where a query goes: a sub-agent transfer or an agent tool call."""
+
+    target: str
+    rule: str
+    as_tool: bool = False
+
+
+class Classifier(Protocol):
+    def classify(self, text: str) -> Optional[RouteDecision]:
+        """Return a decision for an unambiguous query, None to defer to the LLM router."""
+        ...
+
+
+@dataclass
+class Rule:
+    """Regex rule voting for one target, unless one of its exclusions matches."""
+
+    name: str
+    target: str
+    pattern: re.Pattern
+    unless: Optional[re.Pattern] = None
+    as_tool: bool = False
+
+
+_RESOURCES = (
+    r"pods?|deployments?|namespaces?|projects?|services?|nodes?|configmaps?|secrets?|routes?"
+    r"|statefulsets?|daemonsets?|replicasets?|jobs?|cronjobs?|events?|ingress(es)?|pvcs?"
+    r"|persistent ?volume( ?claim)?s?"
+)
+_LIVE_STATE = re.compile(
+    r"\b(my|our|this) cluster\b|\bin (the )?cluster\b|\bnamespace\b|\bcurrently\b|\bright now\b",
+    re.I,
+)
+
+DEFAULT_RULES = [
+    Rule(
+        "alerts",
+        "alerts_expert",
+        re.compile(r"\balerts?\b|\balerting\b", re.I),
+    ),
+    Rule(
+        "incidents",
+        "incident_detection_expert",
+        re.compile(
+            r"\bincidents?\b|\bcluster health\b|\bwhat'?s wrong with (my|the) cluster\b"
+            r"|\broot cause\b",
+            re.I,
+        ),
+        # Alerts together with incidents is the alerts_expert fan-out
+        unless=re.compile(r"\balerts?\b", re.I),
+    ),
+    Rule(
+        "metrics",
+        "metrics_expert",
+        re.compile(
+            r"\b(cpu|memory|network|disk|bandwidth|storage)\s+(usage|utili[sz]ation|consumption"
+            r"|trend|saturation|pressure)\b|\bpromql\b|\bprometheus\b|\bthanos\b"
+            r"|\b(graph|chart|plot)\b|\btop \d+\b.*\bby (cpu|memory)\b|\bmetrics?\b",
+            re.I,
+        ),
+    ),
+    Rule(
+        "kubernetes",
+        "kubernetes_expert",
+        re.compile(
+            rf"\b(list|show( me)?|get|which|what)\s+(all\s+|the\s+)?(running\s+|failing\s+)?"
+            rf"({_RESOURCES})\b|\blogs? (of|for|from)\b|\bdescribe (the )?({_RESOURCES})\b",
+            re.I,
+        ),
+    ),
+    Rule(
+        "docs",
+        "openshift_docs_expert",
+        re.compile(
+            r"^\s*(how (do|can|should) (i|we|you)|how to|what is an? |what does .+ mean"
+            r"|explain (what|how))",
+            re.I,
+        ),
+        unless=_LIVE_STATE,
+        as_tool=True,
+    ),
+]
+
+class KeywordClassifier:
+    """
+    Rule-based classifier: routes only when rules for exactly one target match.
+
+    A query matching rules of two targets (e.g. "how do I graph CPU usage") is
+    ambiguous and left to the LLM router.
+    """
+
+    def __init__(self, rules: list[Rule]):
+        self.rules = rules
+
+    def match(self, text: str) -> dict[str, Rule]:
+        """First matching rule per target."""
+        matched: dict[str, Rule] = {}
+        for rule in self.rules:
+            if rule.pattern.search(text) and not (rule.unless and rule.unless.search(text)):
+                matched.setdefault(rule.target, rule)
+        return matched
+
+    def classify(self, text: str) -> Optional[RouteDecision]:
+        matched = self.match(text)
+        if len(matched) != 1:
+            return None
+        rule = next(iter(matched.values()))
+        return RouteDecision(target=rule.target, rule=rule.name, as_tool=rule.as_tool)
+
+
+# Preamble ADK puts before another agent's relayed messages and tool calls
+_OTHER_AGENT_PREFIX = "For context:"
+
+
+def _turn_start_text(llm_request: LlmRequest) -> Optional[str]:
+    """The user's message if this LLM call starts the turn, None for follow-up calls."""
+    if not llm_request.contents:
+        return None
+    last = llm_request.contents[-1]
+    if last.role != "user" or not last.parts:
+        return None
+    if any(part.function_response is not None for part in last.parts):
+        # Called again after a tool result - not the routing decision
+        return None
+    if (last.parts[0].text or "").startswith(_OTHER_AGENT_PREFIX):
+        # ADK relays another agent's output as user content - not the user's message
+        return None
+    text = " ".join(part.text for part in last.parts if part.text)
+    return text.strip() or None
+
+
+class FastPathRouter:
+    """Router before/after model callbacks plus decision statistics."""
+
+    def __init__(self, classifier: Classifier, enabled: bool = True):
+        self.classifier = classifier
+        self.enabled = enabled
+        self.routed: dict[str, int] = {}
+        self.fallbacks = 0
+        self.saved_seconds = 0.0
+        # Running average of router LLM latency, the estimate of what a fast path saves
+        self.llm_latency = 0.0
+        self.llm_calls = 0
+        self._started: dict[str, float] = {}
+
+    def before_model(
+        self, callback_context: CallbackContext, llm_request: LlmRequest
+    ) -> Optional[LlmResponse]:
+        """Answer the routing call locally when the query is unambiguous."""
+        text = _turn_start_text(llm_request) if self.enabled else None
+        decision = self.classifier.classify(text) if text else None
+
+        if decision is None:
+            if text:
+                self.fallbacks += 1
+                logger.info(f"Fast-path router: no confident route, using LLM router for {text[:120]!r}")
+                if len(self._started) > 1000:
+                    # Calls that failed never reach after_model
+                    self._started.clear()
+                self._started[callback_context.invocation_id] = time.monotonic()
+            return None
+
+        self.routed[decision.target] = self.routed.get(decision.target, 0) + 1
+        self.saved_seconds += self.llm_latency
+        logger.info(
+            f"Fast-path router: {decision.target} (rule={decision.rule}, "
+            f"saved ~{self.llm_latency * 1000:.0f}ms) for {text[:120]!r}"
+        )
+        if decision.as_tool:
+            call = types.FunctionCall(name=decision.target, args={"request": text})
+        else:
+            call = types.FunctionCall(
+                name="transfer_to_agent", args={"agent_name": decision.target}
+            )
+        return LlmResponse(content=types.Content(role="model", parts=[types.Part(function_call=call)]))
+
+    def after_model(
+        self, callback_context: CallbackContext, llm_response: LlmResponse
+    ) -> Optional[LlmResponse]:
+        """Track router LLM latency (the time a fast-path decision saves)."""
+        if llm_response.partial:
+            return None
+        started = self._started.pop(callback_context.invocation_id, None)
+        if started is not None:
+            latency = time.monotonic() - started
+            self.llm_calls += 1
+            # Exponential moving average, seeded with the first observation
+            alpha = 0.2 if self.llm_calls > 1 else 1.0
+            self.llm_latency += alpha * (latency - self.llm_latency)
+        return None
+
+    def stats(self) -> dict:
+        routed = sum(self.routed.values())
+        decisions = routed + self.fallbacks
+        return {
+            "enabled": self.enabled,
+            "routed": dict(self.routed),
+            "fallbacks": self.fallbacks,
+            "fast_path_ratio": round(routed / decisions, 3) if decisions else 0.0,
+            "router_llm_latency_seconds": round(self.llm_latency, 3),
+            "estimated_saved_seconds": round(self.saved_seconds, 3),
+        }
+
+
+keyword_classifier = KeywordClassifier(DEFAULT_RULES)
+fast_router = FastPathRouter(keyword_classifier, enabled=config.FAST_ROUTER_ENABLED)
@@ -0,0 +1,220 @@
+"""
+Conversation history compaction for long troubleshooting sessions.
+
+Every LLM call re-sends the whole conversation, including every earlier tool output
+(pod lists, logs, Prometheus results). HistoryCompactor is a before_model_callback that
+keeps the prompt under HISTORY_TOKEN_BUDGET once a session grows past it:
+
+    1. Tool results older than the last HISTORY_KEEP_TURNS user turns are replaced by
+       short structured digests (keys, sizes, truncated values)
+    2. If that is not enough, those older turns are folded into one summary message
+       (question, tools used, answer excerpt per turn)
+
+Recent turns stay verbatim, and so does any tool result carrying an artifact_id (the
+id is how the user and the model refer back to a chart). Like strip_chart_data_for_llm
+it only rewrites the copy sent to the model; session events are untouched.
+
+Prompt token estimates before and after each compaction are logged per turn and
+reported under history_compaction in GET /health.
+"""
+
+from collections import deque
+from typing import Any, Optional
+import json
+import logging
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models import LlmRequest, LlmResponse
+from google.genai import types
+from config import config
+
+logger = logging.getLogger(__name__)
+
+_CONTEXT_PREFIX = "For context:"  # ADK's wrapper for other agents' messages
+_TEXT_LIMIT = 200
+_MAX_KEYS = 12
+
+
+def _part_chars(part: types.Part) -> int:
+    if part.text:
+        return len(part.text)
+    if part.function_call:
+        return len(part.function_call.name or "") + len(json.dumps(part.function_call.args or {}, default=str))
+    if part.function_response:
+        return len(json.dumps(part.function_response.response or {}, default=str))
+    return 0
+
+
+def estimate_tokens(contents: list[types.Content]) -> int:
+    """Rough prompt token count of request contents (~4 characters per token)."""
+    chars = sum(_part_chars(part) for content in contents for part in content.parts or [])
+    return chars // 4
+
+
+def _truncate(text: str, limit: int = _TEXT_LIMIT) -> str:
+    if len(text) <= limit:
+        return text
+    return f"{text[:limit]}… (+{len(text) - limit} chars)"
+
+
+def _digest(value: Any, depth: int = 0) -> Any:
+    """Structure-preserving digest: small scalars kept, long text truncated, collections sized."""
+    if isinstance(value, str):
+        stripped = value.strip()
+        if stripped[:1] in ("{", "[") and len(stripped) > _TEXT_LIMIT:
+            try:
+                return _digest(json.loads(stripped), depth)
+            except json.JSONDecodeError:
+                pass
+        lines = value.count("\n") + 1
+        text = _truncate(value)
+        return f"{text} [{lines} lines]" if lines > 3 and text != value else text
+    if isinstance(value, list):
+        if depth >= 2:
+            return f"[{len(value)} items]"
+        return {"items": len(value), "first": [_digest(v, depth + 1) for v in value[:2]]}
+    if isinstance(value, dict):
+        if depth >= 2:
+            return f"{{{len(value)} keys}}"
+        digest = {k: _digest(v, depth + 1) for k, v in list(value.items())[:_MAX_KEYS]}
+        if len(value) > _MAX_KEYS:
+            digest["…"] = f"{len(value) - _MAX_KEYS} more keys"
+        return digest
+    return value
+
+
+def _references_artifact(part: types.Part) -> bool:
+    return bool(part.function_response) and "artifact_id" in json.dumps(
+        part.function_response.response or {}, default=str
+    )
+
+
+def _is_turn_start(content: types.Content) -> bool:
+    """A user message typed by the user (not a tool result or another agent's output)."""
+    if content.role != "user" or not content.parts:
+        return False
+    texts = [p.text for p in content.parts if p.text]
+    return bool(texts) and not texts[0].startswith(_CONTEXT_PREFIX) and not any(
+        p.function_response for p in content.parts
+    )
+
+
+def _digest_tool_results(content: types.Content) -> types.Content:
+    parts = []
+    for part in content.parts or []:
+        fr = part.function_response
+        if fr is None or _references_artifact(part):
+            parts.append(part)
+            continue
+        response = {
+            "compacted": True,
+            "original_chars": _part_chars(part),
+            "digest": _digest(fr.response or {}),
+        }
+        parts.append(types.Part(function_response=types.FunctionResponse(id=fr.id, name=fr.name, response=response)))
+    return types.Content(role=content.role, parts=parts)
+
+
+def _summarize_turns(contents: list[types.Content]) -> types.Content:
+    """Fold whole turns into one user message; tool call/response pairs are dropped."""
+    lines = []
+    turn: dict = {}
+
+    def flush():
+        if turn:
+            line = f"- User: {_truncate(turn.get('question', ''), 150)}"
+            if turn.get("tools"):
+                line += f" | Tools: {', '.join(dict.fromkeys(turn['tools']))}"
+            if turn.get("answer"):
+                line += f" | Answer: {_truncate(turn['answer'], 300)}"
+            lines.append(line)
+            lines.extend(f"  Artifact: {a}" for a in turn.get("artifacts", []))
+
+    for content in contents:
+        if _is_turn_start(content):
+            flush()
+            turn = {"question": " ".join(p.text for p in content.parts if p.text)}
+            continue
+        for part in content.parts or []:
+            if part.function_call:
+                turn.setdefault("tools", []).append(part.function_call.name)
+            elif _references_artifact(part):
+                turn.setdefault("artifacts", []).append(
+                    json.dumps(part.function_response.response, default=str)
+                )
+            elif part.text and content.role == "model":
+                turn["answer"] = part.text
+    flush()
+    text = f"[Summary of {len(lines)} earlier conversation turns, compacted]\n" + "\n".join(lines)
+    return types.Content(role="user", parts=[types.Part(text=text)])
+
+
+class HistoryCompactor:
+    """before_model_callback keeping the prompt under a token budget."""
+
+    def __init__(self, token_budget: int, keep_turns: int, enabled: bool = True):
+        self.token_budget = token_budget
+        self.keep_turns = keep_turns
+        self.enabled = enabled
+        self.compactions = 0
+        self.tokens_before = 0
+        self.tokens_after = 0
+        self.recent: deque[dict] = deque(maxlen=50)
+
+    def before_model(
+        self, callback_context: CallbackContext, llm_request: LlmRequest
+    ) -> Optional[LlmResponse]:
+        if not self.enabled:
+            return None
+        contents = llm_request.contents
+        before = estimate_tokens(contents)
+        if before <= self.token_budget:
+            return None
+
+        turn_starts = [i for i, content in enumerate(contents) if _is_turn_start(content)]
+        keep_turns = max(self.keep_turns, 1)  # never compact the current turn
+        if len(turn_starts) <= keep_turns:
+            return None
+        boundary = turn_starts[-keep_turns]
+        old, recent = contents[:boundary], contents[boundary:]
+
+        old = [_digest_tool_results(content) for content in old]
+        stage = "digest"
+        if estimate_tokens(old) + estimate_tokens(recent) > self.token_budget:
+            old = [_summarize_turns(old)]
+            stage = "summary"
+
+        llm_request.contents = old + recent
+        after = estimate_tokens(llm_request.contents)
+        self.compactions += 1
+        self.tokens_before += before
+        self.tokens_after += after
+        record = {
+            "agent": callback_context.agent_name,
+            "invocation_id": callback_context.invocation_id,
+            "stage": stage,
+            "tokens_before": before,
+            "tokens_after": after,
+        }
+        self.recent.append(record)
+        logger.info(
+            f"History compaction ({stage}) for {callback_context.agent_name}: "
+            f"~{before} -> ~{after} prompt tokens"
+        )
+        return None
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "token_budget": self.token_budget,
+            "compactions": self.compactions,
+            "tokens_before": self.tokens_before,
+            "tokens_after": self.tokens_after,
+            "recent": list(self.recent)[-10:],
+        }
+
+
+history_compactor = HistoryCompactor(
+    token_budget=config.HISTORY_TOKEN_BUDGET,
+    keep_turns=config.HISTORY_KEEP_TURNS,
+    enabled=config.HISTORY_COMPACTION_ENABLED,
+)
@@ -6,36 +6,19 @@ MCP tools from incident detection server running on port 8003.
 """
 
 from google.adk.agents import LlmAgent
-from google.adk.models.lite_llm import LiteLlm
-from google.adk.tools.mcp_tool import McpToolset
-from google.adk.tools.mcp_tool.mcp_session_manager import StreamableHTTPConnectionParams
 from config import config
+from .history import history_compactor
+from .registry import agent_registry
+from .tools.incident_snapshot import get_incident_snapshot
 
-# Connect to incident detection MCP server via HTTP
-# Requires port forwarding: kubectl port-forward -n openshift-cluster-observability-operator svc/cluster-health-mcp-server 8003:8085
-# Build auth header with Bearer token format
-auth_token = config.OPENSHIFT_USER_TOKEN or ""
-auth_header = f"Bearer {auth_token}" if auth_token else ""
-
-incident_detection_toolset = McpToolset(
-    connection_params=StreamableHTTPConnectionParams(
-        url="http://localhost:8003/mcp",
-        headers={
-            "kubernetes-authorization": auth_header
-        } if auth_header else {}
-    )
-)
-
-incident_detection_agent = LlmAgent(
-    model=LiteLlm(model=f"openai/{config.OPENAI_MODEL}"),
-    name="incident_detection_expert",
-    description="""
+_DESCRIPTION = """
     Analyzes cluster health incidents detected by OpenShift cluster observability.
     Retrieves and explains active incidents, their severity, and root causes.
     Provides incident details including affected components, symptoms, and suggested remediation.
     Works in coordination with metrics_expert to correlate alerts with detected incidents.
-    """,
-    instruction="""
+    """
+
+_INSTRUCTION = """
 You are a cluster health and incident analysis expert with read-only access to detected incidents.
 
 ## Your Capabilities
@@ -133,6 +116,60 @@ Both incidents are impacting cluster stability. Immediate action recommended on
 - Defer to metrics_expert for: Prometheus alerts, metrics queries
 - Defer to kubernetes_expert for: Live resource inspection, logs
 - You focus on incident detection and root cause analysis
-""",
-    tools=[incident_detection_toolset],
-)
+"""
+
+_SNAPSHOT_RULES = """
+## Incident snapshot
+
+get_incident_snapshot returns the incidents and firing alerts polled in the background.
+Call it FIRST for any question about current incidents or alerts and state its data_as_of
+time in your answer. Call get_incidents only if the user asks for fresher data, a time
+range or a severity filter, or if the snapshot returns an error.
+"""
+
+
+@agent_registry.register("incident_detection_expert")
+def build_incident_detection_agent() -> LlmAgent:
+    from google.adk.models.lite_llm import LiteLlm
+    from google.adk.tools.mcp_tool import McpToolset
+    from google.adk.tools.mcp_tool.mcp_session_manager import StreamableHTTPConnectionParams
+    from .tools.coalescing import CoalescingToolset
+    from .tools.resilience import ResilientToolset
+
+    # Connect to incident detection MCP server via HTTP
+    # Requires port forwarding: kubectl port-forward -n openshift-cluster-observability-operator svc/cluster-health-mcp-server 8003:8085
+    # Build auth header with Bearer token format
+    auth_token = config.OPENSHIFT_USER_TOKEN or ""
+    auth_header = f"Bearer {auth_token}" if auth_token else ""
+
+    # During an outage every session asks for the same incidents: identical concurrent
+    # calls share one request (tools/coalescing.py)
+    incident_detection_toolset = CoalescingToolset.from_config(
+        ResilientToolset.from_config(
+            McpToolset(
+                connection_params=StreamableHTTPConnectionParams(
+                    url=config.INCIDENTS_MCP_URL,
+                    headers={
+                        "kubernetes-authorization": auth_header
+                    } if auth_header else {}
+                )
+            ),
+            name="incidents",
+        )
+    )
+
+    tools = [incident_detection_toolset]
+    instruction = _INSTRUCTION
+    if config.INCIDENT_SNAPSHOT_ENABLED:
+        # Current incidents and alerts are answered from the background snapshot
+        tools.append(get_incident_snapshot)
+        instruction += _SNAPSHOT_RULES
+
+    return LlmAgent(
+        model=LiteLlm(model=f"openai/{config.OPENAI_MODEL}"),
+        name="incident_detection_expert",
+        description=_DESCRIPTION,
+        instruction=instruction,
+        tools=tools,
+        before_model_callback=history_compactor.before_model,
+    )
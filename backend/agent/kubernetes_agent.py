@@ -6,28 +6,18 @@ MCP tools from kubernetes-mcp-server running on port 8001.
 """
 
 from google.adk.agents import LlmAgent
-from google.adk.models.lite_llm import LiteLlm
-from google.adk.tools.mcp_tool import McpToolset
-from google.adk.tools.mcp_tool.mcp_session_manager import StreamableHTTPConnectionParams
 from config import config
+from .history import history_compactor
+from .registry import agent_registry
 
-# Connect to kubernetes-mcp-server via HTTP
-kubernetes_toolset = McpToolset(
-    connection_params=StreamableHTTPConnectionParams(
-        url="http://localhost:8001/mcp"
-    )
-)
-
-kubernetes_agent = LlmAgent(
-    model=LiteLlm(model=f"openai/{config.OPENAI_MODEL}"),
-    name="kubernetes_expert",
-    description="""
+_DESCRIPTION = """
     Inspects live Kubernetes/OpenShift cluster resources with read-only access.
     Can list and view pods, namespaces, nodes, deployments, services, events, and logs.
     Enforces query scoping to prevent overly broad requests (always asks for namespace when needed).
     Provides detailed resource inspection and explains cluster state.
-    """,
-    instruction="""
+    """
+
+_INSTRUCTION = """
     You are a Kubernetes/OpenShift cluster exploration expert with read-only access.
 
     You have access to MCP tools dynamically discovered from kubernetes-mcp-server. Use ALL available tools as needed.
@@ -65,6 +55,36 @@ kubernetes_agent = LlmAgent(
     - Format YAML/JSON output clearly
     - Explain what the data means
     - Suggest next steps if relevant
-    """,
-    tools=[kubernetes_toolset],
-)
+    """
+
+
+@agent_registry.register("kubernetes_expert")
+def build_kubernetes_agent() -> LlmAgent:
+    # LiteLLM's adapter and the MCP client are imported when the agent is first built
+    from google.adk.models.lite_llm import LiteLlm
+    from google.adk.tools.mcp_tool import McpToolset
+    from google.adk.tools.mcp_tool.mcp_session_manager import StreamableHTTPConnectionParams
+    from .tools.coalescing import CoalescingToolset
+    from .tools.resilience import ResilientToolset
+
+    # Connect to kubernetes-mcp-server via HTTP, behind a bulkhead and circuit breaker;
+    # identical concurrent read-only calls share one request
+    kubernetes_toolset = CoalescingToolset.from_config(
+        ResilientToolset.from_config(
+            McpToolset(
+                connection_params=StreamableHTTPConnectionParams(
+                    url="http://localhost:8001/mcp"
+                )
+            ),
+            name="kubernetes",
+        )
+    )
+
+    return LlmAgent(
+        model=LiteLlm(model=f"openai/{config.OPENAI_MODEL}"),
+        name="kubernetes_expert",
+        description=_DESCRIPTION,
+        instruction=_INSTRUCTION,
+        tools=[kubernetes_toolset],
+        before_model_callback=history_compactor.before_model,
+    )
@@ -6,19 +6,17 @@ Google Search with site restriction to official Red Hat docs.
 """
 
 from google.adk.agents import LlmAgent
-from google.adk.tools import google_search
 from config import config
+from .registry import agent_registry
 
-openshift_docs_agent = LlmAgent(
-    model=config.GEMINI_MODEL,
-    name="openshift_docs_expert",
-    description="""
+_DESCRIPTION = """
     Searches official Red Hat OpenShift 4.20 documentation using Google Search.
     Assumes all questions are about OpenShift unless explicitly stated otherwise.
     Provides official guidance, best practices, and configuration procedures with documentation links.
     Always restricts searches to docs.redhat.com/en/documentation/openshift_container_platform/4.20.
-    """,
-    instruction="""
+    """
+
+_INSTRUCTION = """
 You are an OpenShift documentation expert that helps users find information in official Red Hat documentation.
 
 ## CRITICAL ASSUMPTION
@@ -99,6 +97,17 @@ When presenting documentation findings:
 - Defer to kubernetes_expert for actual cluster inspection
 - Defer to metrics_expert for metrics queries
 - You provide documentation guidance, not live cluster analysis
-""",
-    tools=[google_search],
-)
+"""
+
+
+@agent_registry.register("openshift_docs_expert")
+def build_openshift_docs_agent() -> LlmAgent:
+    from google.adk.tools import google_search
+
+    return LlmAgent(
+        model=config.GEMINI_MODEL,
+        name="openshift_docs_expert",
+        description=_DESCRIPTION,
+        instruction=_INSTRUCTION,
+        tools=[google_search],
+    )
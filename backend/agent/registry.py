@@ -0,0 +1,115 @@
+"""
+Lazy agent registry.
+
+Building the agent tree means importing LiteLLM's ADK adapter and the MCP client stack
+and constructing every LlmAgent and McpToolset. That used to happen when `main` was
+imported, so every worker (and every tool or script importing `agent`) paid for all
+of it before it could answer anything, and LiteLLM itself was only imported by ADK on
+the first chat request (~4s on a cold worker).
+
+Agent modules register a factory per agent instead:
+
+    @agent_registry.register("kubernetes_expert")
+    def build_kubernetes_agent() -> LlmAgent:
+        ...
+
+    agent_registry.get("kubernetes_expert")   # built on first use, then cached
+
+Factories may get() other agents (the router builds its sub-agents). Heavy imports
+registered with add_warmer() run in warm(), which main.py starts in the background at
+startup: GET /health answers while the agents are built in a worker thread, and GET
+/ready answers 503 until they are. Build and warm-up times are reported under agents
+in GET /health.
+"""
+
+from typing import Any, Callable, Iterable, Optional
+import asyncio
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class AgentRegistry:
+    """Builds registered agents once, on first use or in warm()."""
+
+    def __init__(self):
+        self._factories: dict[str, Callable[[], Any]] = {}
+        self._warmers: dict[str, Callable[[], None]] = {}
+        self._built: dict[str, Any] = {}
+        self._build_seconds: dict[str, float] = {}
+        self._warm_seconds: dict[str, float] = {}
+        # Reentrant: factories build their sub-agents through get()
+        self._lock = threading.RLock()
+        self.status = "pending"
+        self.error: Optional[str] = None
+
+    def register(self, name: str, factory: Optional[Callable[[], Any]] = None):
+        """Register the factory building name; usable as a decorator."""
+        def decorator(factory: Callable[[], Any]) -> Callable[[], Any]:
+            self._factories[name] = factory
+            return factory
+        return decorator(factory) if factory is not None else decorator
+
+    def add_warmer(self, name: str, warmer: Callable[[], None]) -> None:
+        """Register an expensive import or setup step to run in warm() instead of on first use."""
+        self._warmers[name] = warmer
+
+    def get(self, name: str) -> Any:
+        """The agent registered as name, built on the first call."""
+        built = self._built.get(name)
+        if built is not None:
+            return built
+        with self._lock:
+            if name in self._built:
+                return self._built[name]
+            if name not in self._factories:
+                raise KeyError(f"no agent registered as {name!r}")
+            started = time.perf_counter()
+            built = self._factories[name]()
+            self._build_seconds[name] = time.perf_counter() - started
+            self._built[name] = built
+            logger.info(f"Built {name} in {self._build_seconds[name] * 1000:.0f}ms")
+            return built
+
+    async def aget(self, name: str) -> Any:
+        """get() for the event loop: a first build runs in a worker thread."""
+        built = self._built.get(name)
+        if built is not None:
+            return built
+        return await asyncio.to_thread(self.get, name)
+
+    def _warm(self, names: Iterable[str]) -> None:
+        for name, warmer in self._warmers.items():
+            started = time.perf_counter()
+            warmer()
+            self._warm_seconds[name] = time.perf_counter() - started
+        for name in names:
+            self.get(name)
+
+    async def warm(self, names: Iterable[str]) -> bool:
+        """Run the warmers and build names (and everything they use) in a worker thread."""
+        started = time.perf_counter()
+        try:
+            await asyncio.to_thread(self._warm, list(names))
+        except Exception as e:
+            self.status = "failed"
+            self.error = f"{type(e).__name__}: {e}"
+            logger.exception("Agent warm-up failed; agents are built on first use instead")
+            return False
+        self.status = "ok"
+        logger.info(f"Agents warmed up in {time.perf_counter() - started:.2f}s")
+        return True
+
+    def stats(self) -> dict:
+        return {
+            "status": self.status,
+            "error": self.error,
+            "registered": sorted(self._factories),
+            "built_ms": {name: round(s * 1000, 1) for name, s in self._build_seconds.items()},
+            "warmers_ms": {name: round(s * 1000, 1) for name, s in self._warm_seconds.items()},
+        }
+
+
+agent_registry = AgentRegistry()
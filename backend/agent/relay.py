@@ -0,0 +1,142 @@
+"""
+Pass-through relay of specialist answers for the openshift_router.
+
+Without it the router LLM runs once more after a specialist has answered and
+re-generates that answer token by token - output tokens are paid twice and the time
+to the last token roughly doubles. The relay is a before_model_callback on the router
+that skips this call when there is nothing to synthesize:
+
+    - openshift_docs_expert (an AgentTool) answered: its text is emitted as the
+      router's response directly, without an LLM call
+    - exactly one specialist answered and handed control back, and the question
+      doesn't involve another domain: the answer is already on the AG-UI stream,
+      so the turn ends
+
+When several agents contributed (or the question spans several domains) the router LLM
+runs as before and combines the answers. Relayed answers and the output tokens saved
+are reported under relay in GET /health.
+"""
+
+from typing import Callable, Optional
+import logging
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.events import Event
+from google.adk.models import LlmRequest, LlmResponse
+from google.genai import types
+from config import config
+from .fast_router import keyword_classifier
+
+logger = logging.getLogger(__name__)
+
+
+def _estimate_tokens(text: str) -> int:
+    """Rough output token count (~4 characters per token) when no usage is reported."""
+    return max(1, len(text) // 4)
+
+
+def _event_text(event: Event) -> str:
+    if not event.content or not event.content.parts:
+        return ""
+    return "".join(part.text for part in event.content.parts if part.text and not part.thought)
+
+
+class ResponseRelay:
+    """Router before_model_callback that forwards single-source answers verbatim."""
+
+    def __init__(
+        self,
+        relay_tools: set[str],
+        domains: Optional[Callable[[str], set[str]]] = None,
+        enabled: bool = True,
+    ):
+        """
+        Args:
+            relay_tools: Agent tools whose result text is the answer (e.g. openshift_docs_expert)
+            domains: Optional function naming the agents a question involves; a hand-back
+                is only relayed if no other agent is named
+            enabled: Turn relaying off to always let the router LLM respond
+        """
+        self.relay_tools = relay_tools
+        self.domains = domains
+        self.enabled = enabled
+        self.relayed_tool_answers = 0
+        self.relayed_handbacks = 0
+        self.synthesized = 0
+        self.saved_output_tokens = 0
+
+    def before_model(
+        self, callback_context: CallbackContext, llm_request: LlmRequest
+    ) -> Optional[LlmResponse]:
+        if not self.enabled or not llm_request.contents:
+            return None
+        router = callback_context.agent_name
+        events = [
+            e for e in callback_context.session.events
+            if e.invocation_id == callback_context.invocation_id and not e.partial
+        ]
+        answered = {e.author for e in events if e.author not in (router, "user") and _event_text(e)}
+
+        last = llm_request.contents[-1]
+        responses = [p.function_response for p in last.parts or [] if p.function_response]
+        if responses and all(r.name in self.relay_tools for r in responses):
+            router_calls = {
+                call.name for e in events if e.author == router for call in e.get_function_calls()
+            }
+            if not answered and router_calls <= self.relay_tools:
+                return self._relay_tool_answer(responses)
+
+        if not answered:
+            return None
+        handed_back = any(
+            r.name == "transfer_to_agent" for r in (events[-1].get_function_responses() if events else [])
+        )
+        question = next((_event_text(e) for e in events if e.author == "user"), "")
+        others = (self.domains(question) if self.domains and question else set()) - answered
+        if len(answered) == 1 and handed_back and not others:
+            return self._end_turn(events, answered)
+
+        self.synthesized += 1
+        logger.info(f"Relay: router synthesizes answers from {sorted(answered)}")
+        return None
+
+    def _relay_tool_answer(self, responses: list[types.FunctionResponse]) -> Optional[LlmResponse]:
+        texts = [str((r.response or {}).get("result", "")).strip() for r in responses]
+        text = "\n\n".join(t for t in texts if t)
+        if not text:
+            return None
+        saved = _estimate_tokens(text)
+        self.relayed_tool_answers += 1
+        self.saved_output_tokens += saved
+        logger.info(f"Relay: forwarded {', '.join(r.name for r in responses)} answer (~{saved} tokens saved)")
+        return LlmResponse(content=types.Content(role="model", parts=[types.Part(text=text)]))
+
+    def _end_turn(self, events: list[Event], answered: set[str]) -> LlmResponse:
+        saved = 0
+        for event in events:
+            text = _event_text(event)
+            if event.author not in answered or not text:
+                continue
+            usage = event.usage_metadata
+            saved += (usage.candidates_token_count if usage and usage.candidates_token_count
+                      else _estimate_tokens(text))
+        self.relayed_handbacks += 1
+        self.saved_output_tokens += saved
+        logger.info(f"Relay: {next(iter(answered))} answer already streamed, ending turn (~{saved} tokens saved)")
+        # No content: the flow emits nothing and the router's turn ends here
+        return LlmResponse()
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "relayed_tool_answers": self.relayed_tool_answers,
+            "relayed_handbacks": self.relayed_handbacks,
+            "synthesized": self.synthesized,
+            "saved_output_tokens": self.saved_output_tokens,
+        }
+
+
+response_relay = ResponseRelay(
+    relay_tools={"openshift_docs_expert"},
+    domains=lambda text: set(keyword_classifier.match(text)),
+    enabled=config.RELAY_MODE_ENABLED,
+)
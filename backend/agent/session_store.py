@@ -0,0 +1,197 @@
+"""
+Bounded SQLite session store shared by all uvicorn workers.
+
+ADK's in-memory session service keeps every session's full history in one process's
+heap. BoundedSqliteSessionService builds on ADK's SqliteSessionService and adds what a
+long-running, multi-worker server needs:
+
+    - WAL journal mode and a busy timeout, so several worker processes can read and
+      write the same database file concurrently
+    - Lazy loading: get_session() loads only the SESSION_RECENT_EVENTS most recent
+      events (starting at a user turn), and the in-memory Session is trimmed back to
+      that window as events are appended (keeping the running invocation's events),
+      so resident memory per session stays constant
+    - Periodic maintenance: events beyond SESSION_MAX_EVENTS per session are deleted,
+      sessions idle longer than SESSION_IDLE_TTL_SECONDS are evicted, and the freed
+      pages are returned to the file system (WAL checkpoint + incremental vacuum)
+
+Usage:
+    session_service = BoundedSqliteSessionService(config.SESSION_DB_PATH, ...)
+    await session_service.start()   # maintenance loop
+    ...
+    await session_service.stop()
+"""
+
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+import asyncio
+import logging
+import time
+import aiosqlite
+from google.adk.events import Event
+from google.adk.sessions import Session
+from google.adk.sessions.base_session_service import GetSessionConfig
+from google.adk.sessions.sqlite_session_service import (
+    CREATE_SCHEMA_SQL,
+    PRAGMA_FOREIGN_KEYS,
+    SqliteSessionService,
+)
+
+logger = logging.getLogger(__name__)
+
+_INDEX_SQL = (
+    "CREATE INDEX IF NOT EXISTS idx_events_session_time "
+    "ON events (app_name, user_id, session_id, timestamp)"
+)
+
+# Keep the newest max_events events of every session
+_CAP_EVENTS_SQL = """
+DELETE FROM events WHERE rowid IN (
+    SELECT rowid FROM (
+        SELECT rowid, ROW_NUMBER() OVER (
+            PARTITION BY app_name, user_id, session_id ORDER BY timestamp DESC, id DESC
+        ) AS position
+        FROM events
+    )
+    WHERE position > ?
+)
+"""
+
+
+def _trim_to_turn_start(events: list[Event]) -> list[Event]:
+    """Drop leading events until the first user message, so no tool call is cut in half."""
+    for i, event in enumerate(events):
+        if event.author == "user":
+            return events[i:]
+    return events
+
+
+class BoundedSqliteSessionService(SqliteSessionService):
+    """SqliteSessionService with WAL, lazy recent-event loading and bounded history."""
+
+    def __init__(
+        self,
+        db_path: str,
+        *,
+        max_events: int,
+        recent_events: int,
+        idle_ttl_seconds: float,
+        maintenance_interval_seconds: float,
+    ):
+        super().__init__(db_path)
+        self.max_events = max_events
+        self.recent_events = recent_events
+        self.idle_ttl_seconds = idle_ttl_seconds
+        self.maintenance_interval_seconds = maintenance_interval_seconds
+        self._maintenance_task: Optional[asyncio.Task] = None
+        self.trimmed_events = 0
+        self.evicted_sessions = 0
+        self.maintenance_runs = 0
+
+    @asynccontextmanager
+    async def _get_db_connection(self) -> AsyncIterator[aiosqlite.Connection]:
+        async with aiosqlite.connect(self._db_connect_path, uri=self._db_connect_uri) as db:
+            db.row_factory = aiosqlite.Row
+            # Wait for other workers' write locks instead of failing with "database is locked"
+            await db.execute("PRAGMA busy_timeout = 5000")
+            await db.execute("PRAGMA synchronous = NORMAL")
+            await db.execute(PRAGMA_FOREIGN_KEYS)
+            if not self._schema_ready:
+                # auto_vacuum only takes effect on a database without tables
+                await db.execute("PRAGMA auto_vacuum = INCREMENTAL")
+                await db.execute("PRAGMA journal_mode = WAL")
+                await db.executescript(CREATE_SCHEMA_SQL)
+                await db.execute(_INDEX_SQL)
+                await db.commit()
+                self._schema_ready = True
+            yield db
+
+    async def get_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        session_id: str,
+        config: Optional[GetSessionConfig] = None,
+    ) -> Optional[Session]:
+        """Load the session with only its recent events unless a window is requested."""
+        windowed = config is None or (config.num_recent_events is None and not config.after_timestamp)
+        if windowed:
+            config = GetSessionConfig(num_recent_events=self.recent_events)
+        session = await super().get_session(
+            app_name=app_name, user_id=user_id, session_id=session_id, config=config
+        )
+        if session is not None and windowed and len(session.events) >= self.recent_events:
+            session.events = _trim_to_turn_start(session.events)
+        return session
+
+    async def append_event(self, session: Session, event: Event) -> Event:
+        event = await super().append_event(session, event)
+        # Keep the in-memory session at the recent window; the current invocation's
+        # events are always kept because the running agent still needs them
+        excess = len(session.events) - self.recent_events
+        if excess > 0:
+            keep_from = 0
+            while keep_from < excess and session.events[keep_from].invocation_id != event.invocation_id:
+                keep_from += 1
+            if keep_from:
+                session.events = _trim_to_turn_start(session.events[keep_from:])
+        return event
+
+    async def maintain(self) -> None:
+        """Cap events per session, evict idle sessions and compact the database file."""
+        started = time.monotonic()
+        async with self._get_db_connection() as db:
+            cursor = await db.execute(_CAP_EVENTS_SQL, (self.max_events,))
+            trimmed = cursor.rowcount
+            cursor = await db.execute(
+                "DELETE FROM sessions WHERE update_time < ?",
+                (time.time() - self.idle_ttl_seconds,),
+            )
+            evicted = cursor.rowcount
+            await db.commit()
+            # Row-returning pragmas must be fully consumed to release their locks
+            if trimmed or evicted:
+                await db.execute_fetchall("PRAGMA incremental_vacuum")
+            await db.execute_fetchall("PRAGMA wal_checkpoint(TRUNCATE)")
+            await db.execute_fetchall("PRAGMA optimize")
+        self.trimmed_events += max(trimmed, 0)
+        self.evicted_sessions += max(evicted, 0)
+        self.maintenance_runs += 1
+        logger.info(
+            f"Session store maintenance: trimmed {trimmed} events, evicted {evicted} sessions "
+            f"in {time.monotonic() - started:.2f}s"
+        )
+
+    async def _maintenance_loop(self) -> None:
+        while True:
+            try:
+                await self.maintain()
+            except Exception as e:
+                logger.warning(f"Session store maintenance failed: {e}")
+            await asyncio.sleep(self.maintenance_interval_seconds)
+
+    async def start(self) -> None:
+        """Start the periodic maintenance task."""
+        if self._maintenance_task is None:
+            self._maintenance_task = asyncio.create_task(self._maintenance_loop())
+
+    async def stop(self) -> None:
+        """Stop the maintenance task."""
+        if self._maintenance_task is not None:
+            self._maintenance_task.cancel()
+            try:
+                await self._maintenance_task
+            except asyncio.CancelledError:
+                pass
+            self._maintenance_task = None
+
+    def stats(self) -> dict:
+        return {
+            "db_path": self._db_path,
+            "max_events": self.max_events,
+            "recent_events": self.recent_events,
+            "trimmed_events": self.trimmed_events,
+            "evicted_sessions": self.evicted_sessions,
+            "maintenance_runs": self.maintenance_runs,
+        }
@@ -0,0 +1,408 @@
+"""
+Per-stage latency instrumentation for the agent server.
+
+A slow answer can spend its time in the router LLM, an agent transfer, the specialist
+LLM, MCP tool calls or the SSE stream. TelemetryPlugin is an ADK plugin (it sees every
+agent, model and tool callback of the run) that times each stage:
+
+    - LLM calls per agent: duration, time to first token (first streamed chunk) and
+      prompt/completion token counts
+    - Tool calls per server (kubernetes :8001, obs :8002, incidents :8003, local) and
+      tool name, with ok/error status
+    - Agent transfers: time from the transfer_to_agent call to the target agent starting
+    - Agent runs per agent
+
+SSEMetricsMiddleware adds time to first byte and duration of the AG-UI stream. All
+observations go into Prometheus histograms rendered by GET /metrics, so p50/p99 per
+stage can be computed with histogram_quantile(); rough in-process quantiles are also
+reported under telemetry in GET /health.
+
+If OTEL_EXPORTER_OTLP_ENDPOINT is set (and opentelemetry-exporter-otlp-proto-http is
+installed), ADK's own call_llm/execute_tool/invoke_agent spans are exported over OTLP;
+the plugin adds its measurements (time to first token, MCP server, transfer) to them.
+"""
+
+from typing import Any, Callable, Iterable, Optional
+from urllib.parse import urlparse
+import bisect
+import logging
+import os
+import time
+from google.adk.agents.base_agent import BaseAgent
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event
+from google.adk.models import LlmRequest, LlmResponse
+from google.adk.plugins.base_plugin import BasePlugin
+from google.adk.tools.base_tool import BaseTool
+from google.adk.tools.tool_context import ToolContext
+from opentelemetry import trace
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+TOKEN_BUCKETS = (64, 256, 1024, 4096, 16384, 65536, 262144)
+
+_LE_INF = 'le="+Inf"'
+
+_tracer = trace.get_tracer(__name__)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _label_text(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Histogram:
+    """Cumulative-bucket histogram with labels, in the Prometheus text format."""
+
+    def __init__(
+        self, name: str, help: str, labels: tuple[str, ...] = (), buckets: tuple = LATENCY_BUCKETS
+    ):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.buckets = tuple(sorted(buckets))
+        # key -> [per-bucket counts (+Inf last), sum, count]
+        self.series: dict[tuple[str, ...], list] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = tuple(str(labels.get(name, "")) for name in self.labels)
+        series = self.series.get(key)
+        if series is None:
+            series = self.series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        series[0][bisect.bisect_left(self.buckets, value)] += 1
+        series[1] += value
+        series[2] += 1
+
+    def quantile(self, q: float, key: tuple[str, ...]) -> Optional[float]:
+        """Estimate a quantile by linear interpolation inside the bucket (like histogram_quantile)."""
+        series = self.series.get(key)
+        if not series or not series[2]:
+            return None
+        rank = q * series[2]
+        seen = 0
+        for i, count in enumerate(series[0]):
+            if seen + count >= rank and count:
+                if i == len(self.buckets):
+                    return self.buckets[-1]
+                lower = self.buckets[i - 1] if i else 0.0
+                return lower + (self.buckets[i] - lower) * (rank - seen) / count
+            seen += count
+        return self.buckets[-1]
+
+    def summary(self) -> dict:
+        result = {}
+        for key, (_, total, count) in sorted(self.series.items()):
+            p50, p99 = self.quantile(0.5, key), self.quantile(0.99, key)
+            result["/".join(key) or "all"] = {
+                "count": count,
+                "avg": round(total / count, 4),
+                "p50": round(p50, 4) if p50 is not None else None,
+                "p99": round(p99, 4) if p99 is not None else None,
+            }
+        return result
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} histogram"
+        for key, (counts, total, count) in sorted(self.series.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                le = 'le="%g"' % bound
+                yield f"{self.name}_bucket{_label_text(self.labels, key, le)} {cumulative}"
+            yield f"{self.name}_bucket{_label_text(self.labels, key, _LE_INF)} {count}"
+            yield f"{self.name}_sum{_label_text(self.labels, key)} {total:g}"
+            yield f"{self.name}_count{_label_text(self.labels, key)} {count}"
+
+
+class Gauge:
+    """Gauge whose labeled values are read from a callback at render time."""
+
+    def __init__(
+        self, name: str, help: str, labels: tuple[str, ...], collect: Callable[[], dict[tuple[str, ...], float]]
+    ):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.collect = collect
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} gauge"
+        for key, value in sorted(self.collect().items()):
+            yield f"{self.name}{_label_text(self.labels, key)} {value:g}"
+
+
+class MetricsRegistry:
+    """Named metrics rendered together for GET /metrics."""
+
+    def __init__(self):
+        self.metrics: dict[str, Histogram | Gauge] = {}
+
+    def histogram(
+        self, name: str, help: str, labels: tuple[str, ...] = (), buckets: tuple = LATENCY_BUCKETS
+    ) -> Histogram:
+        return self.metrics.setdefault(name, Histogram(name, help, labels, buckets))
+
+    def gauge(
+        self, name: str, help: str, labels: tuple[str, ...], collect: Callable[[], dict[tuple[str, ...], float]]
+    ) -> Gauge:
+        return self.metrics.setdefault(name, Gauge(name, help, labels, collect))
+
+    def render(self) -> str:
+        lines = [line for metric in self.metrics.values() for line in metric.render()]
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+llm_duration = registry.histogram(
+    "adk_llm_call_duration_seconds", "LLM call duration by agent", ("agent", "status")
+)
+llm_ttft = registry.histogram(
+    "adk_llm_time_to_first_token_seconds", "Time to the first streamed LLM chunk by agent", ("agent",)
+)
+llm_tokens = registry.histogram(
+    "adk_llm_tokens", "Tokens per LLM call by agent and type", ("agent", "type"), TOKEN_BUCKETS
+)
+tool_duration = registry.histogram(
+    "adk_tool_call_duration_seconds", "Tool call duration by server and tool", ("server", "tool", "status")
+)
+transfer_duration = registry.histogram(
+    "adk_agent_transfer_duration_seconds",
+    "Time from transfer_to_agent to the target agent starting",
+    ("source", "target"),
+)
+agent_duration = registry.histogram(
+    "adk_agent_run_duration_seconds", "Agent run duration by agent", ("agent",)
+)
+sse_first_byte = registry.histogram(
+    "adk_sse_time_to_first_byte_seconds", "Time to the first byte of the AG-UI stream", ("path",)
+)
+sse_duration = registry.histogram(
+    "adk_sse_stream_duration_seconds", "Duration of the AG-UI stream", ("path", "status")
+)
+# Every metric is per worker process; this tells scrapes of different workers apart
+registry.gauge(
+    "adk_worker_info", "Worker process serving this scrape", ("pid",), lambda: {(str(os.getpid()),): 1}
+)
+
+
+def tool_server(tool: BaseTool) -> str:
+    """host:port of the MCP server behind a (possibly wrapped) tool, or local/agent."""
+    inner = tool
+    while hasattr(inner, "inner"):  # WrappedToolset tools
+        inner = inner.inner
+    session_manager = getattr(inner, "_mcp_session_manager", None)
+    url = getattr(getattr(session_manager, "_connection_params", None), "url", None)
+    if url:
+        return urlparse(url).netloc or url
+    if hasattr(inner, "agent"):  # AgentTool
+        return "agent"
+    return "local"
+
+
+def _response_has_output(llm_response: LlmResponse) -> bool:
+    content = llm_response.content
+    return bool(content and any(part.text or part.function_call for part in content.parts or []))
+
+
+class TelemetryPlugin(BasePlugin):
+    """ADK plugin timing LLM calls, tool calls, transfers and agent runs."""
+
+    def __init__(self, name: str = "telemetry"):
+        super().__init__(name=name)
+        # (invocation_id, agent) -> [started, first_token_seen]; pending keys are dropped
+        # after the run (a before_model_callback short-circuit never reaches after_model)
+        self._llm_calls: dict[tuple[str, str], list] = {}
+        self._tool_calls: dict[str, float] = {}
+        self._agent_runs: dict[tuple[str, str], float] = {}
+        self._transfers: dict[tuple[str, str], tuple[str, float]] = {}
+
+    async def before_model_callback(
+        self, *, callback_context: CallbackContext, llm_request: LlmRequest
+    ) -> Optional[LlmResponse]:
+        key = (callback_context.invocation_id, callback_context.agent_name)
+        self._llm_calls[key] = [time.monotonic(), False]
+        return None
+
+    async def after_model_callback(
+        self, *, callback_context: CallbackContext, llm_response: LlmResponse
+    ) -> Optional[LlmResponse]:
+        agent = callback_context.agent_name
+        key = (callback_context.invocation_id, agent)
+        call = self._llm_calls.get(key)
+        if call is None:
+            return None
+        elapsed = time.monotonic() - call[0]
+        span = trace.get_current_span()
+        if not call[1] and _response_has_output(llm_response):
+            # First chunk when streaming, the whole response otherwise
+            call[1] = True
+            llm_ttft.observe(elapsed, agent=agent)
+            span.set_attribute("llm.time_to_first_token_s", elapsed)
+        if llm_response.partial:
+            return None
+
+        del self._llm_calls[key]
+        status = "error" if llm_response.error_code else "ok"
+        llm_duration.observe(elapsed, agent=agent, status=status)
+        usage = llm_response.usage_metadata
+        if usage:
+            if usage.prompt_token_count:
+                llm_tokens.observe(usage.prompt_token_count, agent=agent, type="prompt")
+            if usage.candidates_token_count:
+                llm_tokens.observe(usage.candidates_token_count, agent=agent, type="completion")
+        return None
+
+    async def on_model_error_callback(
+        self, *, callback_context: CallbackContext, llm_request: LlmRequest, error: Exception
+    ) -> Optional[LlmResponse]:
+        call = self._llm_calls.pop((callback_context.invocation_id, callback_context.agent_name), None)
+        if call is not None:
+            llm_duration.observe(
+                time.monotonic() - call[0], agent=callback_context.agent_name, status="error"
+            )
+        return None
+
+    async def before_tool_callback(
+        self, *, tool: BaseTool, tool_args: dict[str, Any], tool_context: ToolContext
+    ) -> Optional[dict]:
+        if tool_context.function_call_id:
+            self._tool_calls[tool_context.function_call_id] = time.monotonic()
+        trace.get_current_span().set_attribute("mcp.server", tool_server(tool))
+        return None
+
+    def _finish_tool(self, tool: BaseTool, tool_context: ToolContext, status: str) -> None:
+        started = self._tool_calls.pop(tool_context.function_call_id or "", None)
+        if started is not None:
+            tool_duration.observe(
+                time.monotonic() - started, server=tool_server(tool), tool=tool.name, status=status
+            )
+
+    async def after_tool_callback(
+        self, *, tool: BaseTool, tool_args: dict[str, Any], tool_context: ToolContext, result: dict
+    ) -> Optional[dict]:
+        self._finish_tool(tool, tool_context, "ok")
+        return None
+
+    async def on_tool_error_callback(
+        self, *, tool: BaseTool, tool_args: dict[str, Any], tool_context: ToolContext, error: Exception
+    ) -> Optional[dict]:
+        self._finish_tool(tool, tool_context, "error")
+        return None
+
+    async def on_event_callback(
+        self, *, invocation_context: InvocationContext, event: Event
+    ) -> Optional[Event]:
+        if event.actions and event.actions.transfer_to_agent:
+            target = event.actions.transfer_to_agent
+            self._transfers[(event.invocation_id, target)] = (event.author, time.monotonic())
+        return None
+
+    async def before_agent_callback(
+        self, *, agent: BaseAgent, callback_context: CallbackContext
+    ) -> Optional[Any]:
+        key = (callback_context.invocation_id, agent.name)
+        now = time.monotonic()
+        self._agent_runs[key] = now
+        transfer = self._transfers.pop(key, None)
+        if transfer is not None:
+            source, started = transfer
+            transfer_duration.observe(now - started, source=source, target=agent.name)
+            span = _tracer.start_span(
+                "agent_transfer",
+                start_time=time.time_ns() - int((now - started) * 1e9),
+                attributes={"gen_ai.agent.source": source, "gen_ai.agent.name": agent.name},
+            )
+            span.end()
+        return None
+
+    async def after_agent_callback(
+        self, *, agent: BaseAgent, callback_context: CallbackContext
+    ) -> Optional[Any]:
+        started = self._agent_runs.pop((callback_context.invocation_id, agent.name), None)
+        if started is not None:
+            agent_duration.observe(time.monotonic() - started, agent=agent.name)
+        return None
+
+    async def after_run_callback(self, *, invocation_context: InvocationContext) -> None:
+        invocation_id = invocation_context.invocation_id
+        for pending in (self._llm_calls, self._agent_runs, self._transfers):
+            for key in [k for k in pending if k[0] == invocation_id]:
+                del pending[key]
+        if len(self._tool_calls) > 1000:
+            # Tool calls cancelled mid-flight never reach after_tool
+            self._tool_calls.clear()
+
+
+class SSEMetricsMiddleware:
+    """ASGI middleware timing the first byte and the full duration of streamed responses."""
+
+    def __init__(self, app, paths: Iterable[str]):
+        self.app = app
+        self.paths = set(paths)
+
+    async def __call__(self, scope, receive, send):
+        path = scope.get("path", "")
+        if scope["type"] != "http" or path not in self.paths:
+            await self.app(scope, receive, send)
+            return
+
+        started = time.monotonic()
+        state = {"status": "500", "first_byte": False}
+
+        async def timed_send(message):
+            if message["type"] == "http.response.start":
+                state["status"] = str(message["status"])
+            elif message["type"] == "http.response.body" and not state["first_byte"]:
+                state["first_byte"] = True
+                sse_first_byte.observe(time.monotonic() - started, path=path)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, timed_send)
+        finally:
+            sse_duration.observe(time.monotonic() - started, path=path, status=state["status"])
+
+
+def configure_otlp_exporter(endpoint: str, service_name: str) -> bool:
+    """Export OpenTelemetry spans to an OTLP/HTTP endpoint; False if the exporter is missing."""
+    try:
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor
+    except ImportError:
+        logger.warning(
+            "OTEL_EXPORTER_OTLP_ENDPOINT is set but opentelemetry-exporter-otlp-proto-http "
+            "is not installed; spans are not exported"
+        )
+        return False
+    provider = TracerProvider(resource=Resource.create({"service.name": service_name}))
+    provider.add_span_processor(BatchSpanProcessor(OTLPSpanExporter(endpoint=f"{endpoint.rstrip('/')}/v1/traces")))
+    trace.set_tracer_provider(provider)
+    logger.info(f"Exporting OpenTelemetry spans to {endpoint}")
+    return True
+
+
+def get_telemetry_stats() -> dict:
+    """Per-stage counts and estimated p50/p99 seconds for GET /health."""
+    return {
+        "llm": llm_duration.summary(),
+        "llm_time_to_first_token": llm_ttft.summary(),
+        "tools": tool_duration.summary(),
+        "transfers": transfer_duration.summary(),
+        "sse_time_to_first_byte": sse_first_byte.summary(),
+    }
+
+
+telemetry_plugin = TelemetryPlugin()
@@ -3,5 +3,7 @@ Agent tools package.
 """
 
 from .graph_timeseries import graph_timeseries_data
+from .incident_snapshot import get_incident_snapshot
+from .metric_catalog import search_metrics
 
-__all__ = ["graph_timeseries_data"]
+__all__ = ["graph_timeseries_data", "get_incident_snapshot", "search_metrics"]
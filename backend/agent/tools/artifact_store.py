@@ -0,0 +1,256 @@
+"""
+Out-of-band artifact store for large tool results.
+
+Large payloads (chart series, logs) don't belong in the tool result: from there they
+enter the conversation history, get re-sent to the LLM on every later turn and are
+streamed over AG-UI. Tools put them here instead and return a short reference:
+
+    artifact_id = await artifact_store.put(payload_bytes)
+    # tool result: {"artifact_id": ..., "artifact_url": "/api/artifacts/<id>", ...summary}
+
+The frontend fetches the payload from GET /api/artifacts/{id} (see main.py).
+
+Storage:
+    - Content-addressed ids (sha256), so identical payloads are stored once and the id
+      doubles as a strong ETag
+    - Every artifact is written through to ARTIFACT_SPILL_DIR, shared by all workers
+      (temp file + os.replace, so readers never see a partial file): whichever worker
+      answers GET /api/artifacts/{id} finds it there
+    - An in-memory LRU bounded by ARTIFACT_MEMORY_BYTES serves this worker's recent
+      artifacts without touching the disk
+    - The directory is pruned oldest-first (by file age) once its files exceed
+      ARTIFACT_DISK_BYTES; every worker prunes, at most every few seconds
+    - Without ARTIFACT_SPILL_DIR, artifacts only live in the memory of the worker that
+      stored them
+
+Responses are compressed with brotli when the optional brotli package is installed
+and the client accepts it, gzip otherwise.
+"""
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+import asyncio
+import gzip
+import hashlib
+import logging
+import os
+import re
+import tempfile
+import time
+from config import config
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+_ID_RE = re.compile(r"^[0-9a-f]{32}$")
+
+# How often one worker scans the shared directory for the disk budget
+_PRUNE_INTERVAL_SECONDS = 10.0
+# Temp files older than this were left by a writer that died mid-write
+_STALE_TEMP_SECONDS = 3600.0
+
+
+@dataclass
+class Artifact:
+    """A stored payload."""
+
+    id: str
+    data: bytes
+    content_type: str
+
+    @property
+    def etag(self) -> str:
+        return f'"{self.id}"'
+
+
+class ArtifactStore:
+    """Artifact store written through to a directory shared by all workers, with a memory LRU."""
+
+    def __init__(self, memory_bytes: int, disk_bytes: int, spill_dir: Optional[str]):
+        self.memory_bytes = memory_bytes
+        self.disk_bytes = disk_bytes
+        self.spill_dir = Path(spill_dir) if spill_dir else None
+        self._memory: OrderedDict[str, Artifact] = OrderedDict()
+        self._memory_used = 0
+        self._spill_dir_ready = False
+        self._pruned_at = 0.0
+        # Size of the shared directory as of the last prune
+        self._disk_used = 0
+        self.writes = 0
+        self.disk_reads = 0
+        self.evictions = 0
+
+    async def put(self, data: bytes, content_type: str = "application/json") -> str:
+        """Store a payload and return its id."""
+        artifact_id = hashlib.sha256(data).hexdigest()[:32]
+        if artifact_id in self._memory:
+            self._memory.move_to_end(artifact_id)
+            return artifact_id
+
+        artifact = Artifact(artifact_id, data, content_type)
+        if self.spill_dir is not None and len(data) <= self.disk_bytes:
+            try:
+                await asyncio.to_thread(self._write, artifact)
+                self.writes += 1
+            except OSError as e:
+                # Still served by this worker from memory
+                logger.warning(f"Failed to write artifact {artifact_id}: {e}")
+            if time.monotonic() - self._pruned_at >= _PRUNE_INTERVAL_SECONDS:
+                self._pruned_at = time.monotonic()
+                await asyncio.to_thread(self._prune)
+
+        self._memory[artifact_id] = artifact
+        self._memory_used += len(data)
+        while self._memory_used > self.memory_bytes and len(self._memory) > 1:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_used -= len(evicted.data)
+        return artifact_id
+
+    async def get(self, artifact_id: str) -> Optional[Artifact]:
+        """Look up an artifact in memory, then in the shared directory."""
+        if not _ID_RE.match(artifact_id):
+            return None
+        artifact = self._memory.get(artifact_id)
+        if artifact is not None:
+            self._memory.move_to_end(artifact_id)
+            return artifact
+        if self.spill_dir is None:
+            return None
+        try:
+            stored = await asyncio.to_thread((self.spill_dir / artifact_id).read_bytes)
+        except OSError:
+            return None
+        content_type, _, data = stored.partition(b"\n")
+        self.disk_reads += 1
+        return Artifact(artifact_id, data, content_type.decode())
+
+    def _write(self, artifact: Artifact) -> None:
+        if not self._spill_dir_ready:
+            self.spill_dir.mkdir(parents=True, exist_ok=True)
+            self._spill_dir_ready = True
+        path = self.spill_dir / artifact.id
+        if path.exists():
+            # Content-addressed: the same bytes are already there
+            return
+        fd, temp = tempfile.mkstemp(dir=self.spill_dir, prefix=f".{artifact.id}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(artifact.content_type.encode() + b"\n" + artifact.data)
+            os.replace(temp, path)
+        except BaseException:
+            Path(temp).unlink(missing_ok=True)
+            raise
+
+    def _prune(self) -> None:
+        """Delete the oldest artifacts until the directory fits ARTIFACT_DISK_BYTES."""
+        now = time.time()
+        files = []
+        try:
+            entries = list(os.scandir(self.spill_dir))
+        except OSError as e:
+            logger.warning(f"Failed to scan artifact directory {self.spill_dir}: {e}")
+            return
+        for entry in entries:
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue  # removed by another worker meanwhile
+            if _ID_RE.match(entry.name):
+                files.append((stat.st_mtime, stat.st_size, entry.path))
+            elif entry.name.endswith(".tmp") and now - stat.st_mtime > _STALE_TEMP_SECONDS:
+                Path(entry.path).unlink(missing_ok=True)
+
+        used = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if used <= self.disk_bytes:
+                break
+            Path(path).unlink(missing_ok=True)
+            used -= size
+            self.evictions += 1
+        self._disk_used = used
+
+    def stats(self) -> dict:
+        return {
+            "memory_artifacts": len(self._memory),
+            "memory_bytes": self._memory_used,
+            "disk_bytes": self._disk_used,
+            "writes": self.writes,
+            "disk_reads": self.disk_reads,
+            "evictions": self.evictions,
+        }
+
+
+def _accepted_encodings(accept_encoding: str) -> set[str]:
+    """Content codings from an Accept-Encoding header, minus those with q=0."""
+    accepted = set()
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        q = params.strip()
+        if q.startswith("q="):
+            try:
+                if float(q[2:]) == 0:
+                    continue
+            except ValueError:
+                continue
+        if coding:
+            accepted.add(coding.strip().lower())
+    return accepted
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """Pick "br" or "gzip" for a response, None to send it uncompressed."""
+    accepted = _accepted_encodings(accept_encoding)
+    if brotli is not None and ("br" in accepted or "*" in accepted):
+        return "br"
+    if "gzip" in accepted or "*" in accepted:
+        return "gzip"
+    return None
+
+
+def compress(data: bytes, encoding: str) -> bytes:
+    """Compress data with the given content coding ("br" or "gzip")."""
+    if encoding == "br":
+        return brotli.compress(data, quality=5)
+    return gzip.compress(data, compresslevel=6)
+
+
+def parse_range(range_header: str, size: int) -> Optional[tuple[int, int]]:
+    """
+    Parse a single-range "bytes=..." header into an inclusive (first, last) byte range.
+
+    Returns:
+        The range, or None if the header should be ignored (malformed or multi-range)
+
+    Raises:
+        ValueError: If the range can't be satisfied for a payload of this size
+    """
+    unit, _, spec = range_header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    first, sep, last = (part.strip() for part in spec.partition("-"))
+    if not sep or not (first or last) or not all(p.isdigit() for p in (first, last) if p):
+        return None
+    if not first:
+        # Suffix range: the last N bytes
+        if int(last) == 0 or size == 0:
+            raise ValueError(f"range {range_header!r} not satisfiable")
+        return max(size - int(last), 0), size - 1
+    first_byte = int(first)
+    if last and int(last) < first_byte:
+        return None
+    if first_byte >= size:
+        raise ValueError(f"range {range_header!r} not satisfiable")
+    return first_byte, min(int(last), size - 1) if last else size - 1
+
+
+artifact_store = ArtifactStore(
+    memory_bytes=config.ARTIFACT_MEMORY_BYTES,
+    disk_bytes=config.ARTIFACT_DISK_BYTES,
+    spill_dir=config.ARTIFACT_SPILL_DIR,
+)
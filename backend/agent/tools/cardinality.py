@@ -0,0 +1,75 @@
+"""
+Series cardinality cap for range query results.
+
+A careless query like rate(container_cpu_usage_seconds_total[5m]) over a busy namespace
+can return thousands of series. Results are capped to the top K series ranked by their
+average value; the remaining series are summed per timestamp into a single "others"
+series so the chart still shows their combined contribution.
+"""
+
+import numpy as np
+
+OTHERS_LABEL = "__others__"
+
+
+def _series_arrays(series: dict) -> tuple[np.ndarray, np.ndarray]:
+    values = series.get("values", [])
+    timestamps = np.fromiter((float(v[0]) for v in values), dtype=np.float64, count=len(values))
+    samples = np.fromiter((float(v[1]) for v in values), dtype=np.float64, count=len(values))
+    return timestamps, samples
+
+
+def cap_series(data: dict, max_series: int) -> tuple[dict, dict]:
+    """
+    Keep the top max_series series by average value and aggregate the rest.
+
+    Args:
+        data: Prometheus matrix data
+        max_series: Maximum number of series to return (including "others")
+
+    Returns:
+        tuple: (capped matrix data, metadata with total/returned/aggregated counts)
+    """
+    result = data.get("result", [])
+    metadata = {
+        "max_series": max_series,
+        "total_series": len(result),
+        "returned_series": len(result),
+        "aggregated_series": 0,
+    }
+    if len(result) <= max_series:
+        return data, metadata
+
+    arrays = [_series_arrays(series) for series in result]
+    with np.errstate(invalid="ignore"):
+        scores = np.array([
+            np.nanmean(samples) if len(samples) and not np.all(np.isnan(samples)) else -np.inf
+            for _, samples in arrays
+        ])
+
+    # Reserve one slot for the "others" aggregate
+    keep = max(max_series - 1, 0)
+    order = np.argsort(-scores, kind="stable")
+    top, rest = order[:keep], order[keep:]
+
+    # Sum the remaining series per timestamp (NaN gaps count as 0)
+    all_ts = np.concatenate([arrays[i][0] for i in rest])
+    all_samples = np.nan_to_num(np.concatenate([arrays[i][1] for i in rest]), nan=0.0)
+    timestamps, positions = np.unique(all_ts, return_inverse=True)
+    sums = np.zeros(len(timestamps))
+    np.add.at(sums, positions, all_samples)
+
+    others = {
+        "metric": {OTHERS_LABEL: f"{len(rest)} other series"},
+        "values": [[_as_timestamp(t), repr(float(v))] for t, v in zip(timestamps, sums)],
+    }
+
+    capped = [result[i] for i in sorted(top)] + [others]
+    metadata["returned_series"] = len(capped)
+    metadata["aggregated_series"] = len(rest)
+    return {**data, "result": capped}, metadata
+
+
+def _as_timestamp(value: float):
+    """Prometheus timestamps are ints when aligned to whole seconds."""
+    return int(value) if value.is_integer() else float(value)
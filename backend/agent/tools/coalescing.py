@@ -0,0 +1,130 @@
+"""
+Single-flight coalescing of identical concurrent MCP tool calls.
+
+During an outage many users ask the same thing at the same moment ("what incidents are
+firing?"), and every session calls get_incidents on the incident server and queries
+ALERTS on obs-mcp with identical arguments. CoalescingToolset sits in front of each
+server's ResilientToolset and is shared by all sessions of the worker:
+
+    - Concurrent read-only calls with the same tool name and canonical arguments share
+      one upstream request; the callers that joined it never take a bulkhead slot
+    - Optionally, a successful result is reused for MCP_COALESCE_REUSE_SECONDS after it
+      arrived (0, the default, only joins calls that are still in flight)
+    - Read-only means annotated readOnlyHint/idempotentHint or matching MCP_RETRY_TOOLS,
+      as for retries; other calls always go upstream
+    - The upstream call runs in its own task, so a caller whose client disconnects
+      doesn't cancel it for the others. Error results are shared with the callers that
+      joined, but never reused
+
+Upstream, coalesced and reused calls are reported per server under mcp_coalescing in GET
+/health, and as adk_mcp_deduplicated_calls / adk_mcp_dedup_ratio in GET /metrics.
+"""
+
+from typing import Any
+import copy
+from google.adk.tools.base_tool import BaseTool
+from google.adk.tools.base_toolset import BaseToolset
+from google.adk.tools.tool_context import ToolContext
+from config import config
+from ..telemetry import registry
+from .discovery_cache import canonical_args
+from .resilience import is_read_only
+from .ttl_cache import TTLCache
+from .wrapped_toolset import WrappedToolset
+
+_toolsets: list["CoalescingToolset"] = []
+
+
+def _is_success(result: Any) -> bool:
+    return not (isinstance(result, dict) and (result.get("isError") or set(result) == {"error"}))
+
+
+class CoalescingToolset(WrappedToolset):
+    """Shares one upstream request between identical concurrent read-only tool calls."""
+
+    def __init__(
+        self,
+        inner: BaseToolset,
+        *,
+        name: str,
+        reuse_seconds: float,
+        max_entries: int,
+        read_only_tools: list[str],
+    ):
+        super().__init__(inner, name=name)
+        self.reuse_seconds = reuse_seconds
+        self.read_only_tools = read_only_tools
+        self.cache = TTLCache(max_entries=max_entries)
+        self.bypassed = 0
+        _toolsets.append(self)
+
+    @classmethod
+    def from_config(cls, inner: WrappedToolset) -> BaseToolset:
+        """Wrap inner (named after it) with the MCP_COALESCE_* settings, or return it if disabled."""
+        if not config.MCP_COALESCE_ENABLED:
+            return inner
+        return cls(
+            inner,
+            name=inner.name,
+            reuse_seconds=config.MCP_COALESCE_REUSE_SECONDS,
+            max_entries=config.MCP_COALESCE_MAX_ENTRIES,
+            read_only_tools=config.MCP_RETRY_TOOLS,
+        )
+
+    async def call_tool(self, tool: BaseTool, args: dict[str, Any], tool_context: ToolContext) -> Any:
+        if not is_read_only(tool, self.read_only_tools):
+            self.bypassed += 1
+            return await super().call_tool(tool, args, tool_context)
+
+        async def load():
+            return await tool.run_async(args=args, tool_context=tool_context)
+
+        result = await self.cache.get_or_load(
+            (tool.name, canonical_args(args)), load, self.reuse_seconds, cacheable=_is_success
+        )
+        # Every caller gets its own copy; ADK and the callbacks may modify results
+        return copy.deepcopy(result)
+
+    def dedup_ratio(self) -> float:
+        """Share of read-only calls that did not go upstream."""
+        calls = self.cache.hits + self.cache.coalesced + self.cache.misses
+        return (self.cache.hits + self.cache.coalesced) / calls if calls else 0.0
+
+    def stats(self) -> dict:
+        cache = self.cache.stats()
+        return {
+            "reuse_seconds": self.reuse_seconds,
+            "upstream": cache["misses"],
+            "coalesced": cache["coalesced"],
+            "reused": cache["hits"],
+            "bypassed": self.bypassed,
+            "dedup_ratio": round(self.dedup_ratio(), 3),
+            "saved_seconds": cache["saved_seconds"],
+        }
+
+
+def get_coalescing_stats() -> dict:
+    """Upstream, coalesced and reused tool calls per MCP server for GET /health."""
+    return {toolset.name: toolset.stats() for toolset in _toolsets}
+
+
+registry.gauge(
+    "adk_mcp_deduplicated_calls",
+    "Read-only MCP tool calls by outcome (upstream, coalesced onto an in-flight call, reused)",
+    ("server", "outcome"),
+    lambda: {
+        key: value
+        for t in _toolsets
+        for key, value in (
+            ((t.name, "upstream"), t.cache.misses),
+            ((t.name, "coalesced"), t.cache.coalesced),
+            ((t.name, "reused"), t.cache.hits),
+        )
+    },
+)
+registry.gauge(
+    "adk_mcp_dedup_ratio",
+    "Share of read-only MCP tool calls served without an upstream request",
+    ("server",),
+    lambda: {(t.name,): t.dedup_ratio() for t in _toolsets},
+)
@@ -0,0 +1,102 @@
+"""
+Compact columnar wire format for range query results.
+
+Prometheus' matrix format repeats every timestamp as a float and every value as a
+string in each [timestamp, "value"] pair. The columnar encoding (opt-in via
+graph_timeseries_data(encoding="columnar")) instead sends:
+
+    {
+        "encoding": "columnar-v1",
+        "resultType": "matrix",
+        "timestamps": [t0, d1, d2, ...],        # shared axis: first timestamp, then deltas
+        "common_labels": {"namespace": "foo"},  # labels identical on every series
+        "series": [
+            {"labels": {"pod": "a"}, "values": [0.5, null, 0.7, ...]},
+            ...
+        ]
+    }
+
+Decoder contract (implemented by decode_columnar() here and frontend/lib/columnar.ts):
+    - Timestamps: axis[0] = timestamps[0]; axis[i] = axis[i - 1] + timestamps[i]
+    - Series labels: {**common_labels, **series.labels}
+    - values[i] belongs to axis[i]; null means no sample (gap, NaN or +/-Inf)
+"""
+
+import math
+import numpy as np
+
+ENCODING = "columnar-v1"
+
+
+def _number(value: float):
+    """Whole numbers as ints keep the JSON short; non-finite values become gaps."""
+    if not math.isfinite(value):
+        return None
+    return int(value) if value.is_integer() and abs(value) < 2**53 else value
+
+
+def encode_columnar(data: dict) -> dict:
+    """
+    Encode Prometheus matrix data in the columnar format.
+
+    Args:
+        data: Prometheus matrix data ({"resultType": "matrix", "result": [...]})
+
+    Returns:
+        dict: Columnar payload (see module docstring)
+    """
+    result = data.get("result", [])
+    series_ts = []
+    series_values = []
+    for series in result:
+        values = series.get("values", [])
+        series_ts.append(np.fromiter((float(v[0]) for v in values), np.float64, len(values)))
+        series_values.append(np.fromiter((float(v[1]) for v in values), np.float64, len(values)))
+
+    # Shared time axis across all series
+    axis = np.unique(np.concatenate(series_ts)) if series_ts else np.empty(0)
+    matrix = np.full((len(result), len(axis)), np.nan)
+    for row, (ts, values) in enumerate(zip(series_ts, series_values)):
+        matrix[row, np.searchsorted(axis, ts)] = values
+
+    # Labels shared by every series are sent once
+    label_sets = [series.get("metric", {}) for series in result]
+    common = dict(label_sets[0]) if label_sets else {}
+    for labels in label_sets[1:]:
+        common = {k: v for k, v in common.items() if labels.get(k) == v}
+
+    deltas = np.diff(axis)
+    timestamps = [_number(float(axis[0]))] + [_number(float(d)) for d in deltas] if len(axis) else []
+
+    return {
+        "encoding": ENCODING,
+        "resultType": "matrix",
+        "timestamps": timestamps,
+        "common_labels": common,
+        "series": [
+            {
+                "labels": {k: v for k, v in labels.items() if k not in common},
+                "values": [_number(v) for v in row.tolist()],
+            }
+            for labels, row in zip(label_sets, matrix)
+        ],
+    }
+
+
+def decode_columnar(payload: dict) -> dict:
+    """
+    Decode a columnar payload back to Prometheus matrix data (reference decoder).
+
+    Gaps (null values) are dropped, as Prometheus does for missing samples.
+    """
+    axis = np.cumsum(np.asarray(payload.get("timestamps", []), dtype=np.float64))
+    common = payload.get("common_labels", {})
+    result = []
+    for series in payload.get("series", []):
+        values = [
+            [_number(float(t)), str(v)]
+            for t, v in zip(axis, series.get("values", []))
+            if v is not None
+        ]
+        result.append({"metric": {**common, **series.get("labels", {})}, "values": values})
+    return {"resultType": "matrix", "result": result}
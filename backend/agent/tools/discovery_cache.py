@@ -0,0 +1,128 @@
+"""
+Cache for read-only metrics discovery tools (list_metrics, get_label_names, ...).
+
+Metric and label discovery changes slowly, but metrics_expert runs it on every question
+for every user. DiscoveryCacheToolset wraps the obs-mcp McpToolset and serves the
+configured discovery tools from a process-wide TTL cache:
+
+    - Per-tool TTL (DISCOVERY_CACHE_TTLS, e.g. "list_metrics=600,get_label_names=300")
+    - LRU bound on the number of cached results
+    - Request coalescing: N concurrent sessions asking the same question -> 1 upstream call
+
+All other tools (execute_range_query, ...) pass straight through. Hit rates and saved
+latency per cached tool are reported under discovery_cache in GET /health and as
+adk_discovery_cache_lookups / adk_discovery_cache_hit_ratio /
+adk_discovery_cache_saved_seconds in GET /metrics.
+"""
+
+from typing import Any
+import copy
+import json
+import logging
+from google.adk.tools.base_tool import BaseTool
+from google.adk.tools.base_toolset import BaseToolset
+from google.adk.tools.tool_context import ToolContext
+from ..telemetry import registry
+from .ttl_cache import TTLCache
+from .wrapped_toolset import WrappedToolset
+
+logger = logging.getLogger(__name__)
+
+
+def canonical_args(args: dict[str, Any]) -> str:
+    """Stable cache key for tool arguments (key order and whitespace independent)."""
+    return json.dumps(args, sort_keys=True, separators=(",", ":"), default=str)
+
+
+def _is_success(result: Any) -> bool:
+    """MCP tool results with isError set must not be cached."""
+    return not (isinstance(result, dict) and result.get("isError"))
+
+
+# Every DiscoveryCacheToolset built, for GET /health (toolsets are built with their agents)
+_toolsets: list["DiscoveryCacheToolset"] = []
+
+
+class DiscoveryCacheToolset(WrappedToolset):
+    """Serves read-only discovery tools from a TTL cache with request coalescing."""
+
+    def __init__(self, inner: BaseToolset, *, name: str, ttls: dict[str, float], max_entries: int):
+        super().__init__(inner, name=name)
+        self.ttls = ttls
+        self.cache = TTLCache(max_entries=max_entries)
+        _toolsets.append(self)
+
+    async def call_tool(self, tool: BaseTool, args: dict[str, Any], tool_context: ToolContext) -> Any:
+        ttl = self.ttls.get(tool.name)
+        if ttl is None:
+            return await super().call_tool(tool, args, tool_context)
+
+        async def load():
+            return await tool.run_async(args=args, tool_context=tool_context)
+
+        result = await self.cache.get_or_load(
+            (tool.name, canonical_args(args)),
+            load,
+            ttl,
+            cacheable=_is_success,
+            group=tool.name,
+        )
+        # Callers must not be able to mutate the shared cached result
+        return copy.deepcopy(result)
+
+    def tool_stats(self) -> dict[str, dict]:
+        """Lookups, hit ratio and saved seconds per cached tool."""
+        stats = {}
+        for tool, counters in self.cache.groups.items():
+            served = counters["hits"] + counters["coalesced"]
+            lookups = served + counters["misses"]
+            stats[tool] = {
+                "hits": counters["hits"],
+                "misses": counters["misses"],
+                "coalesced": counters["coalesced"],
+                "hit_ratio": round(served / lookups, 3) if lookups else 0.0,
+                "saved_seconds": round(counters["saved_seconds"], 3),
+            }
+        return stats
+
+    def stats(self) -> dict:
+        return {
+            "toolset": self.name,
+            "ttls": self.ttls,
+            **self.cache.stats(),
+            "tools": self.tool_stats(),
+        }
+
+
+def get_discovery_cache_stats() -> dict:
+    """Hit rates and saved latency per discovery cache for GET /health."""
+    return {toolset.name: toolset.stats() for toolset in _toolsets}
+
+
+registry.gauge(
+    "adk_discovery_cache_lookups",
+    "Discovery tool lookups by outcome (hit, miss, coalesced onto an in-flight call)",
+    ("toolset", "tool", "outcome"),
+    lambda: {
+        (t.name, tool, outcome): counters[field]
+        for t in _toolsets
+        for tool, counters in t.cache.groups.items()
+        for outcome, field in (("hit", "hits"), ("miss", "misses"), ("coalesced", "coalesced"))
+    },
+)
+registry.gauge(
+    "adk_discovery_cache_hit_ratio",
+    "Share of discovery tool lookups served without an upstream request",
+    ("toolset", "tool"),
+    lambda: {
+        (t.name, tool): s["hit_ratio"] for t in _toolsets for tool, s in t.tool_stats().items()
+    },
+)
+registry.gauge(
+    "adk_discovery_cache_saved_seconds",
+    "Upstream latency saved by discovery cache hits and coalesced calls",
+    ("toolset", "tool"),
+    lambda: {
+        (t.name, tool): s["saved_seconds"] for t in _toolsets for tool, s in t.tool_stats().items()
+    },
+)
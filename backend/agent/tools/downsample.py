@@ -0,0 +1,97 @@
+"""
+Largest-Triangle-Three-Buckets (LTTB) downsampling for time-series payloads.
+
+LTTB keeps the visual shape of a line chart (peaks, dips, trend) while reducing the
+number of points to a fixed budget. The per-bucket triangle area search is vectorized
+with NumPy; only the walk over buckets is a Python loop (O(max_points) iterations).
+
+Reference: Sveinn Steinarsson, "Downsampling Time Series for Visual Representation" (2013)
+"""
+
+import numpy as np
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, max_points: int) -> np.ndarray:
+    """
+    Select indices of the points to keep.
+
+    Args:
+        x: Sorted timestamps
+        y: Values (NaN gaps are treated as 0 for selection only)
+        max_points: Number of points to keep (>= 3; smaller budgets keep first/last)
+
+    Returns:
+        np.ndarray: Sorted indices into x/y, always including the first and last point
+    """
+    n = len(x)
+    if max_points >= n or n <= 2:
+        return np.arange(n)
+    if max_points < 3:
+        return np.array([0, n - 1])[:max(max_points, 1)]
+
+    y = np.nan_to_num(y, nan=0.0, posinf=0.0, neginf=0.0)
+
+    # Interior points are split into max_points - 2 buckets; first/last are fixed
+    edges = np.linspace(1, n - 1, max_points - 1).astype(np.int64)
+    selected = np.empty(max_points, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+
+    # Average of each bucket, used as the third triangle vertex for the previous bucket
+    sums_x = np.add.reduceat(x[1:n - 1], edges[:-1] - 1)
+    sums_y = np.add.reduceat(y[1:n - 1], edges[:-1] - 1)
+    counts = np.diff(edges)
+    avg_x = np.append(sums_x / counts, x[n - 1])
+    avg_y = np.append(sums_y / counts, y[n - 1])
+
+    a = 0
+    for i in range(max_points - 2):
+        lo, hi = edges[i], edges[i + 1]
+        ax, ay = x[a], y[a]
+        cx, cy = avg_x[i + 1], avg_y[i + 1]
+        # Twice the triangle area for every candidate in the bucket at once
+        areas = np.abs((ax - cx) * (y[lo:hi] - ay) - (ax - x[lo:hi]) * (cy - ay))
+        a = lo + int(np.argmax(areas))
+        selected[i + 1] = a
+
+    return selected
+
+
+def downsample_values(values: list, max_points: int) -> list:
+    """
+    Downsample a Prometheus [[timestamp, "value"], ...] list with LTTB.
+
+    Original pairs are returned untouched (values stay strings), so the output is a
+    drop-in replacement for the matrix "values" field.
+    """
+    if len(values) <= max_points:
+        return values
+
+    x = np.fromiter((float(v[0]) for v in values), dtype=np.float64, count=len(values))
+    y = np.fromiter((float(v[1]) for v in values), dtype=np.float64, count=len(values))
+    return [values[i] for i in lttb_indices(x, y, max_points)]
+
+
+def downsample_matrix(data: dict, max_points: int) -> tuple[dict, dict]:
+    """
+    Apply a per-series point budget to Prometheus matrix data.
+
+    Returns:
+        tuple: (downsampled matrix data, metadata with original/returned point counts)
+    """
+    original = 0
+    returned = 0
+    result = []
+    for series in data.get("result", []):
+        values = series.get("values", [])
+        reduced = downsample_values(values, max_points)
+        original += len(values)
+        returned += len(reduced)
+        result.append({**series, "values": reduced})
+
+    metadata = {
+        "max_points": max_points,
+        "original_points": original,
+        "returned_points": returned,
+    }
+    return {**data, "result": result}, metadata
@@ -4,19 +4,203 @@ Graph timeseries data tool - wraps obs-mcp execute_range_query for frontend visu
 This tool provides a clean interface for graphing Prometheus metrics in the frontend.
 It calls obs-mcp's execute_range_query internally and returns data in the format
 expected by observability-assistant-ui's TimeSeriesChart component.
+
+Comparing related metrics takes several graph_timeseries_data calls in one model turn:
+ADK runs parallel function calls concurrently, and every result is a chart the frontend
+already renders.
+
+Results larger than ARTIFACT_THRESHOLD_BYTES are moved to the artifact store: the tool
+result then carries everything except the raw series plus an artifact_url the frontend
+fetches the full payload from, so conversation history stays small.
 """
 
 from typing import Optional
 import json
-import httpx
+import time
+from config import config
+from .artifact_store import artifact_store
+from .cardinality import cap_series
+from .columnar import encode_columnar
+from .downsample import downsample_matrix
+from .mcp_client import MCPClientError, extract_text_content, get_mcp_client
+from .range_cache import RangeQueryCache
+from .summary import summarize_matrix
+from .time_range import (
+    align,
+    auto_step,
+    clamp_step,
+    format_duration,
+    format_time,
+    parse_duration,
+    parse_time,
+)
+
+# Process-wide cache of range query results (shared across sessions)
+_range_cache = RangeQueryCache(max_bytes=config.RANGE_CACHE_MAX_BYTES)
+
+
+class _QueryError(Exception):
+    """obs-mcp answered, but not with usable range query data."""
+
+
+def _error_response(message: str, query: str, description: str) -> str:
+    return json.dumps({
+        "error": message,
+        "query": query,
+        "description": description,
+    })
+
+
+async def _execute_range_query(query: str, start: float, end: float, step: float) -> dict:
+    """
+    Run execute_range_query on obs-mcp for an absolute window.
+
+    Returns:
+        dict: Prometheus data ({ resultType: 'matrix', result: [...] })
+
+    Raises:
+        _QueryError: If the query failed or returned no parsable data
+        MCPClientError: If the MCP call itself failed
+    """
+    # MCP returns: { content: [{ type: "text", text: "..." }], isError: bool }
+    tool_result = await get_mcp_client(config.OBS_MCP_URL).call_tool(
+        "execute_range_query",
+        {
+            "query": query,
+            "start": format_time(start),
+            "end": format_time(end),
+            "step": format_duration(step),
+        },
+    )
+
+    # Check if MCP server returned an error
+    if tool_result.get("isError"):
+        error_msg = extract_text_content(tool_result.get("content", [])) or "Unknown error"
+        raise _QueryError(f"Query failed: {error_msg}")
+
+    # Extract and parse the Prometheus data from MCP response
+    text_content = extract_text_content(tool_result.get("content", []))
+    if not text_content:
+        raise _QueryError("No data returned from query")
+
+    try:
+        return json.loads(text_content)
+    except json.JSONDecodeError as e:
+        raise _QueryError(f"Failed to parse response: {str(e)}")
+
+
+def get_range_cache_stats() -> dict:
+    """Hit/miss counters of the range query cache."""
+    return _range_cache.stats()
+
+
+async def _offload_large_result(payload: dict) -> str:
+    """
+    Serialize a tool result, moving it to the artifact store if it is too large.
+
+    The returned reference keeps every field except the raw series ("data"), so the
+    LLM still sees the summaries; the frontend loads the full payload from artifact_url.
+    """
+    body = json.dumps(payload)
+    if not config.ARTIFACT_STORE_ENABLED or len(body) <= config.ARTIFACT_THRESHOLD_BYTES:
+        return body
+
+    artifact_id = await artifact_store.put(body.encode())
+    reference = {k: v for k, v in payload.items() if k != "data"}
+    reference.update({
+        "artifact_id": artifact_id,
+        "artifact_url": f"/api/artifacts/{artifact_id}",
+        "artifact_bytes": len(body),
+    })
+    return json.dumps(reference)
+
 
+_ENCODINGS = ("matrix", "columnar")
+# LTTB always keeps the first and last point, so smaller budgets cannot keep the shape
+_MIN_MAX_POINTS = 3
 
-def _extract_text_content(content_items: list) -> str:
-    """Extract text from MCP content items."""
-    for item in content_items:
-        if item.get("type") == "text":
-            return item.get("text", "")
-    return ""
+
+def _resolve_window(
+    start: Optional[str], end: Optional[str], step: Optional[str]
+) -> tuple[float, float, float]:
+    """
+    Resolve tool time arguments to absolute (start, end, step) in seconds.
+
+    Raises:
+        ValueError: If a time or step expression can't be parsed
+    """
+    # Provide defaults for required/recommended parameters
+    now = time.time()
+    start_ts = parse_time(start or "NOW-1h", now)  # Default to last hour
+    end_ts = parse_time(end or "NOW", now)
+    # Required by obs-mcp - derive from the range when not given
+    if step:
+        step_seconds = clamp_step(start_ts, end_ts, parse_duration(step))
+    else:
+        step_seconds = auto_step(
+            start_ts, end_ts, config.GRAPH_TARGET_POINTS, config.GRAPH_MIN_STEP_SECONDS
+        )
+    return start_ts, end_ts, step_seconds
+
+
+async def _build_graph(
+    query: str,
+    description: str,
+    start_ts: float,
+    end_ts: float,
+    step_seconds: float,
+    max_points: Optional[int],
+    encoding: str,
+) -> dict:
+    """
+    Fetch one range query and shape it for the frontend chart.
+
+    Raises:
+        _QueryError, MCPClientError: If the query could not be executed
+    """
+
+    async def fetch(fetch_start: float, fetch_end: float) -> dict:
+        return await _execute_range_query(query, fetch_start, fetch_end, step_seconds)
+
+    # Call obs-mcp-server directly over the shared MCP session
+    if config.RANGE_CACHE_ENABLED:
+        # Repeated/shifted windows only fetch the missing tail
+        prometheus_data, cache_status = await _range_cache.get_range(
+            query, start_ts, end_ts, step_seconds, fetch
+        )
+    else:
+        prometheus_data = await fetch(align(start_ts, step_seconds), align(end_ts, step_seconds))
+        cache_status = "disabled"
+
+    # Format for frontend
+    graph_data = {
+        "query": query,
+        "description": description,
+        "data": prometheus_data,  # Should be { resultType: 'matrix', result: [...] }
+        "step": format_duration(step_seconds),
+        "cache": cache_status,
+    }
+    if prometheus_data.get("resultType") != "matrix":
+        return graph_data
+
+    # Cap cardinality so one broad query can't return thousands of series
+    graph_data["data"], graph_data["series_limit"] = cap_series(
+        prometheus_data, config.GRAPH_MAX_SERIES
+    )
+
+    # Compact per-series statistics for the LLM, computed on the full-resolution data
+    graph_data["summary"] = summarize_matrix(graph_data["data"])
+
+    # Bound payload size before it goes into the LLM context and the SSE stream
+    if max_points is not None:
+        graph_data["data"], graph_data["downsampling"] = downsample_matrix(
+            graph_data["data"], max_points
+        )
+
+    if encoding == "columnar":
+        graph_data["data"] = encode_columnar(graph_data["data"])
+
+    return graph_data
 
 
 async def graph_timeseries_data(
@@ -25,6 +209,8 @@ async def graph_timeseries_data(
     start: Optional[str] = None,
     end: Optional[str] = None,
     step: Optional[str] = None,
+    max_points: Optional[int] = None,
+    encoding: str = "matrix",
 ) -> str:
     """
     Execute a PromQL range query and return time-series data formatted for graphing.
@@ -37,7 +223,11 @@ async def graph_timeseries_data(
         description: Human-readable description of what this graph shows
         start: Start time (ISO8601 or relative like "NOW-1h", default: NOW-1h)
         end: End time (ISO8601 or relative like "NOW", default: NOW)
-        step: Query resolution step (e.g., "5m", default: auto-calculated)
+        step: Query resolution step (e.g., "5m", default: auto-calculated from the range)
+        max_points: Optional per-series point budget; longer series are downsampled
+            with LTTB, which keeps the visual shape of the chart; must be at least 3
+        encoding: "matrix" (default, Prometheus format) or "columnar" (compact shared
+            time axis with numeric value arrays, see columnar.py)
 
     Returns:
         JSON string with graph data in format:
@@ -52,88 +242,45 @@ async def graph_timeseries_data(
                         "values": [[timestamp, "value"], ...]
                     }
                 ]
-            }
+            },
+            "step": "1m",
+            "summary": [{"labels": {...}, "min": ..., "max": ..., "mean": ..., "p50": ...,
+                         "p95": ..., "p99": ..., "last": ..., "trend_per_hour": ...,
+                         "spikes": [{"timestamp": ..., "value": ...}]}],
+            "series_limit": {"max_series": K, "total_series": ..., "returned_series": ...,
+                             "aggregated_series": ...},
+            "downsampling": {"max_points": N, "original_points": ..., "returned_points": ...}
         }
+        When more than GRAPH_MAX_SERIES series match, the top series by average value are
+        returned plus one "others" series summing the rest.
+        ("downsampling" is only present when max_points is set)
+        With encoding="columnar", "data" holds a columnar-v1 payload instead.
+        Large results omit "data" and carry "artifact_id", "artifact_url" and
+        "artifact_bytes" instead; GET artifact_url returns the full payload above.
     """
-    # Build MCP request payload for execute_range_query tool
-    # Provide defaults for required/recommended parameters
-    mcp_request = {
-        "jsonrpc": "2.0",
-        "id": 1,
-        "method": "tools/call",
-        "params": {
-            "name": "execute_range_query",
-            "arguments": {
-                "query": query,
-                "start": start or "NOW-1h",  # Default to last hour
-                "end": end or "NOW",
-                "step": step or "1m",  # Required by obs-mcp
-            }
-        }
-    }
+    if encoding not in _ENCODINGS:
+        return _error_response(
+            f"Unknown encoding {encoding!r}, expected 'matrix' or 'columnar'", query, description
+        )
+    if max_points is not None and max_points < _MIN_MAX_POINTS:
+        return _error_response(
+            f"max_points must be at least {_MIN_MAX_POINTS}, got {max_points}", query, description
+        )
+
+    try:
+        start_ts, end_ts, step_seconds = _resolve_window(start, end, step)
+    except ValueError as e:
+        return _error_response(f"Invalid time range: {str(e)}", query, description)
 
-    # Call obs-mcp-server directly via HTTP
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.post(
-                "http://localhost:8002/mcp",
-                json=mcp_request,
-            )
-            response.raise_for_status()
-
-            # Parse MCP response
-            mcp_response = response.json()
-
-            if "error" in mcp_response:
-                return json.dumps({
-                    "error": f"MCP error: {mcp_response['error']}",
-                    "query": query,
-                    "description": description,
-                })
-
-            # Extract tool result from MCP response
-            # MCP returns: { result: { content: [{ type: "text", text: "..." }] } }
-            tool_result = mcp_response.get("result", {})
-
-            # Check if MCP server returned an error
-            if tool_result.get("isError"):
-                error_msg = _extract_text_content(tool_result.get("content", [])) or "Unknown error"
-                return json.dumps({
-                    "error": f"Query failed: {error_msg}",
-                    "query": query,
-                    "description": description,
-                })
-
-            # Extract and parse the Prometheus data from MCP response
-            text_content = _extract_text_content(tool_result.get("content", []))
-            if not text_content:
-                return json.dumps({
-                    "error": "No data returned from query",
-                    "query": query,
-                    "description": description,
-                })
-
-            try:
-                prometheus_data = json.loads(text_content)
-            except json.JSONDecodeError as e:
-                return json.dumps({
-                    "error": f"Failed to parse response: {str(e)}",
-                    "query": query,
-                    "description": description,
-                })
-
-            # Format for frontend
-            graph_data = {
-                "query": query,
-                "description": description,
-                "data": prometheus_data,  # Should be { resultType: 'matrix', result: [...] }
-            }
-
-            return json.dumps(graph_data)
+        graph_data = await _build_graph(
+            query, description, start_ts, end_ts, step_seconds, max_points, encoding
+        )
+        return await _offload_large_result(graph_data)
+
+    except (_QueryError, MCPClientError) as e:
+        return _error_response(str(e), query, description)
 
     except Exception as e:
-        return json.dumps({
-            "error": f"Failed to execute query: {str(e)}",
-            "query": query,
-            "description": description,
-        })
+        return _error_response(f"Failed to execute query: {str(e)}", query, description)
+
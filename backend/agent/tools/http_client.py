@@ -0,0 +1,130 @@
+"""
+Shared HTTP client for direct MCP server calls.
+
+Custom tools (graph_timeseries_data and friends) talk to the MCP servers over plain
+HTTP. Instead of opening a new httpx.AsyncClient per call, the whole process shares one
+pooled client with keep-alive, per-host connection limits and HTTP/2 when the server
+supports it.
+
+Lifecycle:
+    open_http_client()  - called from the FastAPI startup hook in main.py
+    close_http_client() - called from the FastAPI shutdown hook in main.py
+    get_http_client()   - used by tools; lazily opens the client if startup didn't run
+                          (e.g. when running under `adk web`)
+
+Pool usage is tracked so we can confirm connections are reused under load:
+    get_http_client_stats() -> {"requests": ..., "new_connections": ..., "reused_connections": ...}
+"""
+
+from typing import Optional
+import logging
+import httpx
+from config import config
+
+logger = logging.getLogger(__name__)
+
+
+class _PoolStats:
+    """Counters for requests sent and TCP connections opened by the shared client."""
+
+    def __init__(self):
+        self.requests = 0
+        self.new_connections = 0
+
+    def as_dict(self) -> dict:
+        reused = max(self.requests - self.new_connections, 0)
+        return {
+            "requests": self.requests,
+            "new_connections": self.new_connections,
+            "reused_connections": reused,
+            "reuse_ratio": round(reused / self.requests, 3) if self.requests else 0.0,
+        }
+
+
+class _CountingTransport(httpx.AsyncHTTPTransport):
+    """HTTP transport that records whether each request opened a new connection."""
+
+    def __init__(self, stats: _PoolStats, **kwargs):
+        super().__init__(**kwargs)
+        self._stats = stats
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self._stats.requests += 1
+        user_trace = request.extensions.get("trace")
+
+        async def trace(event_name: str, info: dict) -> None:
+            # httpcore only emits connect_tcp when the pool has no idle connection to reuse
+            if event_name == "connection.connect_tcp.started":
+                self._stats.new_connections += 1
+            if user_trace is not None:
+                await user_trace(event_name, info)
+
+        request.extensions["trace"] = trace
+        return await super().handle_async_request(request)
+
+
+_client: Optional[httpx.AsyncClient] = None
+_stats = _PoolStats()
+
+
+def _http2_available() -> bool:
+    """HTTP/2 needs the optional h2 package (httpx[http2])."""
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _build_client() -> httpx.AsyncClient:
+    http2 = config.HTTP_CLIENT_HTTP2 and _http2_available()
+    limits = httpx.Limits(
+        max_connections=config.HTTP_CLIENT_MAX_CONNECTIONS,
+        max_keepalive_connections=config.HTTP_CLIENT_MAX_KEEPALIVE,
+        keepalive_expiry=config.HTTP_CLIENT_KEEPALIVE_EXPIRY,
+    )
+    transport = _CountingTransport(_stats, http2=http2, limits=limits)
+    logger.info(
+        f"Opening shared HTTP client (http2={http2}, "
+        f"max_connections={limits.max_connections}, "
+        f"max_keepalive={limits.max_keepalive_connections})"
+    )
+    return httpx.AsyncClient(
+        transport=transport,
+        timeout=httpx.Timeout(config.HTTP_CLIENT_TIMEOUT, connect=5.0),
+    )
+
+
+async def open_http_client() -> httpx.AsyncClient:
+    """Open the process-wide client (idempotent)."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = _build_client()
+    return _client
+
+
+async def close_http_client() -> None:
+    """Close the process-wide client and release pooled connections."""
+    global _client
+    if _client is not None and not _client.is_closed:
+        await _client.aclose()
+        logger.info(f"Closed shared HTTP client: {_stats.as_dict()}")
+    _client = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Get the shared client, opening it lazily if the startup hook hasn't run.
+
+    Returns:
+        httpx.AsyncClient: Pooled client shared by all tools in this process
+    """
+    global _client
+    if _client is None or _client.is_closed:
+        _client = _build_client()
+    return _client
+
+
+def get_http_client_stats() -> dict:
+    """Connection pool counters (requests, new vs reused connections)."""
+    return _stats.as_dict()
@@ -0,0 +1,249 @@
+"""
+Background snapshot of detected incidents and firing alerts.
+
+incident_detection_expert calls get_incidents for every question, and the alerts
+fan-out queries ALERTS on obs-mcp for every question, so during an outage the upstream
+load grows with the number of users asking. With INCIDENT_SNAPSHOT_ENABLED, one
+background task per worker polls both every INCIDENT_SNAPSHOT_INTERVAL_SECONDS instead:
+
+    - get_incidents on the incident detection server and INCIDENT_SNAPSHOT_ALERTS_QUERY
+      (firing alerts) on obs-mcp, concurrently, through the shared MCP clients
+    - the latest result of each is kept in memory with its own "as of" time; a failed
+      poll keeps the previous result and records the error
+    - every poll that changes something appends a diff (added, resolved and changed
+      incidents or alerts) to a bounded history of INCIDENT_SNAPSHOT_HISTORY entries
+
+get_incident_snapshot is the tool the agents call: it answers from memory in
+milliseconds with a data_as_of timestamp, so upstream load stays constant however many
+users ask. get_incidents and execute_instant_query remain available for fresher data or
+filters. Poll counts, errors and snapshot age are reported under incident_snapshot in
+GET /health.
+"""
+
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Optional
+import asyncio
+import json
+import logging
+import time
+from config import config
+from .mcp_client import MCPClientError, extract_text_content, get_mcp_client
+
+logger = logging.getLogger(__name__)
+
+# Labels that don't identify an alert
+_ALERT_VOLATILE_LABELS = {"alertstate", "__name__"}
+
+
+def _iso(timestamp: float) -> str:
+    return datetime.fromtimestamp(timestamp, timezone.utc).isoformat(timespec="seconds")
+
+
+def _incident_key(incident: dict) -> str:
+    return str(incident.get("id") or json.dumps(incident, sort_keys=True, default=str))
+
+
+def _alert_key(alert: dict) -> str:
+    labels = {k: v for k, v in alert.items() if k not in _ALERT_VOLATILE_LABELS}
+    return ",".join(f"{k}={labels[k]}" for k in sorted(labels))
+
+
+def _parse_incidents(text: str) -> list[dict]:
+    """Incidents from a get_incidents result ({"incidents": [...]} or a bare list)."""
+    payload = json.loads(text) if text else []
+    if isinstance(payload, dict):
+        payload = payload.get("incidents", [])
+    if not isinstance(payload, list):
+        raise MCPClientError("get_incidents returned an unexpected payload")
+    return [item for item in payload if isinstance(item, dict)]
+
+
+def _parse_alerts(text: str) -> list[dict]:
+    """Label sets of the series in an instant query result (one per firing alert)."""
+    payload = json.loads(text) if text else {}
+    if isinstance(payload, dict) and "data" in payload:
+        payload = payload["data"]
+    result = payload.get("result", []) if isinstance(payload, dict) else []
+    return [item["metric"] for item in result if isinstance(item, dict) and isinstance(item.get("metric"), dict)]
+
+
+def diff(previous: list[dict], current: list[dict], key) -> dict:
+    """Added, resolved and changed items between two polls, by identity key."""
+    before = {key(item): item for item in previous}
+    after = {key(item): item for item in current}
+    return {
+        "added": [k for k in after if k not in before],
+        "resolved": [k for k in before if k not in after],
+        "changed": [k for k in after if k in before and after[k] != before[k]],
+    }
+
+
+class _Source:
+    """Latest result of one polled query."""
+
+    def __init__(self, name: str, key):
+        self.name = name
+        self.key = key
+        self.items: list[dict] = []
+        self.as_of: Optional[float] = None
+        self.error: Optional[str] = None
+        self.polls = 0
+        self.failures = 0
+
+
+class IncidentSnapshot:
+    """Periodically polled incidents and firing alerts with a bounded diff history."""
+
+    def __init__(self, interval_seconds: float, history_size: int, alerts_query: str):
+        self.interval_seconds = interval_seconds
+        self.alerts_query = alerts_query
+        self.incidents = _Source("incidents", _incident_key)
+        self.alerts = _Source("alerts", _alert_key)
+        self.history: deque[dict] = deque(maxlen=history_size)
+        self._task: Optional[asyncio.Task] = None
+
+    async def _call(self, url: str, tool: str, arguments: dict, headers: Optional[dict] = None) -> str:
+        result = await get_mcp_client(url, headers).call_tool(tool, arguments)
+        text = extract_text_content(result.get("content", []))
+        if result.get("isError"):
+            raise MCPClientError(f"{tool} failed: {text or 'Unknown error'}")
+        return text
+
+    async def _fetch_incidents(self) -> list[dict]:
+        token = config.OPENSHIFT_USER_TOKEN
+        headers = {"kubernetes-authorization": f"Bearer {token}"} if token else None
+        return _parse_incidents(await self._call(config.INCIDENTS_MCP_URL, "get_incidents", {}, headers))
+
+    async def _fetch_alerts(self) -> list[dict]:
+        text = await self._call(config.OBS_MCP_URL, "execute_instant_query", {"query": self.alerts_query})
+        return _parse_alerts(text)
+
+    def _update(self, source: _Source, outcome: Any, polled_at: float) -> None:
+        source.polls += 1
+        if isinstance(outcome, BaseException):
+            source.failures += 1
+            source.error = f"{type(outcome).__name__}: {outcome}"
+            logger.warning(f"Incident snapshot: polling {source.name} failed: {source.error}")
+            return
+        # The first poll is the baseline, not a change
+        if source.as_of is not None:
+            changes = diff(source.items, outcome, source.key)
+            if any(changes.values()):
+                self.history.append({"at": _iso(polled_at), "source": source.name, **changes})
+                logger.info(
+                    f"Incident snapshot: {source.name} +{len(changes['added'])} "
+                    f"-{len(changes['resolved'])} ~{len(changes['changed'])}"
+                )
+        source.items, source.as_of, source.error = outcome, polled_at, None
+
+    async def poll(self) -> None:
+        """Fetch incidents and firing alerts once and record what changed."""
+        polled_at = time.time()
+        incidents, alerts = await asyncio.gather(
+            self._fetch_incidents(), self._fetch_alerts(), return_exceptions=True
+        )
+        self._update(self.incidents, incidents, polled_at)
+        self._update(self.alerts, alerts, polled_at)
+
+    async def _poll_loop(self) -> None:
+        while True:
+            try:
+                await self.poll()
+            except Exception as e:
+                logger.warning(f"Incident snapshot poll failed: {e}")
+            await asyncio.sleep(self.interval_seconds)
+
+    async def start(self) -> None:
+        """Start polling (the first poll runs in the background too)."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._poll_loop())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    def snapshot(self, history: int) -> dict:
+        now = time.time()
+        response: dict[str, Any] = {"poll_interval_seconds": self.interval_seconds}
+        for source, field in ((self.incidents, "incidents"), (self.alerts, "firing_alerts")):
+            response[field] = {
+                "data_as_of": _iso(source.as_of) if source.as_of else None,
+                "age_seconds": round(now - source.as_of, 1) if source.as_of else None,
+                "count": len(source.items),
+                "items": source.items,
+            }
+            if source.error:
+                response[field]["last_poll_error"] = source.error
+        response["recent_changes"] = list(self.history)[-history:] if history > 0 else []
+        return response
+
+    def stats(self) -> dict:
+        now = time.time()
+        return {
+            "enabled": self.running,
+            "interval_seconds": self.interval_seconds,
+            "history": len(self.history),
+            **{
+                source.name: {
+                    "count": len(source.items),
+                    "age_seconds": round(now - source.as_of, 1) if source.as_of else None,
+                    "polls": source.polls,
+                    "failures": source.failures,
+                    "error": source.error,
+                }
+                for source in (self.incidents, self.alerts)
+            },
+        }
+
+
+incident_snapshot = IncidentSnapshot(
+    interval_seconds=config.INCIDENT_SNAPSHOT_INTERVAL_SECONDS,
+    history_size=config.INCIDENT_SNAPSHOT_HISTORY,
+    alerts_query=config.INCIDENT_SNAPSHOT_ALERTS_QUERY,
+)
+
+
+async def get_incident_snapshot(history: int = 10) -> str:
+    """
+    Currently detected incidents and firing Prometheus alerts from a background snapshot.
+
+    Answers instantly from memory. The snapshot is refreshed every poll_interval_seconds;
+    each part carries data_as_of (UTC) and age_seconds - always tell the user how old the
+    data is. recent_changes lists incidents and alerts that appeared, resolved or changed
+    between polls. Call get_incidents or execute_instant_query only if the user needs
+    fresher data than the snapshot, or filters it cannot answer.
+
+    Args:
+        history: Number of most recent changes to include (default: 10, 0 for none)
+
+    Returns:
+        JSON string:
+        {
+            "poll_interval_seconds": 30,
+            "incidents": {"data_as_of": "2025-01-01T12:00:00+00:00", "age_seconds": 12.3,
+                          "count": 2, "items": [...]},
+            "firing_alerts": {"data_as_of": "...", "age_seconds": 12.3, "count": 5,
+                              "items": [{"alertname": "...", "severity": "...", ...}]},
+            "recent_changes": [{"at": "...", "source": "alerts", "added": [...],
+                                "resolved": [...], "changed": [...]}]
+        }
+        A part that could not be refreshed carries last_poll_error.
+    """
+    if not incident_snapshot.running:
+        return json.dumps({"error": "Incident snapshot is disabled, use get_incidents instead"})
+    if incident_snapshot.incidents.as_of is None and incident_snapshot.alerts.as_of is None:
+        error = incident_snapshot.incidents.error or incident_snapshot.alerts.error
+        return json.dumps({
+            "error": "No snapshot yet" + (f" ({error})" if error else "") + ", use get_incidents instead",
+        })
+    return json.dumps(incident_snapshot.snapshot(max(0, min(history, 50))), default=str)
@@ -0,0 +1,270 @@
+"""
+Minimal async MCP client for direct tool calls over streamable HTTP.
+
+The McpToolsets used by the agents manage their own sessions. Custom tools that call
+an MCP server directly (graph_timeseries_data, ...) go through this client instead of
+hand-rolling JSON-RPC requests:
+
+    - Runs the MCP initialize handshake once per server and reuses the session
+      (Mcp-Session-Id header) for every later call
+    - Uses unique JSON-RPC request ids so concurrent calls can share the session
+    - Accepts both plain JSON and SSE (text/event-stream) responses
+    - Re-initializes transparently when the server expires the session (HTTP 404)
+
+All requests are sent through the shared pooled HTTP client (see http_client.py), and
+tool calls through the server's bulkhead and circuit breaker (see resilience.py).
+
+Usage:
+    client = get_mcp_client("http://localhost:8002/mcp")
+    result = await client.call_tool("execute_range_query", {"query": "up", ...})
+    # result: {"content": [{"type": "text", "text": "..."}], "isError": false}
+"""
+
+from typing import Any, Optional
+import asyncio
+import itertools
+import json
+import logging
+from .http_client import get_http_client
+from .resilience import matches_any, server_guard
+from config import config
+
+logger = logging.getLogger(__name__)
+
+PROTOCOL_VERSION = "2025-06-18"
+SESSION_HEADER = "mcp-session-id"
+
+
+class MCPClientError(Exception):
+    """Raised when an MCP server returns a JSON-RPC error or an unusable response."""
+
+
+class _SessionExpired(Exception):
+    """Internal: the server no longer recognizes our session id."""
+
+
+class MCPClient:
+    """Session-reusing MCP client for a single streamable-HTTP server."""
+
+    def __init__(self, url: str, headers: Optional[dict] = None):
+        self.url = url
+        self._headers = dict(headers or {})
+        self._session_id: Optional[str] = None
+        self._protocol_version = PROTOCOL_VERSION
+        self._initialized = False
+        self._init_lock = asyncio.Lock()
+        self._ids = itertools.count(1)
+
+    def _request_headers(self) -> dict:
+        headers = {
+            "Accept": "application/json, text/event-stream",
+            "Content-Type": "application/json",
+            "MCP-Protocol-Version": self._protocol_version,
+            **self._headers,
+        }
+        if self._session_id:
+            headers["Mcp-Session-Id"] = self._session_id
+        return headers
+
+    async def _post(self, message: dict) -> Optional[dict]:
+        """
+        POST a JSON-RPC message and return the matching response.
+
+        Returns None for notifications (no id). Raises _SessionExpired on HTTP 404
+        while holding a session id, as required by the streamable-HTTP transport.
+        """
+        client = get_http_client()
+        async with client.stream(
+            "POST", self.url, json=message, headers=self._request_headers()
+        ) as response:
+            if response.status_code == 404 and self._session_id:
+                raise _SessionExpired()
+            response.raise_for_status()
+
+            if SESSION_HEADER in response.headers:
+                self._session_id = response.headers[SESSION_HEADER]
+
+            if "id" not in message:
+                return None
+
+            content_type = response.headers.get("content-type", "")
+            if content_type.startswith("text/event-stream"):
+                return await _read_sse_response(response, message["id"])
+
+            body = await response.aread()
+            if not body:
+                raise MCPClientError("Empty response from MCP server")
+            return _match_response(json.loads(body), message["id"])
+
+    async def _initialize(self, expired_session: Optional[str] = None) -> None:
+        """
+        Run the initialize handshake unless a session is already up.
+
+        Args:
+            expired_session: Session id the server rejected. Concurrent requests that hit
+                the same expiry re-initialize once: whoever gets the lock first opens the
+                new session, the others find a different session id and reuse it.
+        """
+        async with self._init_lock:
+            if expired_session is not None and self._session_id == expired_session:
+                self._initialized = False
+            if self._initialized:
+                return
+            self._session_id = None
+            self._protocol_version = PROTOCOL_VERSION
+            response = await self._post({
+                "jsonrpc": "2.0",
+                "id": next(self._ids),
+                "method": "initialize",
+                "params": {
+                    "protocolVersion": PROTOCOL_VERSION,
+                    "capabilities": {},
+                    "clientInfo": {"name": config.AGENT_NAME, "version": "0.1.0"},
+                },
+            })
+            result = _unwrap(response)
+            self._protocol_version = result.get("protocolVersion", PROTOCOL_VERSION)
+            await self._post({"jsonrpc": "2.0", "method": "notifications/initialized"})
+            self._initialized = True
+            logger.info(
+                f"MCP session initialized for {self.url} "
+                f"(session={self._session_id}, protocol={self._protocol_version})"
+            )
+
+    async def request(self, method: str, params: Optional[dict] = None) -> dict:
+        """
+        Send a JSON-RPC request on the shared session and return its result.
+
+        Raises:
+            MCPClientError: If the server returns a JSON-RPC error, or rejects the session
+                again after re-initializing
+        """
+        if not self._initialized:
+            await self._initialize()
+
+        message = {"jsonrpc": "2.0", "id": next(self._ids), "method": method}
+        if params is not None:
+            message["params"] = params
+
+        session_id = self._session_id
+        try:
+            return _unwrap(await self._post(message))
+        except _SessionExpired:
+            logger.info(f"MCP session expired for {self.url}, re-initializing")
+        await self._initialize(expired_session=session_id)
+        message["id"] = next(self._ids)
+        try:
+            return _unwrap(await self._post(message))
+        except _SessionExpired:
+            raise MCPClientError(f"MCP session for {self.url} expired again right after re-initializing")
+
+    async def call_tool(self, name: str, arguments: dict) -> dict:
+        """
+        Call an MCP tool through the server's bulkhead, deadline and circuit breaker.
+
+        The guard is shared with the agents' toolset for the same server (see
+        resilience.py); tools matching MCP_RETRY_TOOLS are retried.
+
+        Returns:
+            dict: MCP tool result ({"content": [...], "isError": bool}); when the server
+            is unavailable, busy or failed, an isError result saying so
+
+        Raises:
+            MCPClientError: If the server answered with a JSON-RPC error
+        """
+        return await server_guard(self.url).call(
+            name,
+            lambda: self.request("tools/call", {"name": name, "arguments": arguments}),
+            read_only=matches_any(name, config.MCP_RETRY_TOOLS),
+            passthrough=(MCPClientError,),
+        )
+
+    async def close(self) -> None:
+        """Terminate the server-side session (best effort)."""
+        if self._session_id:
+            try:
+                await get_http_client().delete(self.url, headers=self._request_headers())
+            except Exception as e:
+                logger.debug(f"Failed to close MCP session for {self.url}: {e}")
+        self._session_id = None
+        self._initialized = False
+
+
+def _match_response(payload: Any, request_id: int) -> Optional[dict]:
+    """Pick the response for request_id out of a single message or a JSON-RPC batch."""
+    messages = payload if isinstance(payload, list) else [payload]
+    for message in messages:
+        if isinstance(message, dict) and message.get("id") == request_id:
+            return message
+    return None
+
+
+async def _read_sse_response(response, request_id: int) -> dict:
+    """Read SSE events until the JSON-RPC response for request_id arrives."""
+    data_lines: list[str] = []
+    async for line in response.aiter_lines():
+        if line.startswith("data:"):
+            data_lines.append(line[5:].lstrip())
+            continue
+        if line or not data_lines:
+            # event:/id:/retry: fields and comments carry nothing we need
+            continue
+
+        # Blank line terminates the event
+        data = "\n".join(data_lines)
+        data_lines = []
+        try:
+            message = _match_response(json.loads(data), request_id)
+        except json.JSONDecodeError:
+            continue
+        if message is not None:
+            return message
+
+    if data_lines:
+        message = _match_response(json.loads("\n".join(data_lines)), request_id)
+        if message is not None:
+            return message
+    raise MCPClientError("SSE stream ended without a response")
+
+
+def _unwrap(response: Optional[dict]) -> dict:
+    if response is None:
+        raise MCPClientError("No response from MCP server")
+    if "error" in response:
+        raise MCPClientError(f"MCP error: {response['error']}")
+    return response.get("result", {})
+
+
+def extract_text_content(content_items: list) -> str:
+    """Extract text from MCP content items."""
+    for item in content_items:
+        if item.get("type") == "text":
+            return item.get("text", "")
+    return ""
+
+
+_clients: dict[str, MCPClient] = {}
+
+
+def get_mcp_client(url: str, headers: Optional[dict] = None) -> MCPClient:
+    """
+    Get the process-wide MCP client for a server URL.
+
+    Args:
+        url: Streamable-HTTP MCP endpoint (e.g. http://localhost:8002/mcp)
+        headers: Extra headers sent with every request (auth, ...); only used on first call
+
+    Returns:
+        MCPClient: Shared client whose session is reused across calls
+    """
+    client = _clients.get(url)
+    if client is None:
+        client = _clients[url] = MCPClient(url, headers)
+    return client
+
+
+async def close_mcp_clients() -> None:
+    """Close all MCP sessions (called from the FastAPI shutdown hook)."""
+    for client in list(_clients.values()):
+        await client.close()
+    _clients.clear()
@@ -0,0 +1,295 @@
+"""
+Local metric catalog and search_metrics tool.
+
+On a real OpenShift cluster list_metrics returns thousands of names, and pushing all of
+them into the LLM context on every question is our biggest token and latency cost.
+The catalog keeps metric names in process (refreshed in the background from obs-mcp)
+with a trigram index, so the agent can verify a metric exists with a ranked search that
+returns only the top matches plus label hints.
+
+Label names and label values are fetched lazily from obs-mcp for the metrics that
+actually show up in search results and cached with a TTL.
+
+Lifecycle:
+    await metric_catalog.start()  - FastAPI startup: first refresh + background loop
+    await metric_catalog.stop()   - FastAPI shutdown
+"""
+
+from typing import Optional
+import asyncio
+import difflib
+import json
+import logging
+import re
+import time
+from config import config
+from .mcp_client import MCPClientError, extract_text_content, get_mcp_client
+
+logger = logging.getLogger(__name__)
+
+# How many of the top matches get label name hints
+_LABEL_HINT_MATCHES = 3
+_MAX_LABEL_VALUES = 25
+
+
+def _trigrams(text: str) -> set[str]:
+    padded = f"  {text.lower()} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _split_words(text: str) -> list[str]:
+    return [w for w in re.split(r"[\s_:]+", text.lower()) if w]
+
+
+def _parse_name_list(text: str) -> list[str]:
+    """
+    Parse a list of names from an obs-mcp text result.
+
+    Accepts a JSON array, a JSON object wrapping an array ({"metrics": [...]}, ...)
+    or newline/comma separated text.
+    """
+    try:
+        payload = json.loads(text)
+    except json.JSONDecodeError:
+        return [n for n in re.split(r"[\n,]+", text) if n.strip() and " " not in n.strip()]
+
+    if isinstance(payload, dict):
+        payload = next((v for v in payload.values() if isinstance(v, list)), [])
+    if not isinstance(payload, list):
+        return []
+    return [str(n) for n in payload if isinstance(n, (str, int, float))]
+
+
+class MetricCatalog:
+    """In-process index of metric names with lazily cached label hints."""
+
+    def __init__(self, refresh_seconds: float, label_ttl_seconds: float):
+        self.refresh_seconds = refresh_seconds
+        self.label_ttl_seconds = label_ttl_seconds
+        self._names: list[str] = []
+        self._trigram_index: dict[str, list[int]] = {}
+        self._token_index: dict[str, list[int]] = {}
+        self._labels: dict[str, tuple[float, list[str]]] = {}
+        self._label_values: dict[tuple[str, str], tuple[float, list[str]]] = {}
+        self._refreshed_at = 0.0
+        self._refresh_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def size(self) -> int:
+        return len(self._names)
+
+    async def _call(self, tool: str, arguments: dict) -> list[str]:
+        result = await get_mcp_client(config.OBS_MCP_URL).call_tool(tool, arguments)
+        text = extract_text_content(result.get("content", []))
+        if result.get("isError"):
+            raise MCPClientError(f"{tool} failed: {text or 'Unknown error'}")
+        return _parse_name_list(text)
+
+    async def refresh(self) -> None:
+        """Reload metric names from obs-mcp and rebuild the search index."""
+        async with self._refresh_lock:
+            await self._load()
+
+    async def _load(self) -> None:
+        """Fetch metric names and swap in a new index (caller holds _refresh_lock)."""
+        started = time.monotonic()
+        names = sorted(set(await self._call("list_metrics", {})))
+        index: dict[str, list[int]] = {}
+        tokens: dict[str, list[int]] = {}
+        for i, name in enumerate(names):
+            for trigram in _trigrams(name):
+                index.setdefault(trigram, []).append(i)
+            for token in set(_split_words(name)):
+                tokens.setdefault(token, []).append(i)
+        self._names, self._trigram_index, self._token_index = names, index, tokens
+        self._refreshed_at = time.time()
+        logger.info(
+            f"Metric catalog refreshed: {len(names)} metrics "
+            f"in {(time.monotonic() - started) * 1000:.0f}ms"
+        )
+
+    async def _refresh_loop(self) -> None:
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.warning(f"Metric catalog refresh failed: {e}")
+            await asyncio.sleep(self.refresh_seconds)
+
+    async def start(self) -> None:
+        """Start background refresh (first refresh runs in the background too)."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._refresh_loop())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def ensure_loaded(self) -> None:
+        """Load the catalog inline if the background refresh hasn't filled it yet."""
+        if self._names:
+            return
+        async with self._refresh_lock:
+            # Concurrent callers (or the background refresh) may have loaded it while we waited
+            if not self._names:
+                await self._load()
+
+    def search(self, query: str, limit: int = 10) -> list[tuple[str, float]]:
+        """
+        Rank metric names against a free-text query.
+
+        Scoring (highest wins): exact match, prefix, substring, all query words
+        present (e.g. "cpu container" -> container_cpu_usage_seconds_total),
+        then trigram similarity for typos and partial words.
+        """
+        query = query.strip().lower()
+        if not query:
+            return []
+        words = _split_words(query)
+        query_trigrams = _trigrams(query)
+
+        # Trigram overlap counts for every candidate sharing at least one trigram
+        overlap: dict[int, int] = {}
+        for trigram in query_trigrams:
+            for i in self._trigram_index.get(trigram, ()):
+                overlap[i] = overlap.get(i, 0) + 1
+
+        # Name tokens close to each query word ("memry" -> "memory") for typo tolerance
+        close_words: dict[int, set[str]] = {}
+        for word in words:
+            for token in difflib.get_close_matches(word, self._token_index, n=5, cutoff=0.75):
+                for i in self._token_index[token]:
+                    close_words.setdefault(i, set()).add(word)
+                    overlap.setdefault(i, 0)
+
+        scored = []
+        for i, shared in overlap.items():
+            name = self._names[i].lower()
+            if name == query:
+                score = 1.0
+            elif name.startswith(query):
+                score = 0.9
+            elif query in name:
+                score = 0.8
+            elif all(w in name for w in words):
+                score = 0.7
+            else:
+                # Words found exactly or with a typo, plus share of query trigrams in the name
+                fuzzy = close_words.get(i, set())
+                matched = sum(1 for w in words if w in name or w in fuzzy)
+                containment = shared / len(query_trigrams)
+                score = max(0.6 * matched / len(words), 0.4 * containment)
+            # Prefer shorter names among equally good matches
+            score -= len(name) / 100000
+            scored.append((self._names[i], score))
+
+        scored.sort(key=lambda item: item[1], reverse=True)
+        return [(name, round(score, 3)) for name, score in scored[:limit] if score > 0.25]
+
+    async def label_names(self, metric: str) -> list[str]:
+        """Label names for a metric (cached with TTL)."""
+        cached = self._labels.get(metric)
+        if cached and time.time() - cached[0] < self.label_ttl_seconds:
+            return cached[1]
+        names = await self._call("get_label_names", {"metric": metric})
+        names = sorted(n for n in names if n != "__name__")
+        self._labels[metric] = (time.time(), names)
+        return names
+
+    async def label_values(self, metric: str, label: str) -> list[str]:
+        """Values of one label for a metric (cached with TTL)."""
+        key = (metric, label)
+        cached = self._label_values.get(key)
+        if cached and time.time() - cached[0] < self.label_ttl_seconds:
+            return cached[1]
+        values = sorted(await self._call("get_label_values", {"label": label, "metric": metric}))
+        self._label_values[key] = (time.time(), values)
+        return values
+
+    def stats(self) -> dict:
+        return {
+            "metrics": len(self._names),
+            "refreshed_at": self._refreshed_at,
+            "cached_label_sets": len(self._labels),
+            "cached_label_values": len(self._label_values),
+        }
+
+
+metric_catalog = MetricCatalog(
+    refresh_seconds=config.METRIC_CATALOG_REFRESH_SECONDS,
+    label_ttl_seconds=config.METRIC_CATALOG_LABEL_TTL_SECONDS,
+)
+
+
+async def search_metrics(query: str, limit: int = 10, label: Optional[str] = None) -> str:
+    """
+    Search the cluster's metric catalog and return only the best matching metric names.
+
+    Use this to find and verify metric names instead of list_metrics. Matching is
+    ranked: exact name, prefix, substring, all words present, then fuzzy (typos).
+
+    Args:
+        query: Metric name, prefix or keywords (e.g. "container_cpu", "memory working set")
+        limit: Maximum number of matches to return (default: 10)
+        label: Optional label name (e.g. "namespace"); when set, known values of this
+            label are returned for the top match
+
+    Returns:
+        JSON string:
+        {
+            "query": "...",
+            "total_metrics": 4213,
+            "matches": [
+                {"metric": "container_cpu_usage_seconds_total", "score": 0.9,
+                 "labels": ["container", "namespace", "pod", ...]},
+                ...
+            ],
+            "label_values": {"label": "namespace", "values": [...], "total": 57}
+        }
+        Label names are included for the top matches only.
+    """
+    try:
+        await metric_catalog.ensure_loaded()
+    except Exception as e:
+        return json.dumps({
+            "error": f"Metric catalog unavailable ({str(e)}), use list_metrics instead",
+            "query": query,
+        })
+
+    limit = max(1, min(limit, 50))
+    matches = [{"metric": name, "score": score} for name, score in metric_catalog.search(query, limit)]
+
+    # Label hints are best effort - a failure must not hide the matches
+    async def add_labels(match: dict) -> None:
+        try:
+            match["labels"] = await metric_catalog.label_names(match["metric"])
+        except Exception as e:
+            logger.debug(f"Label hint lookup failed for {match['metric']}: {e}")
+
+    await asyncio.gather(*(add_labels(m) for m in matches[:_LABEL_HINT_MATCHES]))
+
+    response = {
+        "query": query,
+        "total_metrics": metric_catalog.size,
+        "matches": matches,
+    }
+
+    if label and matches:
+        try:
+            values = await metric_catalog.label_values(matches[0]["metric"], label)
+            response["label_values"] = {
+                "metric": matches[0]["metric"],
+                "label": label,
+                "values": values[:_MAX_LABEL_VALUES],
+                "total": len(values),
+            }
+        except Exception as e:
+            response["label_values"] = {"label": label, "error": str(e)}
+
+    return json.dumps(response)
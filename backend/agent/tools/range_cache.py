@@ -0,0 +1,191 @@
+"""
+Incremental cache for PromQL range query results.
+
+Users keep re-asking for the same sliding window ("CPU for namespace X over the last
+hour"). Instead of fetching the whole NOW-1h..NOW window from obs-mcp every time,
+results are cached per (normalized query, step) with windows aligned to the step:
+
+    - Full hit:    cached window already covers the request -> no upstream call
+    - Partial hit: cached window covers the start -> fetch only the tail since the
+                   last cached sample and merge it in
+    - Miss:        fetch the full window and store it
+
+Entries are evicted LRU once the estimated memory footprint exceeds the budget.
+"""
+
+from collections import OrderedDict
+from typing import Awaitable, Callable, Optional
+import logging
+import re
+from .time_range import align
+
+logger = logging.getLogger(__name__)
+
+# Rough per-sample cost of a [timestamp, "value"] pair held in Python lists
+_BYTES_PER_SAMPLE = 120
+_BYTES_PER_SERIES = 200
+
+_QUOTED_RE = re.compile(r"(\"(?:[^\"\\]|\\.)*\"|'(?:[^'\\]|\\.)*'|`[^`]*`)")
+
+# fetch(start, end) -> Prometheus matrix data ({"resultType": "matrix", "result": [...]})
+RangeFetcher = Callable[[float, float], Awaitable[dict]]
+
+
+def normalize_query(query: str) -> str:
+    """Collapse whitespace outside string literals so equivalent queries share a key."""
+    parts = _QUOTED_RE.split(query.strip())
+    for i in range(0, len(parts), 2):
+        parts[i] = re.sub(r"\s+", " ", parts[i])
+        parts[i] = re.sub(r"\s*([(){}\[\],])\s*", r"\1", parts[i])
+    return "".join(parts)
+
+
+class _Entry:
+    """Cached samples for one (query, step) pair, keyed by series labels."""
+
+    def __init__(self, step: float):
+        self.step = step
+        self.start = 0.0
+        self.end = 0.0
+        self.span = 0.0
+        self.series: dict[tuple, dict] = {}
+        self.size = 0
+
+    def merge(self, data: dict, from_ts: float) -> None:
+        """Replace samples at or after from_ts with freshly fetched ones."""
+        fetched = {}
+        for series in data.get("result", []):
+            key = tuple(sorted(series.get("metric", {}).items()))
+            fetched[key] = series
+
+        for key, cached in self.series.items():
+            cached["values"] = [v for v in cached["values"] if float(v[0]) < from_ts]
+        for key, series in fetched.items():
+            cached = self.series.setdefault(key, {"metric": series.get("metric", {}), "values": []})
+            cached["values"].extend(series.get("values", []))
+
+    def trim(self) -> None:
+        """Drop samples older than the widest window requested for this entry."""
+        oldest = self.end - self.span
+        self.start = max(self.start, oldest)
+        for key in list(self.series):
+            values = [v for v in self.series[key]["values"] if float(v[0]) >= self.start]
+            if values:
+                self.series[key]["values"] = values
+            else:
+                del self.series[key]
+        self.size = sum(
+            _BYTES_PER_SERIES + _BYTES_PER_SAMPLE * len(s["values"]) for s in self.series.values()
+        )
+
+    def slice(self, start: float, end: float) -> dict:
+        result = []
+        for series in self.series.values():
+            values = [v for v in series["values"] if start <= float(v[0]) <= end]
+            if values:
+                result.append({"metric": series["metric"], "values": values})
+        return {"resultType": "matrix", "result": result}
+
+
+class RangeQueryCache:
+    """LRU cache of range query results bounded by estimated memory use."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[tuple, _Entry] = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.partial_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    async def get_range(
+        self,
+        query: str,
+        start: float,
+        end: float,
+        step: float,
+        fetch: RangeFetcher,
+    ) -> tuple[dict, str]:
+        """
+        Return matrix data for [start, end] at step, fetching only what's missing.
+
+        Args:
+            query: PromQL query
+            start, end: Window bounds in epoch seconds (aligned down to step here)
+            step: Resolution in seconds
+            fetch: Coroutine fetching matrix data for an aligned [start, end]
+
+        Returns:
+            tuple: (matrix data, cache outcome: "hit" | "partial" | "miss")
+        """
+        start, end = align(start, step), align(end, step)
+        key = (normalize_query(query), step)
+        entry = self._entries.get(key)
+
+        if entry is not None and entry.start <= start <= entry.end:
+            self._entries.move_to_end(key)
+            if end <= entry.end:
+                self.hits += 1
+                return entry.slice(start, end), "hit"
+
+            # Re-fetch the last cached sample too - it may have been evaluated on partial data
+            tail_start = entry.end
+            data = await fetch(tail_start, end)
+            entry.merge(data, tail_start)
+            entry.end = end
+            entry.span = max(entry.span, end - start)
+            current = self._entries.get(key)
+            if current is entry:
+                self._resize(key, entry)
+            elif current is None:
+                # Evicted while fetching: store it again as a new entry
+                self._entries[key] = entry
+                self._resize(key, entry, previous=0)
+            else:
+                # Replaced while fetching: serve from it, but it's no longer accounted for
+                entry.trim()
+            self.partial_hits += 1
+            return entry.slice(start, end), "partial"
+
+        data = await fetch(start, end)
+        if data.get("resultType") != "matrix":
+            self.misses += 1
+            return data, "miss"
+
+        entry = _Entry(step)
+        entry.merge(data, start)
+        entry.start, entry.end, entry.span = start, end, end - start
+        if key in self._entries:
+            self._bytes -= self._entries.pop(key).size
+        self._entries[key] = entry
+        self._resize(key, entry, previous=0)
+        self.misses += 1
+        return entry.slice(start, end), "miss"
+
+    def _resize(self, key: tuple, entry: _Entry, previous: Optional[int] = None) -> None:
+        previous = entry.size if previous is None else previous
+        entry.trim()
+        self._bytes += entry.size - previous
+        while self._bytes > self.max_bytes and len(self._entries) > 1:
+            evicted_key, evicted = self._entries.popitem(last=False)
+            if evicted_key == key:
+                # Never evict the entry we're about to serve; put it back as most recent
+                self._entries[evicted_key] = evicted
+                continue
+            self._bytes -= evicted.size
+            self.evictions += 1
+
+    def stats(self) -> dict:
+        """Hit/miss counters and memory use."""
+        lookups = self.hits + self.partial_hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "partial_hits": self.partial_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": round((self.hits + self.partial_hits) / lookups, 3) if lookups else 0.0,
+        }
@@ -0,0 +1,543 @@
+"""
+Failure isolation for the MCP servers (kubernetes :8001, obs :8002, incidents :8003).
+
+Without it, a stalled MCP server (e.g. a dead port-forward to the cluster-health
+server) holds every chat request that reaches it until the transport gives up, and
+those requests pile up on the worker. A ServerGuard per MCP server URL protects every
+call to it, from the agents' McpToolsets (through ResilientToolset) and from custom
+tools calling the server directly (MCPClient.call_tool, see mcp_client.py):
+
+    - Bulkhead: at most MCP_MAX_CONCURRENCY calls in flight per server; a call that
+      can't get a slot within its deadline is rejected as busy, so one slow server can't
+      take all of the worker's capacity
+    - Deadline per tool call (MCP_TOOL_TIMEOUT_SECONDS, overridden per tool by
+      MCP_TOOL_TIMEOUTS), covering both the wait for a slot and the call itself
+    - Circuit breaker: after MCP_BREAKER_FAILURES consecutive failures the server is
+      skipped for MCP_BREAKER_RESET_SECONDS, then one trial call decides whether it
+      closes again. While open, calls fail immediately with a message the agent can
+      relay ("incidents is unavailable, retry in 25s")
+    - Retries with full-jitter exponential backoff, only for read-only tools (MCP
+      readOnlyHint/idempotentHint annotation, or a name matching MCP_RETRY_TOOLS)
+
+ResilientToolset wraps each McpToolset and runs its calls through the server's guard.
+It also owns the server's tool list. ADK asks every toolset for its tools (tools/list)
+on every LLM call and the runner closes the toolsets, and with them the MCP sessions,
+after every run, so each chat request paid for a new session and discovery on all three
+servers. Instead:
+
+    - start() (called from the FastAPI startup hook) discovers the tools of all servers
+      concurrently, which also opens their MCP sessions, and refreshes them every
+      MCP_TOOLS_TTL_SECONDS / 2 in the background
+    - get_tools() serves the cached list while it is younger than MCP_TOOLS_TTL_SECONDS;
+      a changed schema bumps the list's version
+    - close() after a run leaves the session open; ADK's session pool reconnects dropped
+      sessions and closes idle ones, and aclose() closes it at shutdown
+    - if a server is down its cached tools are still served (calls fail fast through the
+      breaker); a server never reached is left out of the agent's tools by ADK, and the
+      other servers keep working
+
+get_discovery_status() backs GET /ready.
+
+Failures are exceptions, deadlines and ADK's {"error": ...} transport results. MCP
+results with isError set are answers from a healthy server (e.g. bad PromQL) and pass
+through untouched. Failed calls return an MCP-shaped error result instead of raising, so
+the agent run continues and caches in front of the toolset don't store them.
+
+Breaker state and call counts per server (named after its toolset, or host:port for a
+server only called directly) are reported under mcp_servers in GET /health
+and as adk_mcp_circuit_state / adk_mcp_calls_in_flight gauges in GET /metrics.
+"""
+
+from typing import Any, Awaitable, Callable, Iterable, Optional
+import asyncio
+import fnmatch
+import hashlib
+import json
+import logging
+import random
+import time
+from urllib.parse import urlparse
+from google.adk.agents.readonly_context import ReadonlyContext
+from google.adk.tools.base_tool import BaseTool
+from google.adk.tools.base_toolset import BaseToolset
+from google.adk.tools.tool_context import ToolContext
+from config import config
+from ..telemetry import registry
+from .wrapped_toolset import WrappedToolset
+
+logger = logging.getLogger(__name__)
+
+CLOSED, HALF_OPEN, OPEN = "closed", "half_open", "open"
+_STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker with a single half-open trial call."""
+
+    def __init__(self, failure_threshold: int, reset_seconds: float):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.times_opened = 0
+        self._trial_running = False
+
+    def retry_after(self) -> float:
+        """Seconds until an open breaker lets a trial call through."""
+        return max(0.0, self.opened_at + self.reset_seconds - time.monotonic())
+
+    def allow(self) -> bool:
+        """Whether a call may go to the server now (claims the trial slot when half-open)."""
+        if self.state == OPEN:
+            if self.retry_after() > 0:
+                return False
+            self.state = HALF_OPEN
+        if self.state == HALF_OPEN:
+            if self._trial_running:
+                return False
+            self._trial_running = True
+        return True
+
+    def record_success(self) -> None:
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self._trial_running = False
+
+    def record_failure(self) -> None:
+        self.consecutive_failures += 1
+        self._trial_running = False
+        if self.state == HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            if self.state != OPEN:
+                self.times_opened += 1
+            self.state = OPEN
+            self.opened_at = time.monotonic()
+
+    def release(self) -> None:
+        """Give back a trial slot whose call ended without a verdict (e.g. cancelled)."""
+        self._trial_running = False
+
+    def stats(self) -> dict:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "times_opened": self.times_opened,
+            "retry_after_seconds": round(self.retry_after(), 1) if self.state == OPEN else 0.0,
+        }
+
+
+class _CallFailed(Exception):
+    """A tool call that counts against the server (raised, timed out or transport error)."""
+
+
+class _Busy(Exception):
+    """The bulkhead had no free slot within the call's deadline."""
+
+
+def error_result(message: str) -> dict:
+    """Tool result in the MCP CallToolResult shape with isError set."""
+    return {"content": [{"type": "text", "text": message}], "isError": True}
+
+
+def is_read_only(tool: BaseTool, patterns: Iterable[str]) -> bool:
+    """Whether tool is annotated read-only or idempotent, or its name matches one of patterns."""
+    mcp_tool = tool
+    # Tools of stacked wrappers (WrappedToolset) delegate to the McpTool underneath
+    while getattr(mcp_tool, "inner", None) is not None:
+        mcp_tool = mcp_tool.inner
+    annotations = getattr(getattr(mcp_tool, "raw_mcp_tool", None), "annotations", None)
+    if annotations is not None and (
+        getattr(annotations, "readOnlyHint", False) or getattr(annotations, "idempotentHint", False)
+    ):
+        return True
+    return matches_any(tool.name, patterns)
+
+
+def matches_any(name: str, patterns: Iterable[str]) -> bool:
+    """Whether a tool name matches one of the fnmatch patterns (e.g. MCP_RETRY_TOOLS)."""
+    return any(fnmatch.fnmatchcase(name, pattern) for pattern in patterns)
+
+
+class ServerGuard:
+    """Bulkhead, per-tool deadline, circuit breaker and retries for every call to one MCP server."""
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        max_concurrency: int,
+        timeout: float,
+        tool_timeouts: Optional[dict[str, float]] = None,
+        failure_threshold: int = 5,
+        reset_seconds: float = 30.0,
+        retries: int = 2,
+        retry_base_seconds: float = 0.2,
+    ):
+        self.name = name
+        self.timeout = timeout
+        self.tool_timeouts = tool_timeouts or {}
+        self.retries = retries
+        self.retry_base_seconds = retry_base_seconds
+        self.breaker = CircuitBreaker(failure_threshold, reset_seconds)
+        self._slots = asyncio.Semaphore(max_concurrency)
+        self.max_concurrency = max_concurrency
+        self.in_flight = 0
+        self.calls = 0
+        self.failures = 0
+        self.timeouts = 0
+        self.rejected = 0
+        self.short_circuited = 0
+        self.retried = 0
+
+    @classmethod
+    def from_config(cls, name: str) -> "ServerGuard":
+        """A guard with the MCP_* settings from config."""
+        return cls(
+            name,
+            max_concurrency=config.MCP_MAX_CONCURRENCY,
+            timeout=config.MCP_TOOL_TIMEOUT_SECONDS,
+            tool_timeouts=config.MCP_TOOL_TIMEOUTS,
+            failure_threshold=config.MCP_BREAKER_FAILURES,
+            reset_seconds=config.MCP_BREAKER_RESET_SECONDS,
+            retries=config.MCP_RETRIES,
+            retry_base_seconds=config.MCP_RETRY_BASE_SECONDS,
+        )
+
+    async def call(
+        self,
+        tool_name: str,
+        run: Callable[[], Awaitable[Any]],
+        *,
+        read_only: bool,
+        passthrough: tuple[type[Exception], ...] = (),
+    ) -> Any:
+        """
+        Run one tool call (run() makes one attempt) behind the bulkhead and breaker.
+
+        Args:
+            tool_name: Tool name, for the per-tool deadline and messages
+            run: Makes one attempt at the call
+            read_only: Whether failed attempts may be retried
+            passthrough: Exceptions that are answers from a healthy server; they are
+                raised to the caller without counting as failures
+
+        Returns:
+            The tool result, or an MCP-shaped error result if the server is unavailable,
+            busy or failed
+        """
+        self.calls += 1
+        timeout = self.tool_timeouts.get(tool_name, self.timeout)
+        attempts = 1 + (self.retries if read_only else 0)
+        for attempt in range(attempts):
+            if not self.breaker.allow():
+                self.short_circuited += 1
+                return error_result(
+                    f"The {self.name} MCP server is unavailable after repeated failures; the call to "
+                    f"{tool_name} was not attempted. Retry in {max(self.breaker.retry_after(), 1):.0f}s."
+                )
+            try:
+                result = await self._call_once(run, timeout, passthrough)
+            except _CallFailed as e:
+                self.failures += 1
+                self.breaker.record_failure()
+                if attempt + 1 < attempts and self.breaker.state != OPEN:
+                    self.retried += 1
+                    # Full jitter: uniform in [0, base * 2^attempt]
+                    await asyncio.sleep(random.uniform(0, self.retry_base_seconds * 2 ** attempt))
+                    continue
+                logger.warning(f"{self.name}: {tool_name} failed after {attempt + 1} attempt(s): {e}")
+                return error_result(f"The {self.name} MCP server failed to run {tool_name}: {e}")
+            except _Busy as e:
+                self.breaker.release()
+                self.rejected += 1
+                return error_result(f"The {self.name} MCP server is busy: {e}")
+            except (asyncio.CancelledError, *passthrough):
+                # The server answered (or the caller went away): no verdict on its health
+                self.breaker.release()
+                raise
+            self.breaker.record_success()
+            return result
+
+    async def _call_once(
+        self, run: Callable[[], Awaitable[Any]], timeout: float, passthrough: tuple[type[Exception], ...]
+    ) -> Any:
+        # One deadline covers waiting for a slot and the call itself
+        acquired = False
+        try:
+            async with asyncio.timeout(timeout):
+                await self._slots.acquire()
+                acquired = True
+                self.in_flight += 1
+                result = await run()
+        except TimeoutError:
+            if not acquired:
+                raise _Busy(
+                    f"no free slot within {timeout:g}s ({self.max_concurrency} calls in flight)"
+                )
+            self.timeouts += 1
+            raise _CallFailed(f"no response within {timeout:g}s")
+        except (asyncio.CancelledError, *passthrough):
+            raise
+        except Exception as e:
+            raise _CallFailed(_describe(e)) from e
+        finally:
+            if acquired:
+                self.in_flight -= 1
+                self._slots.release()
+        # ADK's graceful MCP error handling turns transport errors into {"error": ...}
+        if isinstance(result, dict) and "error" in result and len(result) == 1:
+            raise _CallFailed(str(result["error"]))
+        return result
+
+    def stats(self) -> dict:
+        return {
+            "circuit": self.breaker.stats(),
+            "in_flight": self.in_flight,
+            "max_concurrency": self.max_concurrency,
+            "calls": self.calls,
+            "failures": self.failures,
+            "timeouts": self.timeouts,
+            "retried": self.retried,
+            "rejected": self.rejected,
+            "short_circuited": self.short_circuited,
+        }
+
+
+# MCP server URL -> its guard, shared by the server's toolset and direct MCPClient calls
+_guards: dict[str, ServerGuard] = {}
+
+
+def server_guard(url: str, name: Optional[str] = None) -> ServerGuard:
+    """
+    The guard of the MCP server at url, created with the MCP_* settings on first use.
+
+    A guard first used by a direct call is named host:port until the server's toolset is
+    built and names it.
+    """
+    guard = _guards.get(url)
+    if guard is None:
+        guard = _guards[url] = ServerGuard.from_config(name or urlparse(url).netloc)
+    elif name:
+        guard.name = name
+    return guard
+
+
+_toolsets: list["ResilientToolset"] = []
+
+
+class ResilientToolset(WrappedToolset):
+    """Runs a toolset's calls through its server's guard and caches the server's tools."""
+
+    def __init__(
+        self,
+        inner: BaseToolset,
+        *,
+        name: str,
+        guard: ServerGuard,
+        retry_tools: Iterable[str] = (),
+        tools_ttl: float = 300.0,
+    ):
+        super().__init__(inner, name=name)
+        self.guard = guard
+        self.retry_tools = tuple(retry_tools)
+        # Cached tools/list result; also served when the server fails or the breaker is open
+        self.tools_ttl = tools_ttl
+        self.tools_version = 0
+        self.discovered = False
+        self.discovery_error: Optional[str] = None
+        self._tools: Optional[list[BaseTool]] = None
+        self._tools_fetched_at = 0.0
+        self._tools_digest = ""
+        # In-flight tools/list shared by concurrent callers (get_tools and the refresh)
+        self._discovery: Optional[asyncio.Task] = None
+        self._refresh_task: Optional[asyncio.Task] = None
+        _toolsets.append(self)
+
+    @classmethod
+    def from_config(cls, inner: BaseToolset, *, name: str) -> "ResilientToolset":
+        """Wrap an McpToolset with the MCP_* settings, sharing its server's guard."""
+        return cls(
+            inner,
+            name=name,
+            guard=server_guard(inner.connection_params.url, name),
+            retry_tools=config.MCP_RETRY_TOOLS,
+            tools_ttl=config.MCP_TOOLS_TTL_SECONDS,
+        )
+
+    @property
+    def breaker(self) -> CircuitBreaker:
+        return self.guard.breaker
+
+    async def get_tools(self, readonly_context: Optional[ReadonlyContext] = None) -> list[BaseTool]:
+        # The tool lists don't depend on the caller (no header_provider or tool_filter
+        # predicate), so one cached list serves every run
+        if self._tools is not None and time.monotonic() - self._tools_fetched_at < self.tools_ttl:
+            return self._tools
+        return await self.discover()
+
+    async def discover(self) -> list[BaseTool]:
+        """Fetch the tool list (tools/list), falling back to the cached one if the server fails."""
+        # Callers arriving while a fetch is in flight share its result instead of queueing
+        # up a fetch each; the fetch runs in its own task, so a cancelled caller doesn't
+        # cancel it for the others
+        if self._discovery is None:
+            self._discovery = asyncio.create_task(self._discover())
+            self._discovery.add_done_callback(self._discovery_done)
+        return await asyncio.shield(self._discovery)
+
+    def _discovery_done(self, task: asyncio.Task) -> None:
+        self._discovery = None
+        if not task.cancelled():
+            task.exception()  # retrieved, even if every caller went away
+
+    async def _discover(self) -> list[BaseTool]:
+        if not self.breaker.allow():
+            if self._tools is not None:
+                return self._tools
+            # ADK runs the agent without this toolset's tools
+            raise ConnectionError(f"{self.name} MCP server is unavailable (circuit breaker open)")
+        try:
+            tools = await asyncio.wait_for(super().get_tools(None), self.guard.timeout)
+        except asyncio.CancelledError:
+            self.breaker.release()
+            raise
+        except Exception as e:
+            self.breaker.record_failure()
+            self.discovery_error = _describe(e)
+            self.discovered = True
+            if self._tools is not None:
+                logger.warning(f"{self.name}: tools/list failed ({self.discovery_error}), using the cached tool list")
+                return self._tools
+            raise
+        # Listing tools says little about whether calls succeed: it only closes a
+        # half-open breaker, it doesn't reset the count of failed calls
+        if self.breaker.state == HALF_OPEN:
+            self.breaker.record_success()
+        digest = _schema_digest(tools)
+        if digest != self._tools_digest:
+            self.tools_version += 1
+            self._tools_digest = digest
+            logger.info(f"{self.name}: {len(tools)} tools (schema version {self.tools_version})")
+        self._tools = tools
+        self._tools_fetched_at = time.monotonic()
+        self.discovery_error = None
+        self.discovered = True
+        return tools
+
+    def discovery_status(self) -> str:
+        """pending (not tried yet), ok, stale (failing, cached tools served) or unavailable."""
+        if not self.discovered:
+            return "pending"
+        if self.discovery_error is None:
+            return "ok"
+        return "stale" if self._tools is not None else "unavailable"
+
+    async def _refresh_loop(self) -> None:
+        while True:
+            try:
+                await self.discover()
+                delay = self.tools_ttl / 2
+            except Exception as e:
+                logger.warning(f"{self.name}: tool discovery failed: {_describe(e)}")
+                delay = min(self.tools_ttl / 2, self.breaker.reset_seconds)
+            await asyncio.sleep(delay)
+
+    async def start(self) -> None:
+        """Discover the tools (opening the MCP session) and keep them fresh in the background."""
+        if self._refresh_task is None:
+            self._refresh_task = asyncio.create_task(self._refresh_loop())
+
+    async def stop(self) -> None:
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            try:
+                await self._refresh_task
+            except asyncio.CancelledError:
+                pass
+            self._refresh_task = None
+
+    async def close(self) -> None:
+        # The runner closes every toolset after each run; the MCP session stays open
+        # (ADK's session pool evicts it when idle) until shutdown calls aclose()
+        pass
+
+    async def aclose(self) -> None:
+        await self.stop()
+        if self._discovery is not None:
+            self._discovery.cancel()
+        await self.inner.close()
+
+    async def call_tool(self, tool: BaseTool, args: dict[str, Any], tool_context: ToolContext) -> Any:
+        return await self.guard.call(
+            tool.name,
+            lambda: tool.run_async(args=args, tool_context=tool_context),
+            read_only=is_read_only(tool, self.retry_tools),
+        )
+
+    def tools_stats(self) -> dict:
+        return {
+            "count": len(self._tools) if self._tools is not None else None,
+            "version": self.tools_version,
+            "age_seconds": round(time.monotonic() - self._tools_fetched_at, 1) if self._tools is not None else None,
+            "error": self.discovery_error,
+        }
+
+
+def _describe(error: BaseException) -> str:
+    return f"{type(error).__name__}: {error}" if str(error) else type(error).__name__
+
+
+def _schema_digest(tools: list[BaseTool]) -> str:
+    """Hash of the tool names, descriptions and input schemas, to version the cached list."""
+    schemas = []
+    for tool in tools:
+        mcp_tool = getattr(getattr(tool, "inner", tool), "raw_mcp_tool", None)
+        schemas.append((tool.name, tool.description, getattr(mcp_tool, "inputSchema", None)))
+    return hashlib.sha256(json.dumps(schemas, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def get_resilience_stats() -> dict:
+    """Breaker state, call counts and cached tools per MCP server for GET /health."""
+    stats = {guard.name: guard.stats() for guard in _guards.values()}
+    for toolset in _toolsets:
+        stats.setdefault(toolset.guard.name, {})["tools"] = toolset.tools_stats()
+    return stats
+
+
+async def start_mcp_toolsets() -> None:
+    """Discover every MCP server's tools concurrently and keep refreshing them."""
+    for toolset in _toolsets:
+        await toolset.start()
+
+
+async def stop_mcp_toolsets() -> None:
+    """Stop the refreshes and close the MCP sessions."""
+    await asyncio.gather(*(toolset.aclose() for toolset in _toolsets), return_exceptions=True)
+
+
+def get_discovery_status() -> dict:
+    """Whether every started MCP server has been tried once; servers that failed are listed as degraded."""
+    # Toolsets built after start_mcp_toolsets() (agents built on first use) discover on
+    # demand and aren't waited for
+    servers = {
+        toolset.name: toolset.discovery_status() for toolset in _toolsets if toolset._refresh_task is not None
+    }
+    return {
+        "ready": all(status != "pending" for status in servers.values()),
+        "degraded": [name for name, status in servers.items() if status in ("stale", "unavailable")],
+        "servers": servers,
+    }
+
+
+registry.gauge(
+    "adk_mcp_circuit_state",
+    "MCP server circuit breaker state (0 closed, 1 half-open, 2 open)",
+    ("server",),
+    lambda: {(g.name,): _STATE_VALUES[g.breaker.state] for g in _guards.values()},
+)
+registry.gauge(
+    "adk_mcp_calls_in_flight",
+    "MCP tool calls in flight per server",
+    ("server",),
+    lambda: {(g.name,): g.in_flight for g in _guards.values()},
+)
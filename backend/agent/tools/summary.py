@@ -0,0 +1,100 @@
+"""
+Per-series summary statistics for range query results.
+
+Instead of making the LLM read raw point arrays to "interpret what the data shows",
+graph tools attach a compact summary computed with NumPy over all series at once:
+min, max, mean, p50/p95/p99, last value, linear trend slope and the largest spikes.
+The LLM only sees the summary (see agent/callbacks.py); the full series stay in the
+tool result for the frontend chart.
+"""
+
+import numpy as np
+
+_SPIKES_PER_SERIES = 3
+
+
+def _round(value: float, digits: int = 4):
+    if not np.isfinite(value):
+        return None
+    return float(f"{value:.{digits}g}")
+
+
+def summarize_matrix(data: dict) -> list[dict]:
+    """
+    Summarize every series of Prometheus matrix data.
+
+    Returns:
+        list[dict]: One entry per series:
+        {
+            "labels": {...}, "points": 60,
+            "min": ..., "max": ..., "mean": ..., "p50": ..., "p95": ..., "p99": ...,
+            "last": ..., "last_timestamp": ...,
+            "trend_per_hour": ...,   # least-squares slope, value units per hour
+            "spikes": [{"timestamp": ..., "value": ...}, ...]  # largest values above the median
+        }
+    """
+    result = data.get("result", [])
+    if not result:
+        return []
+
+    # Align all series on a shared time axis so every statistic is one vectorized call
+    series_ts = [np.array([float(v[0]) for v in s.get("values", [])]) for s in result]
+    axis = np.unique(np.concatenate(series_ts))
+    if len(axis) == 0:
+        return [{"labels": s.get("metric", {}), "points": 0} for s in result]
+    y = np.full((len(result), len(axis)), np.nan)
+    for row, (series, ts) in enumerate(zip(result, series_ts)):
+        y[row, np.searchsorted(axis, ts)] = [float(v[1]) for v in series.get("values", [])]
+    y[~np.isfinite(y)] = np.nan
+
+    valid = ~np.isnan(y)
+    counts = valid.sum(axis=1)
+    empty = counts == 0
+    # nanmean warns ("Mean of empty slice") on all-NaN rows, so means are sums over counts
+    divisor = np.maximum(counts, 1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        filled = np.where(empty[:, None], 0.0, y)
+        minimum = np.nanmin(filled, axis=1)
+        maximum = np.nanmax(filled, axis=1)
+        mean = np.nansum(y, axis=1) / divisor
+        p50, p95, p99 = np.nanpercentile(filled, [50, 95, 99], axis=1)
+
+        # Least-squares slope per series over its valid points
+        x = np.where(valid, axis[None, :], np.nan)
+        x_mean = (np.nansum(x, axis=1) / divisor)[:, None]
+        y_mean = (np.nansum(y, axis=1) / divisor)[:, None]
+        cov = np.nansum((x - x_mean) * (y - y_mean), axis=1)
+        var = np.nansum((x - x_mean) ** 2, axis=1)
+        slope = np.where(var > 0, cov / var, 0.0) * 3600
+
+        # Largest positive deviations from the median
+        deviation = np.where(valid, y - p50[:, None], -np.inf)
+        k = min(_SPIKES_PER_SERIES, len(axis))
+        spike_idx = np.argsort(-deviation, axis=1)[:, :k]
+
+    last_idx = np.where(valid, np.arange(len(axis))[None, :], -1).max(axis=1)
+
+    summaries = []
+    for row, series in enumerate(result):
+        entry = {"labels": series.get("metric", {}), "points": int(counts[row])}
+        if empty[row]:
+            summaries.append(entry)
+            continue
+        entry.update({
+            "min": _round(minimum[row]),
+            "max": _round(maximum[row]),
+            "mean": _round(mean[row]),
+            "p50": _round(p50[row]),
+            "p95": _round(p95[row]),
+            "p99": _round(p99[row]),
+            "last": _round(y[row, last_idx[row]]),
+            "last_timestamp": float(axis[last_idx[row]]),
+            "trend_per_hour": _round(slope[row]),
+            "spikes": [
+                {"timestamp": float(axis[i]), "value": _round(y[row, i])}
+                for i in spike_idx[row]
+                if valid[row, i] and y[row, i] > p50[row]
+            ],
+        })
+        summaries.append(entry)
+    return summaries
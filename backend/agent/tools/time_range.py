@@ -0,0 +1,132 @@
+"""
+Time range helpers for PromQL range queries.
+
+obs-mcp accepts times as RFC3339, Unix timestamps or NOW-relative expressions
+("NOW", "NOW-1h") and steps as Prometheus durations ("30s", "5m", "1h30m").
+Custom tools resolve these to absolute epoch seconds so windows can be aligned,
+cached and compared.
+"""
+
+from datetime import datetime, timezone
+from typing import Optional
+import re
+import time
+
+_DURATION_UNITS = {
+    "ms": 0.001,
+    "s": 1,
+    "m": 60,
+    "h": 3600,
+    "d": 86400,
+    "w": 604800,
+    "y": 31536000,
+}
+_DURATION_RE = re.compile(r"(\d+(?:\.\d+)?)(ms|s|m|h|d|w|y)")
+_RELATIVE_RE = re.compile(r"^NOW\s*(?:([+-])\s*(.+))?$", re.IGNORECASE)
+
+# Steps a human would pick; auto-selected steps are rounded up to one of these
+_NICE_STEPS = (
+    15, 30, 60, 120, 300, 600, 900, 1800,
+    3600, 7200, 10800, 21600, 43200, 86400,
+)
+
+# Prometheus rejects range queries returning more than 11,000 points per series
+MAX_POINTS_PER_SERIES = 11000
+
+
+def parse_duration(value: str) -> float:
+    """
+    Parse a Prometheus duration ("5m", "1h30m") or plain seconds ("300") to seconds.
+
+    Raises:
+        ValueError: If the value is not a valid duration
+    """
+    value = value.strip()
+    try:
+        return float(value)
+    except ValueError:
+        pass
+
+    pos = 0
+    total = 0.0
+    for match in _DURATION_RE.finditer(value):
+        if match.start() != pos:
+            break
+        total += float(match.group(1)) * _DURATION_UNITS[match.group(2)]
+        pos = match.end()
+    if pos != len(value) or pos == 0:
+        raise ValueError(f"Invalid duration: {value!r}")
+    return total
+
+
+def format_duration(seconds: float) -> str:
+    """Format seconds as the largest whole Prometheus duration unit ("300" -> "5m")."""
+    seconds = int(round(seconds))
+    for unit in ("w", "d", "h", "m"):
+        size = _DURATION_UNITS[unit]
+        if seconds >= size and seconds % size == 0:
+            return f"{seconds // size}{unit}"
+    return f"{max(seconds, 1)}s"
+
+
+def parse_time(value: Optional[str], now: Optional[float] = None) -> float:
+    """
+    Resolve a time expression to epoch seconds.
+
+    Accepts "NOW", "NOW-1h", "NOW+5m", Unix timestamps and RFC3339/ISO8601 strings.
+
+    Raises:
+        ValueError: If the value cannot be parsed
+    """
+    now = time.time() if now is None else now
+    if value is None or not value.strip():
+        return now
+    value = value.strip()
+
+    relative = _RELATIVE_RE.match(value)
+    if relative:
+        sign, offset = relative.groups()
+        if not offset:
+            return now
+        delta = parse_duration(offset)
+        return now - delta if sign == "-" else now + delta
+
+    try:
+        return float(value)
+    except ValueError:
+        pass
+
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def format_time(timestamp: float) -> str:
+    """Format epoch seconds as RFC3339 (UTC)."""
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def align(timestamp: float, step: float) -> float:
+    """Align a timestamp down to a multiple of step."""
+    return (timestamp // step) * step
+
+
+def auto_step(start: float, end: float, target_points: int, min_step: float = 15) -> float:
+    """
+    Pick a step giving roughly target_points samples over [start, end].
+
+    The raw step is rounded up to a "nice" value (15s, 1m, 5m, 1h, ...) so that
+    repeated queries over similar ranges land on the same step and stay cacheable.
+    """
+    raw = max((end - start) / max(target_points, 1), min_step)
+    for nice in _NICE_STEPS:
+        if nice >= raw:
+            return float(nice)
+    return float(-(-raw // 86400) * 86400)
+
+
+def clamp_step(start: float, end: float, step: float) -> float:
+    """Raise step if it would exceed Prometheus' per-series point limit."""
+    minimum = (end - start) / MAX_POINTS_PER_SERIES
+    return step if step >= minimum else auto_step(start, end, MAX_POINTS_PER_SERIES, minimum)
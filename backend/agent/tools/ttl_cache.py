@@ -0,0 +1,120 @@
+"""
+LRU cache with per-entry TTL and single-flight loading.
+
+Concurrent get_or_load() calls for the same key share one in-flight load: the first
+caller starts the loader, everyone else awaits its result. The load runs in its own
+task, so a caller that is cancelled (e.g. its client disconnected) doesn't cancel it for
+the others. Successful results are kept for the given TTL (0 disables reuse, leaving
+only request coalescing). Hits, misses and coalesced calls are counted in total and per
+optional group (e.g. tool name).
+"""
+
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable, Optional
+import asyncio
+import time
+
+
+class TTLCache:
+    """Bounded LRU cache with TTL expiry, request coalescing and hit statistics."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        # key -> (expires_at, value, load_seconds)
+        self._entries: OrderedDict[Hashable, tuple[float, Any, float]] = OrderedDict()
+        # key -> (load task shared by coalesced callers, load start time)
+        self._inflight: dict[Hashable, tuple[asyncio.Task, float]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.saved_seconds = 0.0
+        # group -> {"hits", "misses", "coalesced", "saved_seconds"}
+        self.groups: dict[Hashable, dict[str, float]] = {}
+
+    def _count(self, group: Optional[Hashable], outcome: str, saved_seconds: float = 0.0) -> None:
+        setattr(self, outcome, getattr(self, outcome) + 1)
+        self.saved_seconds += saved_seconds
+        if group is not None:
+            counters = self.groups.setdefault(
+                group, {"hits": 0, "misses": 0, "coalesced": 0, "saved_seconds": 0.0}
+            )
+            counters[outcome] += 1
+            counters["saved_seconds"] += saved_seconds
+
+    async def get_or_load(
+        self,
+        key: Hashable,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: float,
+        cacheable: Optional[Callable[[Any], bool]] = None,
+        group: Optional[Hashable] = None,
+    ) -> Any:
+        """
+        Return the cached value for key, or load it (once, for all concurrent callers).
+
+        Args:
+            key: Cache key
+            loader: Coroutine factory producing the value
+            ttl: Seconds to keep the value; 0 only coalesces concurrent calls
+            cacheable: Optional predicate - values it rejects (e.g. errors) are not stored
+            group: Optional group the lookup is counted under in groups
+
+        Raises:
+            Whatever the loader raises; errors are shared with coalesced callers
+            but never cached.
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, value, load_seconds = entry
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                self._count(group, "hits", load_seconds)
+                return value
+            del self._entries[key]
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            task, leader_started = inflight
+            # Joining late saves the part of the upstream call the leader already spent
+            self._count(group, "coalesced", time.monotonic() - leader_started)
+            return await asyncio.shield(task)
+
+        self._count(group, "misses")
+        started = time.monotonic()
+        task = asyncio.ensure_future(self._load(key, loader, ttl, cacheable, started))
+        # Mark an error retrieved so it isn't logged as unhandled when every caller was cancelled
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        self._inflight[key] = (task, started)
+        return await asyncio.shield(task)
+
+    async def _load(
+        self,
+        key: Hashable,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: float,
+        cacheable: Optional[Callable[[Any], bool]],
+        started: float,
+    ) -> Any:
+        try:
+            value = await loader()
+        finally:
+            self._inflight.pop(key, None)
+
+        load_seconds = time.monotonic() - started
+        if ttl > 0 and (cacheable is None or cacheable(value)):
+            self._entries[key] = (time.monotonic() + ttl, value, load_seconds)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "hit_ratio": round((self.hits + self.coalesced) / lookups, 3) if lookups else 0.0,
+            "saved_seconds": round(self.saved_seconds, 3),
+        }
@@ -0,0 +1,71 @@
+"""
+Toolset wrapper base class.
+
+ADK toolsets (McpToolset) create their tools dynamically from the MCP server's
+tools/list. WrappedToolset sits in front of another toolset and wraps every tool it
+returns, so cross-cutting behavior (caching, ...) can intercept tool calls without
+touching ADK's MCP session handling:
+
+    class MyToolset(WrappedToolset):
+        async def call_tool(self, tool, args, tool_context):
+            ...  # before
+            result = await tool.run_async(args=args, tool_context=tool_context)
+            ...  # after
+            return result
+
+    metrics_toolset = MyToolset(McpToolset(...), name="metrics")
+
+Wrappers can be stacked; the LLM sees the same tool names and schemas as before.
+"""
+
+from typing import Any, Optional
+from google.adk.agents.readonly_context import ReadonlyContext
+from google.adk.tools.base_tool import BaseTool
+from google.adk.tools.base_toolset import BaseToolset
+from google.adk.tools.tool_context import ToolContext
+
+
+class _WrappedTool(BaseTool):
+    """Delegates declaration and confirmation to the inner tool, calls via the toolset."""
+
+    def __init__(self, inner: BaseTool, toolset: "WrappedToolset"):
+        super().__init__(
+            name=inner.name,
+            description=inner.description,
+            is_long_running=inner.is_long_running,
+            custom_metadata=inner.custom_metadata,
+        )
+        self.inner = inner
+        self._toolset = toolset
+
+    def _get_declaration(self):
+        return self.inner._get_declaration()
+
+    async def check_require_confirmation(self, args: dict[str, Any], tool_context: ToolContext):
+        return await self.inner.check_require_confirmation(args, tool_context)
+
+    async def run_async(self, *, args: dict[str, Any], tool_context: ToolContext) -> Any:
+        return await self._toolset.call_tool(self.inner, args, tool_context)
+
+
+class WrappedToolset(BaseToolset):
+    """Toolset that wraps every tool of an inner toolset."""
+
+    def __init__(self, inner: BaseToolset, *, name: str):
+        super().__init__()
+        self.inner = inner
+        self.name = name
+
+    async def get_tools(self, readonly_context: Optional[ReadonlyContext] = None) -> list[BaseTool]:
+        tools = await self.inner.get_tools_with_prefix(readonly_context)
+        return [_WrappedTool(tool, self) for tool in tools]
+
+    async def call_tool(self, tool: BaseTool, args: dict[str, Any], tool_context: ToolContext) -> Any:
+        """Run one tool call; override to add behavior around it."""
+        return await tool.run_async(args=args, tool_context=tool_context)
+
+    async def process_llm_request(self, *, tool_context: ToolContext, llm_request) -> None:
+        await self.inner.process_llm_request(tool_context=tool_context, llm_request=llm_request)
+
+    async def close(self) -> None:
+        await self.inner.close()
@@ -0,0 +1,10 @@
+"""
+Offline benchmarks for the backend.
+
+Run from backend/ as modules:
+
+    python -m benchmarks.run             # mocks + backend + SSE load, no network needed
+    python -m benchmarks.mocks           # mock MCP servers (:8001-8003) and mock LLM only
+    python -m benchmarks.load            # SSE load against a running backend
+    python -m benchmarks.logging_stall   # event-loop stall of sync vs queued logging
+"""
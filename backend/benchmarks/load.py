@@ -0,0 +1,207 @@
+"""
+SSE load driver for the AG-UI endpoint.
+
+Runs conversations against POST /api/chat with a given concurrency. Each conversation
+is one AG-UI thread; its turns are sent one after another, each turn streaming until
+RUN_FINISHED. Per turn it records:
+
+    - time to first event (first SSE event, e.g. RUN_STARTED)
+    - time to first text (first TEXT_MESSAGE_CONTENT)
+    - end-to-end latency (RUN_FINISHED)
+
+Conversation shapes:
+    single   one question per conversation
+    multi    --turns questions per conversation (history grows with every turn)
+
+Questions are drawn round-robin from --mix (kubernetes, metrics, incidents, alerts,
+router). "router" has no specialist keyword, so it exercises the router LLM.
+
+Usage (from backend/, against a running backend):
+    python -m benchmarks.load --url http://localhost:8000/api/chat --conversations 50 \\
+        --concurrency 10 --shape multi --turns 3
+"""
+
+from dataclasses import dataclass, field
+from typing import Optional
+import argparse
+import asyncio
+import itertools
+import json
+import time
+import uuid
+import httpx
+
+QUESTIONS = {
+    "kubernetes": "List the pods in namespace demo",
+    "metrics": "Show the CPU usage of the pods in namespace demo",
+    "incidents": "Are there any incidents in the cluster?",
+    "alerts": "Which alerts are firing?",
+    "router": "Something seems off with the demo app today, can you take a look?",
+}
+
+
+@dataclass
+class TurnResult:
+    first_event: Optional[float] = None
+    first_text: Optional[float] = None
+    total: Optional[float] = None
+    events: int = 0
+    error: Optional[str] = None
+
+
+@dataclass
+class LoadResult:
+    turns: list[TurnResult] = field(default_factory=list)
+    wall_seconds: float = 0.0
+    conversations: int = 0
+
+
+def percentile(values: list[float], q: float) -> Optional[float]:
+    """Nearest-rank percentile."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, int(round(q / 100 * len(ordered) + 0.5)) - 1))]
+
+
+def _run_input(thread_id: str, messages: list[dict]) -> dict:
+    return {
+        "threadId": thread_id,
+        "runId": str(uuid.uuid4()),
+        "state": {},
+        "messages": messages,
+        "tools": [],
+        "context": [],
+        "forwardedProps": {},
+    }
+
+
+async def run_turn(client: httpx.AsyncClient, url: str, thread_id: str, messages: list[dict]) -> TurnResult:
+    result = TurnResult()
+    started = time.perf_counter()
+    try:
+        async with client.stream(
+            "POST", url, json=_run_input(thread_id, messages), headers={"Accept": "text/event-stream"}
+        ) as response:
+            if response.status_code != 200:
+                result.error = f"HTTP {response.status_code}"
+                return result
+            async for line in response.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                elapsed = time.perf_counter() - started
+                result.events += 1
+                if result.first_event is None:
+                    result.first_event = elapsed
+                event_type = json.loads(line[5:]).get("type")
+                if event_type == "TEXT_MESSAGE_CONTENT" and result.first_text is None:
+                    result.first_text = elapsed
+                elif event_type == "RUN_ERROR":
+                    result.error = line[5:].strip()[:200]
+                elif event_type == "RUN_FINISHED":
+                    result.total = elapsed
+    except httpx.HTTPError as e:
+        result.error = f"{type(e).__name__}: {e}"
+    if result.total is None and result.error is None:
+        result.error = "stream ended without RUN_FINISHED"
+    return result
+
+
+async def run_conversation(
+    client: httpx.AsyncClient, url: str, questions: list[str], result: LoadResult
+) -> None:
+    thread_id = str(uuid.uuid4())
+    messages: list[dict] = []
+    for question in questions:
+        messages.append({"id": str(uuid.uuid4()), "role": "user", "content": question})
+        result.turns.append(await run_turn(client, url, thread_id, list(messages)))
+
+
+async def run_load(
+    url: str,
+    conversations: int,
+    concurrency: int,
+    shape: str = "single",
+    turns: int = 3,
+    mix: Optional[list[str]] = None,
+) -> LoadResult:
+    """Drive the endpoint and collect per-turn timings."""
+    pool = itertools.cycle([QUESTIONS[name] for name in (mix or list(QUESTIONS))])
+    turns_per_conversation = 1 if shape == "single" else turns
+    plans = [[next(pool) for _ in range(turns_per_conversation)] for _ in range(conversations)]
+    result = LoadResult(conversations=conversations)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def bounded(questions: list[str]) -> None:
+        async with semaphore:
+            await run_conversation(client, url, questions, result)
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(timeout=httpx.Timeout(300.0), limits=limits) as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(bounded(plan) for plan in plans))
+        result.wall_seconds = time.perf_counter() - started
+    return result
+
+
+def summarize(result: LoadResult) -> dict:
+    ok = [t for t in result.turns if t.error is None]
+    summary = {
+        "conversations": result.conversations,
+        "turns": len(result.turns),
+        "errors": len(result.turns) - len(ok),
+        "wall_seconds": round(result.wall_seconds, 3),
+        "throughput_turns_per_second": round(len(ok) / result.wall_seconds, 3) if result.wall_seconds else 0.0,
+    }
+    for name, values in (
+        ("time_to_first_event", [t.first_event for t in ok if t.first_event is not None]),
+        ("time_to_first_text", [t.first_text for t in ok if t.first_text is not None]),
+        ("end_to_end", [t.total for t in ok if t.total is not None]),
+    ):
+        summary[name] = {
+            f"p{q}_ms": round(value * 1000, 1) if (value := percentile(values, q)) is not None else None
+            for q in (50, 95, 99)
+        }
+    errors = [t.error for t in result.turns if t.error]
+    if errors:
+        summary["first_errors"] = errors[:5]
+    return summary
+
+
+def print_summary(summary: dict) -> None:
+    print(
+        f"{summary['turns']} turns in {summary['conversations']} conversations, "
+        f"{summary['errors']} errors, {summary['wall_seconds']:.1f}s, "
+        f"{summary['throughput_turns_per_second']:.2f} turns/s"
+    )
+    print(f"{'':22}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for name in ("time_to_first_event", "time_to_first_text", "end_to_end"):
+        row = summary[name]
+        print(f"{name:22}" + "".join(f"{str(row[f'p{q}_ms']):>10}" for q in (50, 95, 99)))
+    for error in summary.get("first_errors", []):
+        print(f"error: {error}")
+
+
+def add_load_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--conversations", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=5)
+    parser.add_argument("--shape", choices=["single", "multi"], default="single")
+    parser.add_argument("--turns", type=int, default=3, help="Turns per conversation (multi)")
+    parser.add_argument(
+        "--mix", default=",".join(QUESTIONS), help=f"Comma-separated question kinds from {list(QUESTIONS)}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:8000/api/chat")
+    add_load_arguments(parser)
+    args = parser.parse_args()
+    result = asyncio.run(run_load(
+        args.url, args.conversations, args.concurrency, args.shape, args.turns, args.mix.split(",")
+    ))
+    print_summary(summarize(result))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+"""
+Event-loop stall caused by logging: synchronous handlers vs the queue pipeline.
+
+A monitor task wakes up every millisecond and records how late it was woken (loop lag)
+while a workload task logs DEBUG records the size of ADK prompt and tool payload dumps.
+The same workload runs twice:
+
+    sync   FileHandler + StreamHandler on the loop thread (the previous main.py setup)
+    queue  TruncatingQueueHandler -> QueueListener thread -> the same handlers
+           (logging_setup.py)
+
+Both write to files in a temporary directory (the "stream" file stands in for a
+redirected stdout). --slow-io-ms adds a sleep per write to emulate a slow disk or a
+blocked terminal.
+
+Usage (from backend/):
+    python -m benchmarks.logging_stall [--records 2000] [--payload-bytes 50000]
+                                       [--slow-io-ms 0] [--max-message-chars 4000]
+"""
+
+from logging.handlers import QueueListener
+import argparse
+import asyncio
+import json
+import logging
+import queue
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from logging_setup import LOG_FORMAT, TruncatingQueueHandler
+
+TICK_SECONDS = 0.001
+
+
+class SlowFile:
+    """File wrapper adding a fixed delay per write."""
+
+    def __init__(self, path: Path, delay_seconds: float):
+        self.file = open(path, "a", encoding="utf-8")
+        self.delay_seconds = delay_seconds
+
+    def write(self, text: str) -> int:
+        if self.delay_seconds:
+            time.sleep(self.delay_seconds)
+        return self.file.write(text)
+
+    def flush(self) -> None:
+        self.file.flush()
+
+    def close(self) -> None:
+        self.file.close()
+
+
+def _payload(size: int) -> str:
+    """A prompt-like JSON dump of roughly size bytes."""
+    row = {"role": "user", "parts": [{"text": "kubectl get pods -n openshift-monitoring " * 4}]}
+    rows = [row] * max(1, size // len(json.dumps(row)))
+    return json.dumps({"contents": rows})
+
+
+def _handlers(directory: Path, mode: str, slow_io_seconds: float) -> list[logging.Handler]:
+    formatter = logging.Formatter(LOG_FORMAT)
+    handlers = [
+        logging.StreamHandler(SlowFile(directory / f"{mode}.file.log", slow_io_seconds)),
+        logging.StreamHandler(SlowFile(directory / f"{mode}.stream.log", slow_io_seconds)),
+    ]
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    return handlers
+
+
+async def _monitor(lags: list[float], stop: asyncio.Event) -> None:
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        expected = loop.time() + TICK_SECONDS
+        await asyncio.sleep(TICK_SECONDS)
+        lags.append(max(0.0, loop.time() - expected))
+
+
+async def _workload(logger: logging.Logger, records: int, payload: str) -> float:
+    """Log records as a busy server would (yielding to the loop in between); returns seconds."""
+    started = time.perf_counter()
+    for i in range(records):
+        logger.debug(f"LLM Request {i}: {payload}")
+        if i % 10 == 9:
+            await asyncio.sleep(0)
+    return time.perf_counter() - started
+
+
+async def _run(logger: logging.Logger, records: int, payload: str) -> dict:
+    lags: list[float] = []
+    stop = asyncio.Event()
+    monitor = asyncio.create_task(_monitor(lags, stop))
+    await asyncio.sleep(0.05)  # baseline ticks
+    logging_seconds = await _workload(logger, records, payload)
+    stop.set()
+    await monitor
+    lags.sort()
+    return {
+        "logging_seconds": logging_seconds,
+        "max_lag_ms": lags[-1] * 1000,
+        "p99_lag_ms": lags[int(len(lags) * 0.99) - 1] * 1000,
+        "median_lag_ms": statistics.median(lags) * 1000,
+        "stalled_ms": sum(lag for lag in lags if lag > TICK_SECONDS) * 1000,
+    }
+
+
+def run_mode(mode: str, args: argparse.Namespace, directory: Path) -> dict:
+    logger = logging.getLogger(f"benchmarks.logging_stall.{mode}")
+    logger.setLevel(logging.DEBUG)
+    logger.propagate = False
+    handlers = _handlers(directory, mode, args.slow_io_ms / 1000)
+    listener = None
+    queue_handler = None
+    if mode == "sync":
+        for handler in handlers:
+            logger.addHandler(handler)
+    else:
+        log_queue: queue.Queue = queue.Queue(maxsize=args.queue_size)
+        queue_handler = TruncatingQueueHandler(log_queue, args.max_message_chars)
+        listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+        listener.start()
+        logger.addHandler(queue_handler)
+
+    try:
+        result = asyncio.run(_run(logger, args.records, _payload(args.payload_bytes)))
+    finally:
+        drain_started = time.perf_counter()
+        if listener:
+            listener.stop()
+        result_drain = time.perf_counter() - drain_started
+        for handler in logger.handlers[:] + handlers:
+            logger.removeHandler(handler)
+            handler.close()
+    result["drain_seconds"] = result_drain
+    if queue_handler:
+        result.update(queue_handler.stats())
+    result["written_bytes"] = sum(p.stat().st_size for p in directory.glob(f"{mode}.*.log"))
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, default=2000)
+    parser.add_argument("--payload-bytes", type=int, default=50_000)
+    parser.add_argument("--slow-io-ms", type=float, default=0.0)
+    parser.add_argument("--max-message-chars", type=int, default=4000)
+    parser.add_argument("--queue-size", type=int, default=10000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        results = {mode: run_mode(mode, args, Path(tmp)) for mode in ("sync", "queue")}
+
+    print(
+        f"{args.records} DEBUG records of ~{args.payload_bytes} bytes, "
+        f"slow I/O {args.slow_io_ms}ms/write, truncation at {args.max_message_chars} chars\n"
+    )
+    rows = [
+        ("time in logging calls (s)", "logging_seconds", "{:.3f}"),
+        ("max loop lag (ms)", "max_lag_ms", "{:.1f}"),
+        ("p99 loop lag (ms)", "p99_lag_ms", "{:.2f}"),
+        ("median loop lag (ms)", "median_lag_ms", "{:.3f}"),
+        ("total stall > 1ms (ms)", "stalled_ms", "{:.1f}"),
+        ("writer drain after run (s)", "drain_seconds", "{:.3f}"),
+        ("bytes written", "written_bytes", "{:,}"),
+    ]
+    print(f"{'':30}{'sync':>14}{'queue':>14}")
+    for label, key, fmt in rows:
+        print(f"{label:30}" + "".join(f"{fmt.format(results[m][key]):>14}" for m in ("sync", "queue")))
+    queued = results["queue"]
+    print(f"\nqueue pipeline: {queued['truncated']} truncated, {queued['dropped']} dropped")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+"""
+OpenAI-compatible mock LLM for offline benchmarks.
+
+Serves POST /v1/chat/completions (streaming and non-streaming), so LiteLLM talks to it
+when OPENAI_API_BASE points here. Responses follow a tool-call script keyed by the
+agent that is calling (ADK puts 'Your internal name is "<agent>"' in the system prompt):
+
+    {
+      "openshift_router": {"transfers": {"<regex>": "<agent>", ...}},
+      "kubernetes_expert": {"rounds": [[{"name": "pods_list_in_namespace",
+                                         "arguments": {"namespace": "demo"}}]]},
+      ...
+    }
+
+    - transfers: the first regex matching the user's question becomes a
+      transfer_to_agent call
+    - rounds: tool calls issued one round per LLM call until all rounds are done;
+      calls to tools the agent doesn't offer are skipped
+    - then a text answer of reply_tokens tokens
+
+Latency is modeled as time to first token (ttft_ms) plus tokens_per_second for every
+streamed token, so agent-side overhead can be separated from model time.
+"""
+
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Optional
+import asyncio
+import itertools
+import json
+import re
+import time
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+DEFAULT_SCRIPT: dict = {
+    "openshift_router": {
+        "transfers": {
+            r"\balerts?\b": "alerts_expert",
+            r"\bincidents?\b|\bhealth\b": "incident_detection_expert",
+            r"\bcpu\b|\bmemory\b|\bmetrics?\b|\bprometheus\b": "metrics_expert",
+            r"\bpods?\b|\bdeployments?\b|\bnamespaces?\b|\blogs?\b|\bevents?\b": "kubernetes_expert",
+        },
+    },
+    "kubernetes_expert": {
+        "rounds": [[{"name": "pods_list_in_namespace", "arguments": {"namespace": "demo"}}]],
+    },
+    "metrics_expert": {
+        "rounds": [[{
+            "name": "execute_instant_query",
+            "arguments": {"query": "sum(rate(container_cpu_usage_seconds_total[5m])) by (pod)"},
+        }]],
+    },
+    "incident_detection_expert": {
+        "rounds": [[{"name": "get_incidents", "arguments": {}}]],
+    },
+    "alerts_prometheus": {
+        "rounds": [[{"name": "execute_instant_query", "arguments": {"query": 'ALERTS{alertstate="firing"}'}}]],
+    },
+    "alerts_incidents": {
+        "rounds": [[{"name": "get_incidents", "arguments": {}}]],
+    },
+}
+
+_AGENT_NAME = re.compile(r'Your internal name is "([^"]+)"')
+_CONTEXT_PREFIX = "For context:"
+_WORDS = (
+    "The demo namespace has twelve pods and one of them, demo-pod-3, is in CrashLoopBackOff "
+    "with fourteen restarts while the others are running normally on three worker nodes"
+).split()
+
+
+@dataclass
+class MockLLM:
+    """Scripted chat completion behavior."""
+
+    script: dict = field(default_factory=lambda: DEFAULT_SCRIPT)
+    ttft_ms: float = 300.0
+    tokens_per_second: float = 80.0
+    reply_tokens: int = 120
+    requests: int = 0
+    _ids = itertools.count(1)
+
+    def respond(self, body: dict) -> tuple[Optional[str], list[dict]]:
+        """(text, tool_calls) for one request."""
+        self.requests += 1
+        messages = body.get("messages", [])
+        agent = self._agent_name(messages)
+        question, rounds_done = self._turn(messages)
+        offered = {tool["function"]["name"] for tool in body.get("tools") or [] if "function" in tool}
+        entry = self.script.get(agent, {})
+
+        if rounds_done == 0:
+            for pattern, target in entry.get("transfers", {}).items():
+                if re.search(pattern, question, re.I) and "transfer_to_agent" in offered and target != agent:
+                    return None, [self._call("transfer_to_agent", {"agent_name": target})]
+
+        rounds = entry.get("rounds", [])
+        while rounds_done < len(rounds):
+            calls = [self._call(c["name"], c.get("arguments", {})) for c in rounds[rounds_done] if c["name"] in offered]
+            if calls:
+                return None, calls
+            rounds_done += 1
+
+        words = [_WORDS[i % len(_WORDS)] for i in range(self.reply_tokens)]
+        return " ".join(words) + ".", []
+
+    def _call(self, name: str, arguments: dict) -> dict:
+        return {
+            "id": f"call_{next(self._ids)}",
+            "type": "function",
+            "function": {"name": name, "arguments": json.dumps(arguments)},
+        }
+
+    @staticmethod
+    def _text(message: dict) -> str:
+        content = message.get("content") or ""
+        if isinstance(content, list):
+            return " ".join(part.get("text", "") for part in content if isinstance(part, dict))
+        return content
+
+    def _agent_name(self, messages: list[dict]) -> str:
+        for message in messages:
+            if message.get("role") == "system":
+                match = _AGENT_NAME.search(self._text(message))
+                if match:
+                    return match.group(1)
+        return ""
+
+    def _turn(self, messages: list[dict]) -> tuple[str, int]:
+        """The user's question and how many tool rounds this agent already ran for it."""
+        rounds = 0
+        for message in reversed(messages):
+            role = message.get("role")
+            if role == "assistant" and message.get("tool_calls"):
+                rounds += 1
+            elif role == "user":
+                text = self._text(message)
+                if not text.startswith(_CONTEXT_PREFIX):
+                    return text, rounds
+        return "", rounds
+
+
+def _usage(body: dict, completion_tokens: int) -> dict:
+    prompt_tokens = len(json.dumps(body.get("messages", []))) // 4
+    return {
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "total_tokens": prompt_tokens + completion_tokens,
+    }
+
+
+def create_app(llm: MockLLM) -> FastAPI:
+    app = FastAPI(title="Mock OpenAI LLM")
+
+    @app.get("/health")
+    async def health():
+        return {"status": "ok", "requests": llm.requests}
+
+    @app.post("/v1/chat/completions")
+    @app.post("/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        text, tool_calls = llm.respond(body)
+        model = body.get("model", "mock")
+        completion_id = f"chatcmpl-{llm.requests}"
+        token_delay = 1.0 / llm.tokens_per_second if llm.tokens_per_second > 0 else 0.0
+        tokens = text.split(" ") if text else []
+
+        if not body.get("stream"):
+            await asyncio.sleep(llm.ttft_ms / 1000 + token_delay * len(tokens))
+            message = {"role": "assistant", "content": text}
+            if tool_calls:
+                message["tool_calls"] = tool_calls
+            return JSONResponse({
+                "id": completion_id,
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [{
+                    "index": 0,
+                    "message": message,
+                    "finish_reason": "tool_calls" if tool_calls else "stop",
+                }],
+                "usage": _usage(body, len(tokens) or 10),
+            })
+
+        async def stream() -> AsyncIterator[str]:
+            def chunk(delta: dict, finish_reason: Optional[str] = None) -> str:
+                payload = {
+                    "id": completion_id,
+                    "object": "chat.completion.chunk",
+                    "created": int(time.time()),
+                    "model": model,
+                    "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+                }
+                return f"data: {json.dumps(payload)}\n\n"
+
+            await asyncio.sleep(llm.ttft_ms / 1000)
+            if tool_calls:
+                yield chunk({
+                    "role": "assistant",
+                    "tool_calls": [{"index": i, **call} for i, call in enumerate(tool_calls)],
+                })
+                yield chunk({}, "tool_calls")
+            else:
+                for i, token in enumerate(tokens):
+                    if i:
+                        await asyncio.sleep(token_delay)
+                    yield chunk({"role": "assistant", "content": token if i == 0 else f" {token}"})
+                yield chunk({}, "stop")
+            usage = {"id": completion_id, "object": "chat.completion.chunk", "model": model,
+                     "choices": [], "usage": _usage(body, len(tokens) or 10)}
+            yield f"data: {json.dumps(usage)}\n\n"
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(stream(), media_type="text/event-stream")
+
+    return app
@@ -0,0 +1,225 @@
+"""
+Stand-ins for the three MCP servers with canned tool responses.
+
+    kubernetes  :8001  pods_list, pods_list_in_namespace, pods_get, pods_log, events_list,
+                       namespaces_list
+    obs         :8002  list_metrics, get_label_names, get_label_values, get_series,
+                       execute_instant_query, execute_range_query
+    incidents   :8003  get_incidents
+
+Each server speaks streamable HTTP at /mcp (the transport the agents connect with) and
+answers after a configurable latency, so benchmarks exercise the real MCP client path
+without a cluster.
+"""
+
+import asyncio
+import json
+import math
+import time
+from datetime import datetime
+from mcp.server.fastmcp import FastMCP
+
+NAMESPACES = ["openshift-monitoring", "openshift-ingress", "openshift-etcd", "default", "demo"]
+METRICS = [
+    "up",
+    "ALERTS",
+    "container_cpu_usage_seconds_total",
+    "container_memory_working_set_bytes",
+    "container_network_receive_bytes_total",
+    "kube_pod_info",
+    "kube_pod_container_status_restarts_total",
+    "node_memory_MemAvailable_bytes",
+    "node_cpu_seconds_total",
+] + [f"synthetic_metric_{i}_total" for i in range(2000)]
+
+
+def _pods(namespace: str, count: int = 12) -> list[dict]:
+    return [
+        {
+            "name": f"{namespace}-pod-{i}",
+            "namespace": namespace,
+            "status": "CrashLoopBackOff" if i == 3 else "Running",
+            "restarts": 14 if i == 3 else 0,
+            "node": f"worker-{i % 3}",
+            "ip": f"10.128.{i // 250}.{i % 250 + 2}",
+            "age": f"{i + 1}d",
+        }
+        for i in range(count)
+    ]
+
+
+def _timestamp(value: str) -> float:
+    if value.upper().startswith("NOW"):
+        return time.time()
+    try:
+        return float(value)
+    except ValueError:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+
+
+def _duration(value: str) -> float:
+    units = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+    if value and value[-1] in units:
+        return float(value[:-1]) * units[value[-1]]
+    return float(value)
+
+
+def build_kubernetes_server(latency: float, port: int = 8001) -> FastMCP:
+    server = FastMCP("kubernetes-mock", port=port, stateless_http=True, log_level="WARNING")
+
+    @server.tool()
+    async def namespaces_list() -> str:
+        """List all namespaces in the cluster."""
+        await asyncio.sleep(latency)
+        return json.dumps([{"name": ns, "status": "Active"} for ns in NAMESPACES])
+
+    @server.tool()
+    async def pods_list() -> str:
+        """List all pods in all namespaces."""
+        await asyncio.sleep(latency)
+        return json.dumps([pod for ns in NAMESPACES for pod in _pods(ns, 6)])
+
+    @server.tool()
+    async def pods_list_in_namespace(namespace: str) -> str:
+        """List all pods in a namespace."""
+        await asyncio.sleep(latency)
+        return json.dumps(_pods(namespace))
+
+    @server.tool()
+    async def pods_get(name: str, namespace: str = "default") -> str:
+        """Get a pod by name."""
+        await asyncio.sleep(latency)
+        pod = _pods(namespace, 1)[0] | {"name": name}
+        return json.dumps(pod | {"containers": [{"name": "app", "image": "quay.io/demo/app:1.4"}]})
+
+    @server.tool()
+    async def pods_log(name: str, namespace: str = "default", tail: int = 100) -> str:
+        """Get the logs of a pod."""
+        await asyncio.sleep(latency)
+        return "\n".join(
+            f"2026-01-01T00:{i // 60:02d}:{i % 60:02d}Z level=info msg=\"request handled\" pod={name}"
+            for i in range(min(tail, 500))
+        )
+
+    @server.tool()
+    async def events_list(namespace: str = "") -> str:
+        """List cluster events."""
+        await asyncio.sleep(latency)
+        return json.dumps([
+            {"type": "Warning", "reason": "BackOff", "object": f"pod/{ns}-pod-3", "namespace": ns,
+             "message": "Back-off restarting failed container"}
+            for ns in ([namespace] if namespace else NAMESPACES)
+        ])
+
+    return server
+
+
+def build_obs_server(latency: float, port: int = 8002, series: int = 4) -> FastMCP:
+    server = FastMCP("obs-mock", port=port, stateless_http=True, log_level="WARNING")
+
+    @server.tool()
+    async def list_metrics() -> str:
+        """List all metric names."""
+        await asyncio.sleep(latency)
+        return json.dumps(METRICS)
+
+    @server.tool()
+    async def get_label_names(metric: str = "") -> str:
+        """List label names, optionally for one metric."""
+        await asyncio.sleep(latency)
+        return json.dumps(["__name__", "namespace", "pod", "container", "node"])
+
+    @server.tool()
+    async def get_label_values(label: str, metric: str = "") -> str:
+        """List values of a label."""
+        await asyncio.sleep(latency)
+        if label == "namespace":
+            return json.dumps(NAMESPACES)
+        return json.dumps([f"{label}-{i}" for i in range(20)])
+
+    @server.tool()
+    async def get_series(match: str, start: str = "", end: str = "") -> str:
+        """Get time series matching a selector."""
+        await asyncio.sleep(latency)
+        return json.dumps([
+            {"__name__": match.split("{")[0], "namespace": ns, "pod": f"{ns}-pod-{i}"}
+            for ns in NAMESPACES for i in range(2)
+        ])
+
+    @server.tool()
+    async def execute_instant_query(query: str, time: str = "") -> str:
+        """Execute a PromQL instant query."""
+        await asyncio.sleep(latency)
+        now = _timestamp("NOW")
+        if query.startswith("ALERTS"):
+            result = [
+                {"metric": {"alertname": "KubePodCrashLooping", "severity": "warning",
+                            "namespace": "demo", "pod": "demo-pod-3", "alertstate": "firing"},
+                 "value": [now, "1"]},
+                {"metric": {"alertname": "TargetDown", "severity": "critical",
+                            "namespace": "openshift-monitoring", "alertstate": "firing"},
+                 "value": [now, "1"]},
+            ]
+        else:
+            result = [
+                {"metric": {"namespace": ns, "pod": f"{ns}-pod-{i}"}, "value": [now, f"{0.1 * (i + 1):.3f}"]}
+                for ns in NAMESPACES for i in range(series)
+            ]
+        return json.dumps({"resultType": "vector", "result": result})
+
+    @server.tool()
+    async def execute_range_query(query: str, start: str, end: str, step: str) -> str:
+        """Execute a PromQL range query."""
+        await asyncio.sleep(latency)
+        first, last, interval = _timestamp(start), _timestamp(end), max(_duration(step), 1.0)
+        timestamps = []
+        t = first
+        while t <= last and len(timestamps) < 11000:
+            timestamps.append(t)
+            t += interval
+        result = [
+            {"metric": {"namespace": "demo", "pod": f"demo-pod-{k}"},
+             "values": [[t, f"{k + 1 + math.sin(t / 600):.4f}"] for t in timestamps]}
+            for k in range(series)
+        ]
+        return json.dumps({"resultType": "matrix", "result": result})
+
+    return server
+
+
+def build_incidents_server(latency: float, port: int = 8003) -> FastMCP:
+    server = FastMCP("incidents-mock", port=port, stateless_http=True, log_level="WARNING")
+
+    @server.tool()
+    async def get_incidents(time_range: str = "", min_severity: str = "") -> str:
+        """Get incidents detected by cluster health monitoring."""
+        await asyncio.sleep(latency)
+        return json.dumps({"incidents": [
+            {
+                "id": "incident-1",
+                "severity": "critical",
+                "status": "firing",
+                "components": ["monitoring", "prometheus-k8s"],
+                "alerts": ["TargetDown", "PrometheusRuleFailures"],
+                "root_cause": "prometheus-k8s-0 is out of memory",
+            },
+            {
+                "id": "incident-2",
+                "severity": "warning",
+                "status": "firing",
+                "components": ["demo"],
+                "alerts": ["KubePodCrashLooping"],
+                "root_cause": "demo-pod-3 fails its readiness probe after a config change",
+            },
+        ]})
+
+    return server
+
+
+def build_servers(latency: float) -> list[FastMCP]:
+    """The three mock MCP servers on their default ports."""
+    return [
+        build_kubernetes_server(latency),
+        build_obs_server(latency),
+        build_incidents_server(latency),
+    ]
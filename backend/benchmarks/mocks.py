@@ -0,0 +1,60 @@
+"""
+Run the mock MCP servers (:8001/:8002/:8003) and the mock LLM in one process.
+
+Usage (from backend/):
+    python -m benchmarks.mocks [--llm-port 8010] [--ttft-ms 300] [--tokens-per-second 80]
+                               [--reply-tokens 120] [--mcp-latency-ms 50] [--script script.json]
+
+Then start the backend against them:
+    OPENAI_API_BASE=http://127.0.0.1:8010/v1 OPENAI_API_KEY=mock poetry run dev
+"""
+
+import argparse
+import asyncio
+import json
+import uvicorn
+from .mock_llm import DEFAULT_SCRIPT, MockLLM, create_app
+from .mock_mcp import build_servers
+
+
+def add_mock_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--llm-port", type=int, default=8010)
+    parser.add_argument("--ttft-ms", type=float, default=300.0, help="Mock LLM time to first token")
+    parser.add_argument("--tokens-per-second", type=float, default=80.0, help="Mock LLM token rate")
+    parser.add_argument("--reply-tokens", type=int, default=120, help="Tokens per mock LLM answer")
+    parser.add_argument("--mcp-latency-ms", type=float, default=50.0, help="Mock MCP tool latency")
+    parser.add_argument("--script", help="JSON tool-call script (default: benchmarks.mock_llm.DEFAULT_SCRIPT)")
+
+
+async def serve_mocks(args: argparse.Namespace) -> None:
+    """Serve all mocks until cancelled."""
+    script = DEFAULT_SCRIPT
+    if args.script:
+        with open(args.script) as f:
+            script = json.load(f)
+    llm = MockLLM(
+        script=script,
+        ttft_ms=args.ttft_ms,
+        tokens_per_second=args.tokens_per_second,
+        reply_tokens=args.reply_tokens,
+    )
+    llm_server = uvicorn.Server(
+        uvicorn.Config(create_app(llm), host="127.0.0.1", port=args.llm_port, log_level="warning")
+    )
+    servers = build_servers(args.mcp_latency_ms / 1000)
+    print(
+        f"Mock LLM on :{args.llm_port}, mock MCP servers on "
+        f"{', '.join(f':{s.settings.port}' for s in servers)}",
+        flush=True,
+    )
+    await asyncio.gather(llm_server.serve(), *(s.run_streamable_http_async() for s in servers))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_mock_arguments(parser)
+    asyncio.run(serve_mocks(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
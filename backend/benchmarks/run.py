@@ -0,0 +1,198 @@
+"""
+Self-contained load benchmark: mocks + backend + load driver, no network needed.
+
+    1. starts benchmarks.mocks (mock MCP servers on :8001/:8002/:8003, mock LLM)
+    2. starts the backend (uvicorn main:app) with OPENAI_API_BASE pointing at the mock LLM
+       and a throwaway session database
+    3. warms up with one turn, then drives /api/chat with benchmarks.load
+    4. reports throughput, p50/p95/p99 time to first event/text and end-to-end latency,
+       and the backend's resident memory growth per session
+
+The exit status is non-zero if any turn failed or p99 end-to-end latency exceeds
+--max-p99-ms, so it can gate CI. Questions routed to openshift_docs_expert (Gemini) are
+not part of the mix since that agent calls Google directly.
+
+Usage (from backend/):
+    python -m benchmarks.run --conversations 50 --concurrency 10 --shape multi --turns 3 \\
+        --ttft-ms 300 --tokens-per-second 80 --json results.json
+"""
+
+from pathlib import Path
+from typing import Optional
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import httpx
+from .load import add_load_arguments, print_summary, run_load, summarize
+from .mocks import add_mock_arguments
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+MCP_PORTS = (8001, 8002, 8003)
+
+
+def _wait_for_port(port: int, timeout: float, process: subprocess.Popen) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"process exited with {process.returncode} before :{port} was up")
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.5):
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise TimeoutError(f"nothing listening on :{port} after {timeout:.0f}s")
+
+
+def _rss_bytes(pid: int) -> Optional[int]:
+    """Resident set size from /proc (Linux); None elsewhere."""
+    try:
+        for line in Path(f"/proc/{pid}/status").read_text().splitlines():
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+
+def _stop(process: Optional[subprocess.Popen]) -> None:
+    if process is None or process.poll() is not None:
+        return
+    process.terminate()
+    try:
+        process.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
+
+def _mock_command(args: argparse.Namespace) -> list[str]:
+    command = [
+        sys.executable, "-m", "benchmarks.mocks",
+        "--llm-port", str(args.llm_port),
+        "--ttft-ms", str(args.ttft_ms),
+        "--tokens-per-second", str(args.tokens_per_second),
+        "--reply-tokens", str(args.reply_tokens),
+        "--mcp-latency-ms", str(args.mcp_latency_ms),
+    ]
+    if args.script:
+        command += ["--script", args.script]
+    return command
+
+
+def _backend_env(args: argparse.Namespace, workdir: Path) -> dict:
+    env = dict(os.environ)
+    env.update({
+        "OPENAI_API_BASE": f"http://127.0.0.1:{args.llm_port}/v1",
+        "OPENAI_API_KEY": "mock",
+        "GOOGLE_API_KEY": env.get("GOOGLE_API_KEY") or "mock",
+        # Offline: no model cost map download, and no Google credential probe (~3s) for
+        # mTLS on every new MCP session
+        "LITELLM_LOCAL_MODEL_COST_MAP": "True",
+        "GOOGLE_API_USE_CLIENT_CERTIFICATE": env.get("GOOGLE_API_USE_CLIENT_CERTIFICATE", "false"),
+        "SESSION_DB_PATH": str(workdir / "sessions.db"),
+        "ARTIFACT_SPILL_DIR": str(workdir / "artifacts"),
+        "LOG_FILE": str(workdir / "backend.log"),
+        "ENVIRONMENT": env.get("ENVIRONMENT", "production"),
+    })
+    return env
+
+
+async def _benchmark(args: argparse.Namespace, backend: subprocess.Popen) -> dict:
+    url = f"http://127.0.0.1:{args.port}/api/chat"
+    warmup = await run_load(url, conversations=1, concurrency=1, mix=["kubernetes"])
+    if warmup.turns[0].error:
+        raise RuntimeError(f"warm-up turn failed: {warmup.turns[0].error}")
+
+    rss_before = _rss_bytes(backend.pid)
+    result = await run_load(
+        url, args.conversations, args.concurrency, args.shape, args.turns, args.mix.split(",")
+    )
+    rss_after = _rss_bytes(backend.pid)
+
+    summary = summarize(result)
+    summary["config"] = {
+        "shape": args.shape,
+        "turns": args.turns if args.shape == "multi" else 1,
+        "concurrency": args.concurrency,
+        "mix": args.mix,
+        "ttft_ms": args.ttft_ms,
+        "tokens_per_second": args.tokens_per_second,
+        "reply_tokens": args.reply_tokens,
+        "mcp_latency_ms": args.mcp_latency_ms,
+    }
+    if rss_before is not None and rss_after is not None:
+        summary["memory"] = {
+            "rss_before_mb": round(rss_before / 2**20, 1),
+            "rss_after_mb": round(rss_after / 2**20, 1),
+            "per_session_kb": round((rss_after - rss_before) / 1024 / max(args.conversations, 1), 1),
+        }
+    async with httpx.AsyncClient() as client:
+        health = (await client.get(f"http://127.0.0.1:{args.port}/health")).json()
+    summary["backend"] = {key: health.get(key) for key in ("session_store", "fast_router", "relay")}
+    return summary
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8100, help="Backend port")
+    parser.add_argument("--startup-timeout", type=float, default=120.0)
+    parser.add_argument("--json", help="Write the results to this file")
+    parser.add_argument("--max-p99-ms", type=float, help="Fail if p99 end-to-end latency exceeds this")
+    add_mock_arguments(parser)
+    add_load_arguments(parser)
+    args = parser.parse_args()
+
+    mocks = backend = None
+    with tempfile.TemporaryDirectory(prefix="adk-bench-") as tmp:
+        workdir = Path(tmp)
+        try:
+            with open(workdir / "mocks.log", "w") as mock_log:
+                mocks = subprocess.Popen(
+                    _mock_command(args), cwd=BACKEND_DIR, stdout=mock_log, stderr=subprocess.STDOUT
+                )
+            for port in (args.llm_port, *MCP_PORTS):
+                _wait_for_port(port, args.startup_timeout, mocks)
+
+            with open(workdir / "backend.stderr", "w") as stderr:
+                backend = subprocess.Popen(
+                    [sys.executable, "-m", "uvicorn", "main:app",
+                     "--host", "127.0.0.1", "--port", str(args.port), "--log-level", "warning"],
+                    cwd=BACKEND_DIR,
+                    env=_backend_env(args, workdir),
+                    stdout=subprocess.DEVNULL,
+                    stderr=stderr,
+                )
+                _wait_for_port(args.port, args.startup_timeout, backend)
+                summary = asyncio.run(_benchmark(args, backend))
+        except Exception:
+            for log in (workdir / "mocks.log", workdir / "backend.stderr"):
+                if log.exists():
+                    print(f"--- {log.name}\n{log.read_text()[-4000:]}", file=sys.stderr)
+            raise
+        finally:
+            _stop(backend)
+            _stop(mocks)
+
+    print_summary(summary)
+    if "memory" in summary:
+        memory = summary["memory"]
+        print(
+            f"backend RSS {memory['rss_before_mb']} -> {memory['rss_after_mb']} MB "
+            f"(~{memory['per_session_kb']} KB per session)"
+        )
+    if args.json:
+        Path(args.json).write_text(json.dumps(summary, indent=2))
+
+    p99 = summary["end_to_end"]["p99_ms"]
+    if summary["errors"] or (args.max_p99_ms and (p99 is None or p99 > args.max_p99_ms)):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
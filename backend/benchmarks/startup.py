@@ -0,0 +1,191 @@
+"""
+Startup benchmark: import time per module and time until a fresh backend answers.
+
+    1. imports main in fresh interpreters with `python -X importtime` and reports the
+       cumulative import time of the slowest modules (median of --runs)
+    2. starts the backend (uvicorn main:app) and measures the time until GET /health
+       answers (the worker is alive) and until GET /ready answers 200 (agents built,
+       LiteLLM imported, MCP servers tried)
+
+No MCP servers or LLM are needed: unreachable MCP servers are reported as degraded and
+do not hold up /ready. Start benchmarks.mocks first to include real tool discovery.
+
+The exit status is non-zero if a measurement exceeds its budget, so it can gate CI:
+    --max-import-ms      cumulative import time of main
+    --max-health-ms      process start to first /health answer
+    --max-ready-ms       process start to /ready answering 200
+    --budget NAME=MS     cumulative import time of one module, e.g. --budget agent=400
+                         (repeatable; a module that is no longer imported passes)
+
+Usage (from backend/):
+    python -m benchmarks.startup --runs 5 --max-import-ms 2500 --max-health-ms 5000 \\
+        --budget agent=400 --budget google.adk.models.lite_llm=0 --json startup.json
+"""
+
+from pathlib import Path
+from typing import Optional
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import httpx
+from .run import BACKEND_DIR, _stop
+
+DEFAULT_BUDGETS_MS = {
+    "main": 2500.0,
+    # The agent package registers factories only; building the agents is the warm-up's job
+    "agent": 400.0,
+}
+
+
+def _env(workdir: Path) -> dict:
+    env = dict(os.environ)
+    env.update({
+        "OPENAI_API_KEY": env.get("OPENAI_API_KEY") or "mock",
+        "GOOGLE_API_KEY": env.get("GOOGLE_API_KEY") or "mock",
+        "LITELLM_LOCAL_MODEL_COST_MAP": "True",
+        "GOOGLE_API_USE_CLIENT_CERTIFICATE": env.get("GOOGLE_API_USE_CLIENT_CERTIFICATE", "false"),
+        "SESSION_DB_PATH": str(workdir / "sessions.db"),
+        "ARTIFACT_SPILL_DIR": str(workdir / "artifacts"),
+        "LOG_FILE": "",
+        "ENVIRONMENT": env.get("ENVIRONMENT", "production"),
+    })
+    return env
+
+
+def parse_importtime(stderr: str) -> dict[str, tuple[int, float]]:
+    """Module -> (nesting depth, cumulative seconds) from `python -X importtime` output."""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        modules[name.strip()] = (depth, int(cumulative) / 1e6)
+    return modules
+
+
+def import_times(env: dict, runs: int) -> dict[str, tuple[int, float]]:
+    """Median cumulative import time per module over runs fresh interpreters."""
+    samples: dict[str, list[float]] = {}
+    depths: dict[str, int] = {}
+    for _ in range(runs):
+        process = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", "import main"],
+            cwd=BACKEND_DIR, env=env, capture_output=True, text=True,
+        )
+        if process.returncode != 0:
+            raise RuntimeError(f"import main failed:\n{process.stderr[-4000:]}")
+        for name, (depth, seconds) in parse_importtime(process.stderr).items():
+            samples.setdefault(name, []).append(seconds)
+            depths[name] = depth
+    return {name: (depths[name], statistics.median(values)) for name, values in samples.items()}
+
+
+def _poll(url: str, process: subprocess.Popen, started: float, timeout: float, status: Optional[int] = None) -> float:
+    """Seconds from started until url answers (with status, if given)."""
+    while time.monotonic() - started < timeout:
+        if process.poll() is not None:
+            raise RuntimeError(f"backend exited with {process.returncode}")
+        try:
+            response = httpx.get(url, timeout=1.0)
+            if status is None or response.status_code == status:
+                return time.monotonic() - started
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.02)
+    raise TimeoutError(f"{url} did not answer within {timeout:.0f}s")
+
+
+def time_to_ready(env: dict, port: int, timeout: float, workdir: Path) -> dict:
+    """Start the backend and time its first /health answer and /ready 200."""
+    with open(workdir / "backend.stderr", "w") as stderr:
+        started = time.monotonic()
+        backend = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "main:app",
+             "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+            cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=stderr,
+        )
+        try:
+            health = _poll(f"http://127.0.0.1:{port}/health", backend, started, timeout)
+            ready = _poll(f"http://127.0.0.1:{port}/ready", backend, started, timeout, status=200)
+            details = httpx.get(f"http://127.0.0.1:{port}/health").json().get("agents", {})
+        except Exception:
+            print(f"--- backend.stderr\n{(workdir / 'backend.stderr').read_text()[-4000:]}", file=sys.stderr)
+            raise
+        finally:
+            _stop(backend)
+    return {"health_ms": round(health * 1000, 1), "ready_ms": round(ready * 1000, 1), "agents": details}
+
+
+def _parse_budget(value: str) -> tuple[str, float]:
+    name, _, ms = value.partition("=")
+    if not name or not ms:
+        raise argparse.ArgumentTypeError(f"expected NAME=MS, got {value!r}")
+    return name.strip(), float(ms)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8100, help="Backend port")
+    parser.add_argument("--runs", type=int, default=3, help="Fresh interpreters to take the median import time of")
+    parser.add_argument("--top", type=int, default=15, help="Slowest modules to report")
+    parser.add_argument("--startup-timeout", type=float, default=120.0)
+    parser.add_argument("--max-import-ms", type=float, help=f"Budget for main (default {DEFAULT_BUDGETS_MS['main']:.0f})")
+    parser.add_argument("--max-health-ms", type=float, default=5000.0)
+    parser.add_argument("--max-ready-ms", type=float)
+    parser.add_argument("--budget", type=_parse_budget, action="append", default=[], metavar="NAME=MS")
+    parser.add_argument("--json", help="Write the results to this file")
+    args = parser.parse_args()
+
+    budgets = dict(DEFAULT_BUDGETS_MS)
+    if args.max_import_ms is not None:
+        budgets["main"] = args.max_import_ms
+    budgets.update(args.budget)
+
+    with tempfile.TemporaryDirectory(prefix="adk-startup-") as tmp:
+        workdir = Path(tmp)
+        env = _env(workdir)
+        modules = import_times(env, max(1, args.runs))
+        startup = time_to_ready(env, args.port, args.startup_timeout, workdir)
+
+    # Top-level imports of main and their direct children are the actionable ones
+    slowest = sorted(
+        ((name, seconds) for name, (depth, seconds) in modules.items() if depth <= 2),
+        key=lambda item: item[1],
+        reverse=True,
+    )[:args.top]
+    print(f"{'module':48}{'cumulative ms':>14}")
+    for name, seconds in slowest:
+        print(f"{name:48}{seconds * 1000:>14.1f}")
+    print(f"\nfirst /health after {startup['health_ms']} ms, /ready after {startup['ready_ms']} ms")
+    for name, ms in startup["agents"].get("warmers_ms", {}).items():
+        print(f"warm-up {name}: {ms} ms")
+
+    failures = []
+    for name, budget in budgets.items():
+        if name in modules and modules[name][1] * 1000 > budget:
+            failures.append(f"import {name}: {modules[name][1] * 1000:.1f} ms > {budget:.0f} ms")
+    for key, budget in (("health_ms", args.max_health_ms), ("ready_ms", args.max_ready_ms)):
+        if budget is not None and startup[key] > budget:
+            failures.append(f"{key}: {startup[key]} ms > {budget:.0f} ms")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps({
+            "import_ms": {name: round(seconds * 1000, 1) for name, (_, seconds) in modules.items()},
+            "startup": startup,
+            "budgets_ms": budgets,
+            "over_budget": failures,
+        }, indent=2))
+
+    for failure in failures:
+        print(f"OVER BUDGET {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
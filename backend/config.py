@@ -15,6 +15,95 @@ Optional Environment Variables:
     CORS_ORIGINS: Comma-separated list of allowed origins (default: http://localhost:3000,http://localhost:8080)
     KUBECONFIG: Path to kubeconfig file (default: ~/.kube/config)
     OPENSHIFT_USER_TOKEN: OpenShift user token for incident detection MCP (optional, for demo purposes)
+    OBS_MCP_URL: obs-mcp-server endpoint used by custom metrics tools (default: http://localhost:8002/mcp)
+    INCIDENTS_MCP_URL: Incident detection MCP server endpoint (default: http://localhost:8003/mcp)
+    HTTP_CLIENT_MAX_CONNECTIONS: Max pooled connections for direct MCP calls (default: 20)
+    HTTP_CLIENT_MAX_KEEPALIVE: Max idle keep-alive connections (default: 10)
+    HTTP_CLIENT_KEEPALIVE_EXPIRY: Seconds an idle connection is kept open (default: 30)
+    HTTP_CLIENT_TIMEOUT: Request timeout in seconds for direct MCP calls (default: 30)
+    HTTP_CLIENT_HTTP2: Use HTTP/2 when the server supports it (default: true)
+    RANGE_CACHE_ENABLED: Cache range query results for graph_timeseries_data (default: true)
+    RANGE_CACHE_MAX_BYTES: Memory budget for the range query cache (default: 67108864)
+    GRAPH_TARGET_POINTS: Target samples per series when the step is auto-selected (default: 240)
+    GRAPH_MIN_STEP_SECONDS: Smallest auto-selected step in seconds (default: 15)
+    GRAPH_MAX_SERIES: Max series returned per graph, the rest are summed into "others" (default: 20)
+    METRIC_CATALOG_ENABLED: Keep a background-refreshed metric catalog for search_metrics (default: true)
+    METRIC_CATALOG_REFRESH_SECONDS: Metric catalog refresh interval (default: 600)
+    METRIC_CATALOG_LABEL_TTL_SECONDS: How long label names/values are cached (default: 900)
+    INCIDENT_SNAPSHOT_ENABLED: Poll incidents and firing alerts in the background and answer
+        from the snapshot with get_incident_snapshot (default: false)
+    INCIDENT_SNAPSHOT_INTERVAL_SECONDS: Incident snapshot poll interval (default: 30)
+    INCIDENT_SNAPSHOT_HISTORY: Snapshot changes kept in the diff history (default: 50)
+    INCIDENT_SNAPSHOT_ALERTS_QUERY: PromQL for the firing alerts (default: ALERTS{alertstate="firing"})
+    DISCOVERY_CACHE_TTLS: Per-tool TTLs (seconds) for cached obs-mcp discovery tools
+        (default: list_metrics=600,get_label_names=300,get_label_values=120); empty disables
+    DISCOVERY_CACHE_MAX_ENTRIES: Max cached discovery results (default: 1000)
+    MCP_MAX_CONCURRENCY: Max concurrent tool calls per MCP server (default: 8)
+    MCP_TOOL_TIMEOUT_SECONDS: Deadline of an MCP tool call, including the wait for a free
+        slot (default: 30)
+    MCP_TOOL_TIMEOUTS: Per-tool deadlines overriding it (default: execute_range_query=60)
+    MCP_BREAKER_FAILURES: Consecutive failures that open a server's circuit breaker (default: 5)
+    MCP_BREAKER_RESET_SECONDS: How long an open breaker fails calls fast before a trial call
+        (default: 30)
+    MCP_RETRIES: Retries of failed read-only tool calls, with jittered backoff (default: 2)
+    MCP_RETRY_BASE_SECONDS: Backoff before the first retry, doubled per retry (default: 0.2)
+    MCP_RETRY_TOOLS: Tool name patterns treated as read-only in addition to MCP readOnlyHint
+        (default: *_list,*_list_*,*_get,*_log,*_top,list_*,get_*,execute_*_query)
+    MCP_COALESCE_ENABLED: Identical concurrent read-only MCP tool calls (same tool and arguments)
+        share one upstream request (default: true)
+    MCP_COALESCE_REUSE_SECONDS: How long a coalesced call's result is also reused by later
+        identical calls; 0 only joins calls in flight (default: 0)
+    MCP_COALESCE_MAX_ENTRIES: Max results kept for reuse per MCP server (default: 1000)
+    MCP_TOOLS_TTL_SECONDS: How long a server's cached tool list is used; refreshed in the
+        background every half TTL (default: 300)
+    MCP_PREWARM_ENABLED: Discover the MCP servers' tools at startup; GET /ready answers 503
+        until every server has been tried. Needs AGENT_PREWARM_ENABLED (default: true)
+    AGENT_PREWARM_ENABLED: Build the agents and import LiteLLM in the background at startup
+        instead of during the first chat request; GET /ready answers 503 until done (default: true)
+    FAST_ROUTER_ENABLED: Route unambiguous queries with a local classifier instead of the router
+        LLM (default: true)
+    RELAY_MODE_ENABLED: Forward single specialist answers instead of having the router LLM
+        re-generate them (default: true)
+    ALERTS_BRANCH_TIMEOUT_SECONDS: Per-branch timeout of the alerts_expert fan-out (default: 90)
+    HISTORY_COMPACTION_ENABLED: Compact old conversation history sent to the LLM (default: true)
+    HISTORY_TOKEN_BUDGET: Estimated prompt tokens above which history is compacted (default: 24000)
+    HISTORY_KEEP_TURNS: Most recent user turns always sent verbatim (default: 3)
+    SESSION_STORE: "sqlite" (shared by all workers) or "memory" (default: sqlite)
+    SESSION_DB_PATH: SQLite session database file (default: sessions.db)
+    SESSION_MAX_EVENTS: Events kept per session in the database (default: 500)
+    SESSION_RECENT_EVENTS: Events loaded into memory per session (default: 100)
+    SESSION_IDLE_TTL_SECONDS: Sessions idle longer than this are evicted (default: 86400)
+    SESSION_MAINTENANCE_INTERVAL_SECONDS: Session store eviction/compaction interval (default: 300)
+    ARTIFACT_STORE_ENABLED: Move large chart payloads out of tool results into the artifact
+        store, served from /api/artifacts/{id} (default: true)
+    ARTIFACT_THRESHOLD_BYTES: Tool results larger than this are stored as artifacts (default: 16384)
+    ARTIFACT_MEMORY_BYTES: Per-worker memory cache of recent artifacts (default: 67108864)
+    ARTIFACT_DISK_BYTES: Disk budget of ARTIFACT_SPILL_DIR, oldest artifacts are deleted first
+        (default: 536870912)
+    ARTIFACT_SPILL_DIR: Directory every artifact is written to, shared by all workers (default:
+        <tmp>/adk-artifacts); empty keeps artifacts in the storing worker's memory only
+    ENVIRONMENT: "development" or "production"; selects default log levels (default: development)
+    LOG_LEVEL: Root log level (default: DEBUG in development, INFO in production)
+    LOG_ADK_LEVEL: google.adk and LiteLLM log level (default: DEBUG in development, WARNING in
+        production)
+    LOG_FILE: Rotating log file, empty to log to stderr only (default: adk_debug.log); in
+        production every process writes its own file with the pid in its name
+    LOG_MAX_BYTES: Log file size at which it is rotated (default: 10485760)
+    LOG_BACKUP_COUNT: Rotated log files kept (default: 5)
+    LOG_MAX_MESSAGE_CHARS: Longer log messages (prompts, tool payloads) are truncated; 0 keeps
+        them whole (default: 4000)
+    LOG_QUEUE_SIZE: Records buffered for the log writer thread before new ones are dropped
+        (default: 10000)
+    SERVER_WORKERS: Worker processes started by `poetry run serve` (default: 2)
+    SERVER_KEEPALIVE_SECONDS: Idle keep-alive timeout, longer than the router's (default: 75)
+    SERVER_BACKLOG: Listen backlog for pending connections (default: 2048)
+    SERVER_DRAIN_SECONDS: How long in-flight chat streams may finish after SIGTERM (default: 25)
+    SERVER_FORWARDED_ALLOW_IPS: Proxies trusted for X-Forwarded-* headers, "*" behind the
+        OpenShift router (default: 127.0.0.1)
+    TELEMETRY_ENABLED: Time LLM calls, tool calls, transfers and the SSE stream, served as
+        Prometheus histograms at /metrics (default: true)
+    OTEL_EXPORTER_OTLP_ENDPOINT: OTLP/HTTP collector to export trace spans to, e.g.
+        http://localhost:4318 (default: unset, no export)
 
 Example .env file:
     OPENAI_API_KEY=sk-...
@@ -28,6 +117,7 @@ Example .env file:
 """
 
 import os
+import tempfile
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -35,6 +125,16 @@ from dotenv import load_dotenv
 load_dotenv()
 
 
+def _parse_float_map(value: str) -> dict[str, float]:
+    """Parse "name=1.5,other=2" into {"name": 1.5, "other": 2.0}."""
+    result = {}
+    for item in value.split(","):
+        name, _, number = item.partition("=")
+        if name.strip() and number.strip():
+            result[name.strip()] = float(number)
+    return result
+
+
 class Config:
     """Application configuration loaded from environment variables."""
 
@@ -56,6 +156,115 @@ class Config:
     # MCP Server Configuration
     KUBECONFIG = os.getenv("KUBECONFIG", str(Path.home() / ".kube" / "config"))
     OPENSHIFT_USER_TOKEN = os.getenv("OPENSHIFT_USER_TOKEN", "")
+    OBS_MCP_URL = os.getenv("OBS_MCP_URL", "http://localhost:8002/mcp")
+    INCIDENTS_MCP_URL = os.getenv("INCIDENTS_MCP_URL", "http://localhost:8003/mcp")
+
+    # Shared HTTP client for direct MCP calls (custom tools)
+    HTTP_CLIENT_MAX_CONNECTIONS = int(os.getenv("HTTP_CLIENT_MAX_CONNECTIONS", "20"))
+    HTTP_CLIENT_MAX_KEEPALIVE = int(os.getenv("HTTP_CLIENT_MAX_KEEPALIVE", "10"))
+    HTTP_CLIENT_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_CLIENT_KEEPALIVE_EXPIRY", "30"))
+    HTTP_CLIENT_TIMEOUT = float(os.getenv("HTTP_CLIENT_TIMEOUT", "30"))
+    HTTP_CLIENT_HTTP2 = os.getenv("HTTP_CLIENT_HTTP2", "true").lower() == "true"
+
+    # Range query cache for graph_timeseries_data
+    RANGE_CACHE_ENABLED = os.getenv("RANGE_CACHE_ENABLED", "true").lower() == "true"
+    RANGE_CACHE_MAX_BYTES = int(os.getenv("RANGE_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+
+    # Range query limits for graph_timeseries_data
+    GRAPH_TARGET_POINTS = int(os.getenv("GRAPH_TARGET_POINTS", "240"))
+    GRAPH_MIN_STEP_SECONDS = float(os.getenv("GRAPH_MIN_STEP_SECONDS", "15"))
+    GRAPH_MAX_SERIES = int(os.getenv("GRAPH_MAX_SERIES", "20"))
+
+    # Metric catalog for search_metrics
+    METRIC_CATALOG_ENABLED = os.getenv("METRIC_CATALOG_ENABLED", "true").lower() == "true"
+    METRIC_CATALOG_REFRESH_SECONDS = float(os.getenv("METRIC_CATALOG_REFRESH_SECONDS", "600"))
+    METRIC_CATALOG_LABEL_TTL_SECONDS = float(os.getenv("METRIC_CATALOG_LABEL_TTL_SECONDS", "900"))
+
+    # Background incident/alert snapshot (agent/tools/incident_snapshot.py)
+    INCIDENT_SNAPSHOT_ENABLED = os.getenv("INCIDENT_SNAPSHOT_ENABLED", "false").lower() == "true"
+    INCIDENT_SNAPSHOT_INTERVAL_SECONDS = float(os.getenv("INCIDENT_SNAPSHOT_INTERVAL_SECONDS", "30"))
+    INCIDENT_SNAPSHOT_HISTORY = int(os.getenv("INCIDENT_SNAPSHOT_HISTORY", "50"))
+    INCIDENT_SNAPSHOT_ALERTS_QUERY = os.getenv("INCIDENT_SNAPSHOT_ALERTS_QUERY", 'ALERTS{alertstate="firing"}')
+
+    # TTL cache in front of the obs-mcp discovery tools
+    DISCOVERY_CACHE_TTLS = _parse_float_map(os.getenv(
+        "DISCOVERY_CACHE_TTLS", "list_metrics=600,get_label_names=300,get_label_values=120"
+    ))
+    DISCOVERY_CACHE_MAX_ENTRIES = int(os.getenv("DISCOVERY_CACHE_MAX_ENTRIES", "1000"))
+
+    # Bulkhead, deadlines, circuit breaker and retries per MCP server
+    MCP_MAX_CONCURRENCY = int(os.getenv("MCP_MAX_CONCURRENCY", "8"))
+    MCP_TOOL_TIMEOUT_SECONDS = float(os.getenv("MCP_TOOL_TIMEOUT_SECONDS", "30"))
+    MCP_TOOL_TIMEOUTS = _parse_float_map(os.getenv("MCP_TOOL_TIMEOUTS", "execute_range_query=60"))
+    MCP_BREAKER_FAILURES = int(os.getenv("MCP_BREAKER_FAILURES", "5"))
+    MCP_BREAKER_RESET_SECONDS = float(os.getenv("MCP_BREAKER_RESET_SECONDS", "30"))
+    MCP_RETRIES = int(os.getenv("MCP_RETRIES", "2"))
+    MCP_RETRY_BASE_SECONDS = float(os.getenv("MCP_RETRY_BASE_SECONDS", "0.2"))
+    MCP_COALESCE_ENABLED = os.getenv("MCP_COALESCE_ENABLED", "true").lower() == "true"
+    MCP_COALESCE_REUSE_SECONDS = float(os.getenv("MCP_COALESCE_REUSE_SECONDS", "0"))
+    MCP_COALESCE_MAX_ENTRIES = int(os.getenv("MCP_COALESCE_MAX_ENTRIES", "1000"))
+    MCP_TOOLS_TTL_SECONDS = float(os.getenv("MCP_TOOLS_TTL_SECONDS", "300"))
+    MCP_PREWARM_ENABLED = os.getenv("MCP_PREWARM_ENABLED", "true").lower() == "true"
+    AGENT_PREWARM_ENABLED = os.getenv("AGENT_PREWARM_ENABLED", "true").lower() == "true"
+    MCP_RETRY_TOOLS = [
+        pattern.strip()
+        for pattern in os.getenv(
+            "MCP_RETRY_TOOLS", "*_list,*_list_*,*_get,*_log,*_top,list_*,get_*,execute_*_query"
+        ).split(",")
+        if pattern.strip()
+    ]
+
+    # Deterministic fast path in front of the router LLM
+    FAST_ROUTER_ENABLED = os.getenv("FAST_ROUTER_ENABLED", "true").lower() == "true"
+
+    # Pass-through relay of specialist answers
+    RELAY_MODE_ENABLED = os.getenv("RELAY_MODE_ENABLED", "true").lower() == "true"
+
+    # Concurrent alerts fan-out (metrics + incidents)
+    ALERTS_BRANCH_TIMEOUT_SECONDS = float(os.getenv("ALERTS_BRANCH_TIMEOUT_SECONDS", "90"))
+
+    # Conversation history compaction
+    HISTORY_COMPACTION_ENABLED = os.getenv("HISTORY_COMPACTION_ENABLED", "true").lower() == "true"
+    HISTORY_TOKEN_BUDGET = int(os.getenv("HISTORY_TOKEN_BUDGET", "24000"))
+    HISTORY_KEEP_TURNS = int(os.getenv("HISTORY_KEEP_TURNS", "3"))
+
+    # Session storage
+    SESSION_STORE = os.getenv("SESSION_STORE", "sqlite").lower()
+    SESSION_DB_PATH = os.getenv("SESSION_DB_PATH", "sessions.db")
+    SESSION_MAX_EVENTS = int(os.getenv("SESSION_MAX_EVENTS", "500"))
+    SESSION_RECENT_EVENTS = int(os.getenv("SESSION_RECENT_EVENTS", "100"))
+    SESSION_IDLE_TTL_SECONDS = float(os.getenv("SESSION_IDLE_TTL_SECONDS", "86400"))
+    SESSION_MAINTENANCE_INTERVAL_SECONDS = float(os.getenv("SESSION_MAINTENANCE_INTERVAL_SECONDS", "300"))
+
+    # Out-of-band artifact store for large tool results
+    ARTIFACT_STORE_ENABLED = os.getenv("ARTIFACT_STORE_ENABLED", "true").lower() == "true"
+    ARTIFACT_THRESHOLD_BYTES = int(os.getenv("ARTIFACT_THRESHOLD_BYTES", "16384"))
+    ARTIFACT_MEMORY_BYTES = int(os.getenv("ARTIFACT_MEMORY_BYTES", str(64 * 1024 * 1024)))
+    ARTIFACT_DISK_BYTES = int(os.getenv("ARTIFACT_DISK_BYTES", str(512 * 1024 * 1024)))
+    ARTIFACT_SPILL_DIR = os.getenv(
+        "ARTIFACT_SPILL_DIR", str(Path(tempfile.gettempdir()) / "adk-artifacts")
+    )
+
+    # Logging (see logging_setup.py)
+    ENVIRONMENT = os.getenv("ENVIRONMENT", "development").lower()
+    LOG_LEVEL = os.getenv("LOG_LEVEL", "").upper()
+    LOG_ADK_LEVEL = os.getenv("LOG_ADK_LEVEL", "").upper()
+    LOG_FILE = os.getenv("LOG_FILE", "adk_debug.log")
+    LOG_MAX_BYTES = int(os.getenv("LOG_MAX_BYTES", str(10 * 1024 * 1024)))
+    LOG_BACKUP_COUNT = int(os.getenv("LOG_BACKUP_COUNT", "5"))
+    LOG_MAX_MESSAGE_CHARS = int(os.getenv("LOG_MAX_MESSAGE_CHARS", "4000"))
+    LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+
+    # Production server (server.py)
+    SERVER_WORKERS = int(os.getenv("SERVER_WORKERS", "2"))
+    SERVER_KEEPALIVE_SECONDS = int(os.getenv("SERVER_KEEPALIVE_SECONDS", "75"))
+    SERVER_BACKLOG = int(os.getenv("SERVER_BACKLOG", "2048"))
+    SERVER_DRAIN_SECONDS = int(os.getenv("SERVER_DRAIN_SECONDS", "25"))
+    SERVER_FORWARDED_ALLOW_IPS = os.getenv("SERVER_FORWARDED_ALLOW_IPS", "127.0.0.1")
+
+    # Per-stage latency telemetry
+    TELEMETRY_ENABLED = os.getenv("TELEMETRY_ENABLED", "true").lower() == "true"
+    OTEL_EXPORTER_OTLP_ENDPOINT = os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT", "")
 
     # Agent Configuration
     AGENT_NAME = "openshift_assistant"
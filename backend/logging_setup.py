@@ -0,0 +1,179 @@
+"""
+Non-blocking logging pipeline for the backend.
+
+With google.adk and litellm at DEBUG, every LLM call logs the full prompt, tool
+declarations and tool payloads. Writing those lines through a FileHandler and a
+StreamHandler on the event loop thread blocks the loop for as long as the disk and the
+terminal take, and adk_debug.log grows without bound. Instead:
+
+    logger.debug(...)  ->  TruncatingQueueHandler  ->  bounded queue  ->  QueueListener thread
+                           (on the loop: truncate,                        ├── RotatingFileHandler
+                            enqueue, never block)                         └── StreamHandler
+
+    - The loop thread only builds the message, truncates it to LOG_MAX_MESSAGE_CHARS and
+      puts it on a bounded queue; formatting and I/O happen on the listener thread
+    - When the queue is full (the disk can't keep up) records are dropped and counted
+      instead of blocking the loop
+    - The log file rotates at LOG_MAX_BYTES and keeps LOG_BACKUP_COUNT backups. Rotation
+      is not safe across processes, so in production (several workers) every process
+      writes its own file with the pid in its name, e.g. adk_debug.1234.log
+    - Levels default per ENVIRONMENT (development: DEBUG for ADK/LiteLLM, production:
+      INFO/WARNING), overridable with LOG_LEVEL and LOG_ADK_LEVEL
+
+Usage:
+    setup_logging()       # once at import time of main.py; stop_logging() runs at exit
+"""
+
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from pathlib import Path
+from typing import Optional
+import atexit
+import copy
+import logging
+import os
+import queue
+from config import config
+
+LOG_FORMAT = "%(asctime)s - %(levelname)s - %(name)s - %(message)s"
+
+# Default (root, google.adk + litellm) levels per environment
+_ENVIRONMENT_LEVELS = {
+    "development": ("DEBUG", "DEBUG"),
+    "production": ("INFO", "WARNING"),
+}
+
+# Loggers that libraries give their own (synchronous) StreamHandler; LiteLLM adds it
+# when it is first imported, which happens lazily on the first LLM call
+_LIBRARY_LOGGERS = frozenset({"LiteLLM", "LiteLLM Router", "LiteLLM Proxy"})
+
+_listener: Optional[QueueListener] = None
+_queue_handler: Optional["TruncatingQueueHandler"] = None
+
+
+class TruncatingQueueHandler(QueueHandler):
+    """QueueHandler that truncates long messages and drops records when the queue is full."""
+
+    def __init__(self, log_queue: queue.Queue, max_message_chars: int):
+        super().__init__(log_queue)
+        self.max_message_chars = max_message_chars
+        self.truncated = 0
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Merge args now (they may not be picklable or may change later) and leave the
+        # formatting (timestamp, level, name) to the listener's handlers
+        message = record.getMessage()
+        if self.max_message_chars and len(message) > self.max_message_chars:
+            self.truncated += 1
+            message = (
+                f"{message[:self.max_message_chars]}… "
+                f"[truncated {len(message) - self.max_message_chars} chars]"
+            )
+        record = copy.copy(record)
+        record.msg = message
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if record.name in _LIBRARY_LOGGERS:
+            # Records of these loggers go through the queue only
+            _detach_library_handlers(record.name)
+        super().emit(record)
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def stats(self) -> dict:
+        return {
+            "queued": self.queue.qsize(),
+            "truncated": self.truncated,
+            "dropped": self.dropped,
+        }
+
+
+def _detach_library_handlers(name: str) -> None:
+    library_logger = logging.getLogger(name)
+    for handler in library_logger.handlers[:]:
+        library_logger.removeHandler(handler)
+
+
+def log_file_path() -> str:
+    """LOG_FILE, with the pid before its suffix in production (one file per worker)."""
+    if config.ENVIRONMENT != "production":
+        return config.LOG_FILE
+    path = Path(config.LOG_FILE)
+    return str(path.with_name(f"{path.stem}.{os.getpid()}{path.suffix}"))
+
+
+def _output_handlers() -> list[logging.Handler]:
+    formatter = logging.Formatter(LOG_FORMAT)
+    handlers: list[logging.Handler] = [logging.StreamHandler()]
+    if config.LOG_FILE:
+        handlers.append(
+            RotatingFileHandler(
+                log_file_path(),
+                maxBytes=config.LOG_MAX_BYTES,
+                backupCount=config.LOG_BACKUP_COUNT,
+                encoding="utf-8",
+            )
+        )
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    return handlers
+
+
+def setup_logging() -> None:
+    """Route all logging through a bounded queue to a background writer thread."""
+    global _listener, _queue_handler
+    if _listener is not None:
+        return
+
+    default_level, default_adk_level = _ENVIRONMENT_LEVELS.get(
+        config.ENVIRONMENT, _ENVIRONMENT_LEVELS["development"]
+    )
+    level = config.LOG_LEVEL or default_level
+    adk_level = config.LOG_ADK_LEVEL or default_adk_level
+
+    log_queue: queue.Queue = queue.Queue(maxsize=config.LOG_QUEUE_SIZE)
+    _queue_handler = TruncatingQueueHandler(log_queue, config.LOG_MAX_MESSAGE_CHARS)
+    _listener = QueueListener(log_queue, *_output_handlers(), respect_handler_level=True)
+    _listener.start()
+    atexit.register(stop_logging)
+
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    root.addHandler(_queue_handler)
+    root.setLevel(level)
+
+    # Component levels; DEBUG on google.adk shows system instructions, conversation
+    # history, tool definitions and tool invocations
+    logging.getLogger("google.adk").setLevel(adk_level)
+    logging.getLogger("litellm").setLevel(adk_level)
+    for name in _LIBRARY_LOGGERS:
+        _detach_library_handlers(name)
+        logging.getLogger(name).setLevel(adk_level)
+    logging.getLogger("ag_ui_adk").setLevel(logging.INFO)  # Reduce noise from AG-UI events
+    logging.getLogger("watchfiles").setLevel(logging.WARNING)  # Reduce noise from file watcher
+    logging.getLogger("uvicorn").setLevel(logging.INFO)  # Reduce uvicorn noise
+
+
+def stop_logging() -> None:
+    """Flush queued records and stop the writer thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def get_logging_stats() -> dict:
+    """Queue depth, truncated and dropped records for GET /health."""
+    if _queue_handler is None:
+        return {"enabled": False}
+    return {"enabled": True, "environment": config.ENVIRONMENT, **_queue_handler.stats()}
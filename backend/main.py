@@ -18,31 +18,52 @@ Key Components:
     - add_adk_fastapi_endpoint(): Exposes the agent via AG-UI protocol at /api/chat
 """
 
+from typing import Optional
+import asyncio
 import logging
-from fastapi import FastAPI
+import os
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
+from ag_ui.core import RunAgentInput
 from ag_ui_adk import ADKAgent, add_adk_fastapi_endpoint
+from google.adk.apps import App
+from sse_starlette.sse import AppStatus
 
-from agent import root_agent
-from config import config
-
-# Configure logging - DEBUG level shows ADK internal flow
-# Including: system instructions, conversation history, tool definitions, tool invocations
-logging.basicConfig(
-    level=logging.DEBUG,
-    format="%(asctime)s - %(levelname)s - %(name)s - %(message)s",
-    handlers=[
-        logging.FileHandler("adk_debug.log"),
-        logging.StreamHandler()
-    ]
+from agent import ROOT_AGENT, agent_registry
+from agent.fast_router import fast_router
+from agent.history import history_compactor
+from agent.relay import response_relay
+from agent.session_store import BoundedSqliteSessionService
+from agent.telemetry import (
+    SSEMetricsMiddleware,
+    configure_otlp_exporter,
+    get_telemetry_stats,
+    registry as metrics_registry,
+    telemetry_plugin,
+)
+from agent.tools.http_client import open_http_client, close_http_client, get_http_client_stats
+from agent.tools.mcp_client import close_mcp_clients
+from agent.tools.artifact_store import artifact_store, choose_encoding, compress, parse_range
+from agent.tools.coalescing import get_coalescing_stats
+from agent.tools.discovery_cache import get_discovery_cache_stats
+from agent.tools.graph_timeseries import get_range_cache_stats
+from agent.tools.incident_snapshot import incident_snapshot
+from agent.tools.metric_catalog import metric_catalog
+from agent.tools.resilience import (
+    get_discovery_status,
+    get_resilience_stats,
+    start_mcp_toolsets,
+    stop_mcp_toolsets,
 )
+from config import config
+from logging_setup import get_logging_stats, setup_logging
+from server import StreamTrackingMiddleware, stream_tracker
 
-# Set specific logger levels for ADK components
-logging.getLogger("google.adk").setLevel(logging.DEBUG)
-logging.getLogger("litellm").setLevel(logging.DEBUG)
-logging.getLogger("ag_ui_adk").setLevel(logging.INFO)  # Reduce noise from AG-UI events
-logging.getLogger("watchfiles").setLevel(logging.WARNING)  # Reduce noise from file watcher
-logging.getLogger("uvicorn").setLevel(logging.INFO)  # Reduce uvicorn noise
+# Configure logging - in development, DEBUG shows ADK internal flow (system instructions,
+# conversation history, tool definitions, tool invocations). Records are written by a
+# background thread so the event loop never waits on the log file (see logging_setup.py)
+setup_logging()
 
 logger = logging.getLogger(__name__)
 
@@ -65,17 +86,63 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Wrap the ADK agent with AG-UI middleware
-adk_agent = ADKAgent(
-    adk_agent=root_agent,
-    app_name=config.AGENT_NAME,
-    user_id="default_user",
-    session_timeout_seconds=3600,
-    use_in_memory_services=True
-)
+# Per-stage latency telemetry (agent/telemetry.py), served at /metrics
+if config.TELEMETRY_ENABLED:
+    app.add_middleware(SSEMetricsMiddleware, paths=["/api/chat"])
+if config.OTEL_EXPORTER_OTLP_ENDPOINT:
+    configure_otlp_exporter(config.OTEL_EXPORTER_OTLP_ENDPOINT, config.AGENT_NAME)
 
-# Expose ADK agent via AG-UI protocol at /api/chat
-add_adk_fastapi_endpoint(app, adk_agent, path="/api/chat")
+# In-flight chat streams, drained on shutdown (server.py). sse-starlette (used by the AG-UI
+# endpoint) ends every stream as soon as uvicorn receives SIGTERM; instead streams keep
+# running until uvicorn's graceful shutdown deadline cancels them
+AppStatus.disable_automatic_graceful_drain()
+app.add_middleware(StreamTrackingMiddleware, tracker=stream_tracker, paths=["/api/chat"])
+
+# Session history lives in SQLite (shared by all workers) unless SESSION_STORE=memory
+session_service = None
+if config.SESSION_STORE == "sqlite":
+    session_service = BoundedSqliteSessionService(
+        config.SESSION_DB_PATH,
+        max_events=config.SESSION_MAX_EVENTS,
+        recent_events=config.SESSION_RECENT_EVENTS,
+        idle_ttl_seconds=config.SESSION_IDLE_TTL_SECONDS,
+        maintenance_interval_seconds=config.SESSION_MAINTENANCE_INTERVAL_SECONDS,
+    )
+
+
+@agent_registry.register("ag_ui")
+def build_adk_agent() -> ADKAgent:
+    # Wrap the ADK agent with AG-UI middleware; the App carries the telemetry plugin
+    adk_app = App(
+        name=config.AGENT_NAME,
+        root_agent=agent_registry.get(ROOT_AGENT),
+        plugins=[telemetry_plugin] if config.TELEMETRY_ENABLED else [],
+    )
+    return ADKAgent.from_app(
+        adk_app,
+        user_id="default_user",
+        session_timeout_seconds=3600,
+        session_service=session_service,
+        use_in_memory_services=session_service is None,
+        # Another worker may still be serving the session; idle sessions are evicted
+        # by the session store's maintenance instead
+        delete_session_on_cleanup=session_service is None,
+    )
+
+
+async def resolve_adk_agent(request: Request, input_data: RunAgentInput) -> ADKAgent:
+    """The AG-UI agent, built by the startup warm-up or, without it, by the first request."""
+    return await agent_registry.aget("ag_ui")
+
+
+# Expose ADK agent via AG-UI protocol at /api/chat. The agent tree is not built at import
+# time (agent/registry.py), so the endpoint resolves it per request instead of taking it here
+add_adk_fastapi_endpoint(app, None, path="/api/chat", agent_resolver=resolve_adk_agent)
+
+# Builds the agents and imports LiteLLM in a worker thread after startup (see startup_event)
+warm_up_task: Optional[asyncio.Task] = None
+# Whether the warm-up started the MCP tool discovery that /ready waits for
+mcp_discovery_started = False
 
 
 @app.get("/")
@@ -95,16 +162,150 @@ async def health():
         "status": "healthy",
         "agent": config.AGENT_NAME,
         "model": config.OPENAI_MODEL,
-        "ag_ui": "enabled"
+        # Everything below is this worker's (see server.py)
+        "worker_pid": os.getpid(),
+        "ag_ui": "enabled",
+        "http_pool": get_http_client_stats(),
+        "range_cache": get_range_cache_stats(),
+        "metric_catalog": metric_catalog.stats(),
+        "incident_snapshot": incident_snapshot.stats(),
+        "agents": agent_registry.stats(),
+        "discovery_cache": get_discovery_cache_stats(),
+        "mcp_servers": get_resilience_stats(),
+        "mcp_coalescing": get_coalescing_stats(),
+        "artifacts": artifact_store.stats(),
+        "fast_router": fast_router.stats(),
+        "relay": response_relay.stats(),
+        "history_compaction": history_compactor.stats(),
+        "session_store": session_service.stats() if session_service else {"type": "memory"},
+        "telemetry": get_telemetry_stats(),
+        "logging": get_logging_stats(),
+        "chat_streams": stream_tracker.stats(),
+    }
+
+
+@app.get("/ready")
+async def ready():
+    """Readiness: 503 until the warm-up is done and every MCP server it started has been tried."""
+    status = {"ready": warm_up_task is None or warm_up_task.done(), "degraded": []}
+    if warm_up_task is not None:
+        status["agents"] = agent_registry.status
+        if agent_registry.status == "failed":
+            # The agents are built on first use instead; no reason to take the pod out of rotation
+            status["degraded"].append("agents")
+    if mcp_discovery_started:
+        discovery = get_discovery_status()
+        status["ready"] = status["ready"] and discovery["ready"]
+        status["degraded"] += discovery["degraded"]
+        status["servers"] = discovery["servers"]
+    return JSONResponse(status, status_code=200 if status["ready"] else 503)
+
+
+@app.get("/metrics")
+async def metrics():
+    """Per-stage latency histograms in the Prometheus text exposition format."""
+    return Response(
+        content=metrics_registry.render(),
+        media_type="text/plain; version=0.0.4; charset=utf-8",
+    )
+
+
+@app.get("/api/artifacts/{artifact_id}")
+async def get_artifact(artifact_id: str, request: Request):
+    """
+    Serve a large tool result stored out of band (see agent/tools/artifact_store.py).
+
+    Artifacts are content-addressed and immutable: the ETag is the id (suffixed with
+    the content coding for compressed responses), If-None-Match answers 304, single
+    byte ranges of the uncompressed payload answer 206 and full responses are
+    compressed with brotli or gzip according to Accept-Encoding.
+    """
+    artifact = await artifact_store.get(artifact_id)
+    if artifact is None:
+        return Response(status_code=404)
+
+    headers = {
+        "ETag": artifact.etag,
+        "Cache-Control": "private, max-age=86400, immutable",
+        "Accept-Ranges": "bytes",
+        "Vary": "Accept-Encoding",
     }
+    # Any representation of the same id has the same content
+    if_none_match = request.headers.get("if-none-match", "")
+    if if_none_match.strip() == "*" or artifact.id in if_none_match:
+        return Response(status_code=304, headers=headers)
+
+    data = artifact.data
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    if range_header and (if_range is None or if_range == artifact.etag):
+        try:
+            byte_range = parse_range(range_header, len(data))
+        except ValueError:
+            headers["Content-Range"] = f"bytes */{len(data)}"
+            return Response(status_code=416, headers=headers)
+        if byte_range is not None:
+            first, last = byte_range
+            headers["Content-Range"] = f"bytes {first}-{last}/{len(data)}"
+            return Response(
+                content=data[first:last + 1],
+                status_code=206,
+                media_type=artifact.content_type,
+                headers=headers,
+            )
+
+    encoding = choose_encoding(request.headers.get("accept-encoding", ""))
+    if encoding:
+        data = await asyncio.to_thread(compress, data, encoding)
+        headers["Content-Encoding"] = encoding
+        headers["ETag"] = f'"{artifact.id}-{encoding}"'
+    return Response(content=data, media_type=artifact.content_type, headers=headers)
+
+
+async def warm_up():
+    """Build the agents and import LiteLLM off the event loop, then discover the MCP tools."""
+    global mcp_discovery_started
+    await agent_registry.warm(["ag_ui"])
+    if config.MCP_PREWARM_ENABLED:
+        await start_mcp_toolsets()
+        mcp_discovery_started = True
 
 
 @app.on_event("startup")
 async def startup_event():
-    """Log startup information."""
+    """Log startup information, open shared clients and start the warm-up."""
+    global warm_up_task
     logger.info(f"Starting {config.AGENT_NAME}")
     logger.info(f"Model: {config.OPENAI_MODEL}")
     logger.info(f"CORS origins: {config.CORS_ORIGINS}")
+    await open_http_client()
+    # Not awaited: /health answers while the agents are built, /ready once they are
+    if config.AGENT_PREWARM_ENABLED:
+        warm_up_task = asyncio.create_task(warm_up())
+    if session_service:
+        await session_service.start()
+    if config.METRIC_CATALOG_ENABLED:
+        await metric_catalog.start()
+    if config.INCIDENT_SNAPSHOT_ENABLED:
+        await incident_snapshot.start()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Close shared clients and release pooled connections."""
+    # Streams cancelled at the drain deadline unwind before their clients are closed
+    await stream_tracker.wait_idle(timeout=2.0)
+    if stream_tracker.cut_off:
+        logger.warning(f"{stream_tracker.cut_off} chat stream(s) were cut off by the shutdown drain deadline")
+    if warm_up_task is not None and not warm_up_task.done():
+        warm_up_task.cancel()
+    await metric_catalog.stop()
+    await incident_snapshot.stop()
+    if session_service:
+        await session_service.stop()
+    await stop_mcp_toolsets()
+    await close_mcp_clients()
+    await close_http_client()
 
 
 def dev():
@@ -124,7 +325,8 @@ def dev():
         host=config.HOST,
         port=config.PORT,
         reload=True,
-        log_level="debug"
+        log_level="debug",
+        timeout_graceful_shutdown=config.SERVER_DRAIN_SECONDS,
     )
 
 
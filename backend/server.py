@@ -0,0 +1,145 @@
+"""
+Production server entry point.
+
+`poetry run dev` runs one process with auto-reload and debug logging. `poetry run serve`
+is what a deployment runs:
+
+    - SERVER_WORKERS uvicorn worker processes sharing one listening socket (forced to 1
+      with SESSION_STORE=memory, since in-memory sessions are not shared between workers;
+      artifacts are, through ARTIFACT_SPILL_DIR)
+    - uvloop and httptools, falling back to asyncio and h11 when they are not installed
+    - keep-alive longer than the OpenShift router's idle timeout, so the router never
+      reuses a connection the backend is about to close, and a listen backlog sized for
+      bursts of long-lived SSE streams
+    - graceful drain on SIGTERM: the listening socket is closed, idle connections are
+      closed, and in-flight /api/chat streams run to RUN_FINISHED for up to
+      SERVER_DRAIN_SECONDS; streams still open after that are cancelled and counted
+
+The deployment's terminationGracePeriodSeconds must be longer than SERVER_DRAIN_SECONDS
+(plus any preStop sleep), otherwise the kubelet kills the pod mid-drain.
+
+Caches, breakers, GET /health and GET /metrics are per worker: each request is answered
+by whichever worker accepted it. /health reports the worker's pid, and /metrics carries
+adk_worker_info{pid="..."}, so scrapes of different workers can be told apart.
+
+Usage:
+    poetry run serve
+"""
+
+from typing import Iterable
+import asyncio
+import importlib.util
+import logging
+import time
+from config import config
+from logging_setup import LOG_FORMAT
+
+logger = logging.getLogger(__name__)
+
+
+class StreamTracker:
+    """Counts in-flight streamed responses and those cut off by the drain deadline."""
+
+    def __init__(self):
+        self.active = 0
+        self.peak = 0
+        self.completed = 0
+        self.cut_off = 0
+
+    async def wait_idle(self, timeout: float) -> bool:
+        """Wait up to timeout seconds for in-flight streams to end; False if some are still open."""
+        deadline = time.monotonic() + timeout
+        while self.active and time.monotonic() < deadline:
+            await asyncio.sleep(0.05)
+        return not self.active
+
+    def stats(self) -> dict:
+        return {
+            "active": self.active,
+            "peak": self.peak,
+            "completed": self.completed,
+            "cut_off": self.cut_off,
+        }
+
+
+class StreamTrackingMiddleware:
+    """ASGI middleware recording streamed responses on the given paths in a StreamTracker."""
+
+    def __init__(self, app, tracker: StreamTracker, paths: Iterable[str]):
+        self.app = app
+        self.tracker = tracker
+        self.paths = set(paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope.get("path", "") not in self.paths:
+            await self.app(scope, receive, send)
+            return
+
+        tracker = self.tracker
+        tracker.active += 1
+        tracker.peak = max(tracker.peak, tracker.active)
+        try:
+            await self.app(scope, receive, send)
+            tracker.completed += 1
+        except asyncio.CancelledError:
+            # uvicorn cancels the request tasks still running at the drain deadline
+            tracker.cut_off += 1
+            raise
+        finally:
+            tracker.active -= 1
+
+
+stream_tracker = StreamTracker()
+
+
+def _pick(module: str, fallback: str) -> str:
+    """The uvicorn loop/http implementation named after module, if it is installed."""
+    if importlib.util.find_spec(module) is not None:
+        return module
+    logger.warning(f"{module} is not installed, using {fallback}")
+    return fallback
+
+
+def serve():
+    """
+    Run the production server.
+
+    Usage:
+        poetry run serve
+
+    This is configured in pyproject.toml:
+        [tool.poetry.scripts]
+        serve = "server:serve"
+    """
+    import uvicorn
+
+    # The supervisor only logs its own lifecycle; workers set up logging in main.py
+    logging.basicConfig(level=logging.INFO, format=LOG_FORMAT)
+    workers = max(1, config.SERVER_WORKERS)
+    if workers > 1 and config.SESSION_STORE == "memory":
+        logger.warning("SESSION_STORE=memory keeps sessions per process, running a single worker")
+        workers = 1
+    if workers > 1 and config.ARTIFACT_STORE_ENABLED and not config.ARTIFACT_SPILL_DIR:
+        logger.warning("ARTIFACT_SPILL_DIR is empty: artifact URLs only resolve on the worker that stored them")
+    logger.info(
+        f"Serving on {config.HOST}:{config.PORT} with {workers} worker(s), "
+        f"keep-alive {config.SERVER_KEEPALIVE_SECONDS}s, drain deadline {config.SERVER_DRAIN_SECONDS}s"
+    )
+    uvicorn.run(
+        "main:app",
+        host=config.HOST,
+        port=config.PORT,
+        workers=workers,
+        loop=_pick("uvloop", "asyncio"),
+        http=_pick("httptools", "h11"),
+        timeout_keep_alive=config.SERVER_KEEPALIVE_SECONDS,
+        backlog=config.SERVER_BACKLOG,
+        timeout_graceful_shutdown=config.SERVER_DRAIN_SECONDS,
+        proxy_headers=True,
+        forwarded_allow_ips=config.SERVER_FORWARDED_ALLOW_IPS,
+        log_level="info",
+    )
+
+
+if __name__ == "__main__":
+    serve()
@@ -0,0 +1,74 @@
+import asyncio
+from typing import AsyncGenerator
+from google.adk.agents import BaseAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event, EventActions
+from google.adk.runners import Runner
+from google.adk.sessions import InMemorySessionService
+from google.genai import types
+from agent.alerts_agent import FanOutAgent
+
+
+def _text(text: str) -> types.Content:
+    return types.Content(role="model", parts=[types.Part(text=text)])
+
+
+class _StreamingBranch(BaseAgent):
+    output_key: str
+
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        call = types.Part(function_call=types.FunctionCall(name="get_incidents", args={}))
+        yield Event(author=self.name, content=types.Content(role="model", parts=[call]))
+        for chunk in ("branch ", "answer"):
+            yield Event(author=self.name, content=_text(chunk), partial=True)
+        yield Event(
+            author=self.name,
+            content=_text("branch answer"),
+            actions=EventActions(state_delta={self.output_key: "branch answer"}),
+        )
+
+
+class _SlowBranch(BaseAgent):
+    output_key: str
+
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        yield Event(author=self.name, content=_text("slow branch thinking"), partial=True)
+        await asyncio.sleep(10)
+        yield Event(author=self.name, content=_text("never"))
+
+
+class _Synthesizer(BaseAgent):
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        yield Event(author=self.name, content=_text("combined answer"))
+
+
+def test_only_the_synthesizer_streams_text_and_both_findings_are_stored():
+    agent = FanOutAgent(
+        name="alerts_expert",
+        branch_timeout_seconds=0.2,
+        sub_agents=[
+            _StreamingBranch(name="fast", output_key="fast_findings"),
+            _SlowBranch(name="slow", output_key="slow_findings"),
+            _Synthesizer(name="synthesizer"),
+        ],
+    )
+    sessions = InMemorySessionService()
+    runner = Runner(app_name="test", agent=agent, session_service=sessions)
+
+    async def main():
+        session = await sessions.create_session(app_name="test", user_id="u")
+        events = [
+            event
+            async for event in runner.run_async(
+                user_id="u", session_id=session.id, new_message=_text("what is firing?")
+            )
+        ]
+        session = await sessions.get_session(app_name="test", user_id="u", session_id=session.id)
+        return events, session.state
+
+    events, state = asyncio.run(main())
+    texts = [p.text for e in events if e.content for p in e.content.parts or [] if p.text]
+    assert texts == ["combined answer"]
+    assert any(e.get_function_calls() for e in events)
+    assert state["fast_findings"] == "branch answer"
+    assert state["slow_findings"].startswith("No result: timed out")
@@ -0,0 +1,48 @@
+import asyncio
+import os
+import time
+from agent.tools.artifact_store import ArtifactStore
+
+
+def test_artifacts_are_readable_from_another_worker(tmp_path):
+    writer = ArtifactStore(memory_bytes=1000, disk_bytes=1000, spill_dir=str(tmp_path))
+    # A second worker sharing the directory, with nothing in memory
+    reader = ArtifactStore(memory_bytes=1000, disk_bytes=1000, spill_dir=str(tmp_path))
+
+    async def main():
+        artifact_id = await writer.put(b'{"a": 1}')
+        return artifact_id, await reader.get(artifact_id)
+
+    artifact_id, artifact = asyncio.run(main())
+    assert artifact.data == b'{"a": 1}' and artifact.content_type == "application/json"
+    assert reader.disk_reads == 1
+    assert not [p for p in os.listdir(tmp_path) if p.endswith(".tmp")]
+
+
+def test_memory_eviction_keeps_the_artifact_on_disk(tmp_path):
+    store = ArtifactStore(memory_bytes=10, disk_bytes=1000, spill_dir=str(tmp_path))
+
+    async def main():
+        first = await store.put(b"x" * 8)
+        await store.put(b"y" * 8)
+        return first, await store.get(first)
+
+    first, artifact = asyncio.run(main())
+    assert first not in store._memory and artifact.data == b"x" * 8
+
+
+def test_prune_deletes_the_oldest_files_beyond_the_disk_budget(tmp_path):
+    store = ArtifactStore(memory_bytes=1000, disk_bytes=40, spill_dir=str(tmp_path))
+
+    async def main():
+        ids = [await store.put(bytes([65 + i]) * 10) for i in range(4)]
+        for age, artifact_id in enumerate(reversed(ids)):
+            mtime = time.time() - 100 * (age + 1)
+            os.utime(tmp_path / artifact_id, (mtime, mtime))
+        store._prune()
+        return ids
+
+    ids = asyncio.run(main())
+    # 4 files of 27 bytes (content type line + payload): only the newest fits
+    assert sorted(os.listdir(tmp_path)) == [ids[-1]]
+    assert store.evictions == 3
@@ -0,0 +1,128 @@
+import asyncio
+import pytest
+from google.adk.tools.base_toolset import BaseToolset
+from agent.telemetry import registry
+from agent.tools.coalescing import CoalescingToolset
+from agent.tools.discovery_cache import DiscoveryCacheToolset
+from agent.tools.ttl_cache import TTLCache
+
+
+class _Loader:
+    def __init__(self, value=None, error: Exception = None):
+        self.value = value
+        self.error = error
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(0.02)
+        if self.error is not None:
+            raise self.error
+        return self.value
+
+
+def test_cancelled_leader_does_not_cancel_the_load_for_joiners():
+    cache = TTLCache(max_entries=10)
+    loader = _Loader({"incidents": []})
+
+    async def main():
+        leader = asyncio.create_task(cache.get_or_load("k", loader, ttl=0))
+        await asyncio.sleep(0)
+        joiner = asyncio.create_task(cache.get_or_load("k", loader, ttl=0))
+        await asyncio.sleep(0.005)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await joiner
+
+    assert asyncio.run(main()) == {"incidents": []}
+    assert loader.calls == 1 and cache.coalesced == 1
+
+
+def test_error_results_are_shared_but_not_cached():
+    cache = TTLCache(max_entries=10)
+    loader = _Loader({"isError": True})
+
+    async def main():
+        shared = await asyncio.gather(*(
+            cache.get_or_load("k", loader, ttl=60, cacheable=lambda r: not r.get("isError"))
+            for _ in range(3)
+        ))
+        again = await cache.get_or_load("k", loader, ttl=60, cacheable=lambda r: not r.get("isError"))
+        return shared, again
+
+    shared, again = asyncio.run(main())
+    assert shared == [{"isError": True}] * 3 and again == {"isError": True}
+    assert loader.calls == 2 and cache.hits == 0
+
+
+def test_exceptions_are_shared_but_not_cached():
+    cache = TTLCache(max_entries=10)
+    loader = _Loader(error=ConnectionError("refused"))
+
+    async def main():
+        results = await asyncio.gather(
+            *(cache.get_or_load("k", loader, ttl=60) for _ in range(3)), return_exceptions=True
+        )
+        with pytest.raises(ConnectionError):
+            await cache.get_or_load("k", loader, ttl=60)
+        return results
+
+    assert all(isinstance(r, ConnectionError) for r in asyncio.run(main()))
+    assert loader.calls == 2
+
+
+class _Tool:
+    name = "get_incidents"
+
+    def __init__(self):
+        self.calls = 0
+
+    async def run_async(self, *, args, tool_context):
+        self.calls += 1
+        await asyncio.sleep(0.02)
+        return {"content": [{"type": "text", "text": "[]"}], "isError": False}
+
+
+class _Inner(BaseToolset):
+    async def get_tools(self, readonly_context=None):
+        return []
+
+    async def close(self):
+        pass
+
+
+def test_coalesced_callers_get_independent_copies():
+    toolset = CoalescingToolset(
+        _Inner(), name="test", reuse_seconds=0, max_entries=10, read_only_tools=["get_*"]
+    )
+    tool = _Tool()
+
+    async def main():
+        return await asyncio.gather(*(toolset.call_tool(tool, {}, None) for _ in range(3)))
+
+    results = asyncio.run(main())
+    assert tool.calls == 1
+    results[0]["content"][0]["text"] = "modified"
+    assert results[1]["content"][0]["text"] == "[]" and results[2]["content"][0]["text"] == "[]"
+    assert results[1] is not results[2]
+
+
+def test_discovery_cache_reports_per_tool_metrics():
+    toolset = DiscoveryCacheToolset(
+        _Inner(), name="metrics-test", ttls={"get_incidents": 60}, max_entries=10
+    )
+    tool = _Tool()
+
+    async def main():
+        await asyncio.gather(*(toolset.call_tool(tool, {}, None) for _ in range(2)))
+        await toolset.call_tool(tool, {}, None)
+
+    asyncio.run(main())
+    assert tool.calls == 1
+    stats = toolset.stats()["tools"]["get_incidents"]
+    assert (stats["hits"], stats["misses"], stats["coalesced"]) == (1, 1, 1)
+    metrics = registry.render()
+    labels = 'toolset="metrics-test",tool="get_incidents"'
+    assert f'adk_discovery_cache_lookups{{{labels},outcome="hit"}} 1' in metrics
+    assert f"adk_discovery_cache_hit_ratio{{{labels}}} 0.667" in metrics
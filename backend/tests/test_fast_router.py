@@ -0,0 +1,23 @@
+from google.adk.models import LlmRequest
+from google.genai import types
+from agent.fast_router import _turn_start_text
+
+
+def _request(*contents: types.Content) -> LlmRequest:
+    return LlmRequest(contents=list(contents))
+
+
+def _user(text: str) -> types.Content:
+    return types.Content(role="user", parts=[types.Part(text=text)])
+
+
+def test_user_message_starts_the_turn():
+    assert _turn_start_text(_request(_user("show pods in foo"))) == "show pods in foo"
+
+
+def test_relayed_agent_output_does_not_start_the_turn():
+    relayed = types.Content(role="user", parts=[
+        types.Part(text="For context: below is a transcript of what another agent did"),
+        types.Part(text="[kubernetes_expert] said: 3 pods are running in foo"),
+    ])
+    assert _turn_start_text(_request(_user("show pods in foo"), relayed)) is None
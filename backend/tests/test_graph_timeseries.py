@@ -0,0 +1,9 @@
+import asyncio
+import json
+from agent.tools.graph_timeseries import graph_timeseries_data
+
+
+def test_max_points_below_three_is_rejected():
+    for max_points in (0, 2, -5):
+        result = json.loads(asyncio.run(graph_timeseries_data("up", "Up", max_points=max_points)))
+        assert result["error"] == f"max_points must be at least 3, got {max_points}"
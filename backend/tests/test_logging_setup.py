@@ -0,0 +1,15 @@
+import os
+import logging_setup
+from config import config
+
+
+def test_log_file_is_shared_in_development(monkeypatch):
+    monkeypatch.setattr(config, "ENVIRONMENT", "development")
+    monkeypatch.setattr(config, "LOG_FILE", "logs/adk_debug.log")
+    assert logging_setup.log_file_path() == "logs/adk_debug.log"
+
+
+def test_log_file_is_per_process_in_production(monkeypatch):
+    monkeypatch.setattr(config, "ENVIRONMENT", "production")
+    monkeypatch.setattr(config, "LOG_FILE", "logs/adk_debug.log")
+    assert logging_setup.log_file_path() == f"logs/adk_debug.{os.getpid()}.log"
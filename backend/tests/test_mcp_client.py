@@ -0,0 +1,57 @@
+import asyncio
+import itertools
+import pytest
+from agent.tools.mcp_client import MCPClient, MCPClientError, _SessionExpired
+
+
+class FakeServer:
+    """Stands in for MCPClient._post: sessions are "s1", "s2", ...; expired ones answer 404."""
+
+    def __init__(self, client: MCPClient, expired: set[str]):
+        self.client = client
+        self.expired = expired
+        self.sessions = itertools.count(1)
+        self.initializes = 0
+
+    async def post(self, message: dict):
+        # Like the Mcp-Session-Id header, the session is taken when the request is sent
+        session = self.client._session_id
+        await asyncio.sleep(0.01)
+        if message.get("method") == "initialize":
+            self.initializes += 1
+            self.client._session_id = f"s{next(self.sessions)}"
+            return {"id": message["id"], "result": {"protocolVersion": "2025-06-18"}}
+        if "id" not in message:
+            return None
+        if session in self.expired:
+            raise _SessionExpired()
+        return {"id": message["id"], "result": {"session": session}}
+
+
+def _client(expired: set[str]) -> tuple[MCPClient, FakeServer]:
+    client = MCPClient("http://mcp.test/mcp")
+    server = FakeServer(client, expired)
+    client._post = server.post
+    return client, server
+
+
+def test_concurrent_expiry_reinitializes_once():
+    async def run():
+        client, server = _client(expired={"s1"})
+        await client._initialize()
+        results = await asyncio.gather(*(client.request("tools/call") for _ in range(5)))
+        return server.initializes, results
+
+    initializes, results = asyncio.run(run())
+    assert initializes == 2
+    assert results == [{"session": "s2"}] * 5
+
+
+def test_repeated_expiry_raises_client_error():
+    async def run():
+        client, _ = _client(expired={"s1", "s2"})
+        await client._initialize()
+        await client.request("tools/call")
+
+    with pytest.raises(MCPClientError):
+        asyncio.run(run())
@@ -0,0 +1,24 @@
+import asyncio
+from agent.tools.metric_catalog import MetricCatalog
+
+
+class _Catalog(MetricCatalog):
+    def __init__(self):
+        super().__init__(refresh_seconds=60, label_ttl_seconds=60)
+        self.calls = 0
+
+    async def _call(self, tool, arguments):
+        self.calls += 1
+        await asyncio.sleep(0.02)
+        return ["up", "node_cpu_seconds_total"]
+
+
+def test_concurrent_ensure_loaded_lists_metrics_once():
+    catalog = _Catalog()
+
+    async def main():
+        await asyncio.gather(*(catalog.ensure_loaded() for _ in range(5)))
+
+    asyncio.run(main())
+    assert catalog.calls == 1
+    assert catalog.size == 2
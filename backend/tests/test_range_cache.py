@@ -0,0 +1,53 @@
+import asyncio
+from agent.tools.range_cache import RangeQueryCache
+
+
+def _matrix(start: float, end: float, step: float = 60) -> dict:
+    values = [[start + i * step, "1"] for i in range(int((end - start) // step) + 1)]
+    return {"resultType": "matrix", "result": [{"metric": {"job": "a"}, "values": values}]}
+
+
+async def _fetch(start: float, end: float) -> dict:
+    return _matrix(start, end)
+
+
+def _accounted(cache: RangeQueryCache) -> int:
+    return sum(entry.size for entry in cache._entries.values())
+
+
+def test_partial_hit_reinserts_entry_evicted_during_fetch():
+    cache = RangeQueryCache(max_bytes=10**6)
+
+    async def evicting_fetch(start, end):
+        cache._bytes -= cache._entries.pop(("up", 60)).size
+        return _matrix(start, end)
+
+    async def main():
+        await cache.get_range("up", 0, 600, 60, _fetch)
+        _, outcome = await cache.get_range("up", 0, 1200, 60, evicting_fetch)
+        assert outcome == "partial"
+
+    asyncio.run(main())
+    assert ("up", 60) in cache._entries
+    assert cache._bytes == _accounted(cache)
+
+
+def test_partial_hit_leaves_entry_replaced_during_fetch_accounted():
+    cache = RangeQueryCache(max_bytes=10**6)
+
+    async def replacing_fetch(start, end):
+        # A miss for the same key while this fetch is in flight stores a new entry
+        cache._bytes -= cache._entries.pop(("up", 60)).size
+        await cache.get_range("up", 0, 300, 60, _fetch)
+        return _matrix(start, end)
+
+    async def main():
+        await cache.get_range("up", 0, 600, 60, _fetch)
+        entry = cache._entries[("up", 60)]
+        data, outcome = await cache.get_range("up", 0, 1200, 60, replacing_fetch)
+        assert outcome == "partial"
+        assert len(data["result"][0]["values"]) == 21
+        assert cache._entries[("up", 60)] is not entry
+
+    asyncio.run(main())
+    assert cache._bytes == _accounted(cache)
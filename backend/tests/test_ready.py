@@ -0,0 +1,35 @@
+import asyncio
+import pytest
+from fastapi.testclient import TestClient
+import main
+from agent.registry import agent_registry
+
+
+@pytest.fixture
+def client(monkeypatch):
+    # Without the startup hook: the tests set the warm-up state themselves
+    monkeypatch.setattr(main, "warm_up_task", None)
+    monkeypatch.setattr(main, "mcp_discovery_started", False)
+    return TestClient(main.app)
+
+
+def _finished_task():
+    loop = asyncio.new_event_loop()
+    task = loop.create_task(asyncio.sleep(0))
+    loop.run_until_complete(task)
+    loop.close()
+    return task
+
+
+def test_ready_without_warm_up_ignores_discovery(client, monkeypatch):
+    monkeypatch.setattr(main.config, "MCP_PREWARM_ENABLED", True)
+    response = client.get("/ready")
+    assert response.status_code == 200 and "servers" not in response.json()
+
+
+def test_failed_warm_up_is_ready_but_degraded(client, monkeypatch):
+    monkeypatch.setattr(main, "warm_up_task", _finished_task())
+    monkeypatch.setattr(agent_registry, "status", "failed")
+    response = client.get("/ready")
+    assert response.status_code == 200
+    assert response.json()["degraded"] == ["agents"]
@@ -0,0 +1,192 @@
+import asyncio
+import time
+import pytest
+from google.adk.tools.base_toolset import BaseToolset
+from agent.tools.mcp_client import MCPClient, MCPClientError
+from agent.tools.resilience import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    ResilientToolset,
+    ServerGuard,
+    _guards,
+    server_guard,
+)
+
+
+def _guard(**kwargs) -> ServerGuard:
+    settings = {"max_concurrency": 4, "timeout": 1.0, "retries": 2, "retry_base_seconds": 0.0}
+    return ServerGuard("test", **{**settings, **kwargs})
+
+
+def _open_breaker(breaker: CircuitBreaker) -> None:
+    for _ in range(breaker.failure_threshold):
+        breaker.record_failure()
+    breaker.opened_at = time.monotonic() - breaker.reset_seconds
+
+
+def test_half_open_breaker_allows_a_single_trial():
+    breaker = CircuitBreaker(failure_threshold=2, reset_seconds=10)
+    _open_breaker(breaker)
+    assert breaker.allow()
+    assert breaker.state == HALF_OPEN
+    assert not breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    assert breaker.allow()
+
+
+def test_failed_trial_reopens_and_released_trial_frees_the_slot():
+    breaker = CircuitBreaker(failure_threshold=2, reset_seconds=10)
+    _open_breaker(breaker)
+    assert breaker.allow()
+    breaker.release()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert not breaker.allow()
+    assert breaker.times_opened == 2
+
+
+def test_read_only_calls_are_retried_until_they_succeed():
+    guard = _guard()
+    attempts = []
+
+    async def run():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise ConnectionError("refused")
+        return {"content": [], "isError": False}
+
+    result = asyncio.run(guard.call("list_pods", run, read_only=True))
+    assert result == {"content": [], "isError": False}
+    assert len(attempts) == 3 and guard.retried == 2 and guard.failures == 2
+
+
+def test_other_calls_are_not_retried():
+    guard = _guard()
+    attempts = []
+
+    async def run():
+        attempts.append(1)
+        raise ConnectionError("refused")
+
+    result = asyncio.run(guard.call("delete_pod", run, read_only=False))
+    assert result["isError"] and "failed to run delete_pod" in result["content"][0]["text"]
+    assert len(attempts) == 1 and guard.retried == 0
+
+
+def test_retries_stop_once_the_breaker_opens():
+    guard = _guard(failure_threshold=2, retries=5)
+    attempts = []
+
+    async def run():
+        attempts.append(1)
+        raise ConnectionError("refused")
+
+    asyncio.run(guard.call("list_pods", run, read_only=True))
+    assert len(attempts) == 2 and guard.breaker.state == OPEN
+    result = asyncio.run(guard.call("list_pods", run, read_only=True))
+    assert "unavailable" in result["content"][0]["text"]
+    assert len(attempts) == 2 and guard.short_circuited == 1
+
+
+def test_call_without_a_free_slot_is_rejected_as_busy():
+    guard = _guard(max_concurrency=1, timeout=0.05, tool_timeouts={"slow_query": 1.0})
+
+    async def slow():
+        await asyncio.sleep(0.2)
+        return {"content": [], "isError": False}
+
+    async def main():
+        holder = asyncio.create_task(guard.call("slow_query", slow, read_only=True))
+        await asyncio.sleep(0.01)
+        rejected = await guard.call("list_pods", slow, read_only=True)
+        return await holder, rejected
+
+    held, rejected = asyncio.run(main())
+    assert held == {"content": [], "isError": False}
+    assert "busy" in rejected["content"][0]["text"] and guard.rejected == 1
+    # A full bulkhead says nothing about the server's health
+    assert guard.breaker.state == CLOSED and guard.breaker.consecutive_failures == 0
+
+
+def test_slot_wait_counts_against_the_call_deadline():
+    guard = _guard(max_concurrency=1, tool_timeouts={"slow_query": 1.0, "list_pods": 0.3})
+
+    async def slow():
+        await asyncio.sleep(0.2)
+        return {"content": [], "isError": False}
+
+    async def main():
+        holder = asyncio.create_task(guard.call("slow_query", slow, read_only=False))
+        await asyncio.sleep(0.01)
+        started = time.monotonic()
+        # Gets the slot after ~0.19s, so the 0.2s call overruns the 0.3s deadline
+        late = await guard.call("list_pods", slow, read_only=False)
+        return await holder, late, time.monotonic() - started
+
+    held, late, elapsed = asyncio.run(main())
+    assert held == {"content": [], "isError": False}
+    assert "no response within 0.3s" in late["content"][0]["text"]
+    assert guard.timeouts == 1 and elapsed < 0.35
+    assert guard.in_flight == 0 and not guard._slots.locked()
+
+
+def test_direct_client_calls_share_the_server_guard(monkeypatch):
+    url = "http://mcp.test:9000/mcp"
+    client = MCPClient(url)
+    calls = []
+
+    async def request(method, params=None):
+        calls.append(params["name"])
+        if params["name"] == "bad_query":
+            raise MCPClientError("invalid PromQL")
+        raise ConnectionError("refused")
+
+    monkeypatch.setattr(client, "request", request)
+    monkeypatch.setattr("agent.tools.resilience.config.MCP_BREAKER_FAILURES", 1)
+    try:
+        with pytest.raises(MCPClientError):
+            asyncio.run(client.call_tool("bad_query", {}))
+        guard = server_guard(url)
+        assert guard.name == "mcp.test:9000" and guard.failures == 0
+        result = asyncio.run(client.call_tool("execute_instant_query", {}))
+        assert result["isError"] and guard.breaker.state == OPEN
+        assert calls == ["bad_query", "execute_instant_query"]
+    finally:
+        _guards.pop(url, None)
+
+
+class _SlowToolset(BaseToolset):
+    def __init__(self):
+        super().__init__()
+        self.lists = 0
+
+    async def get_tools(self, readonly_context=None):
+        self.lists += 1
+        await asyncio.sleep(0.05)
+        return []
+
+    async def close(self):
+        pass
+
+
+def test_concurrent_discovery_shares_one_tools_list():
+    inner = _SlowToolset()
+    toolset = ResilientToolset(inner, name="test", guard=_guard())
+
+    async def main():
+        cancelled = asyncio.create_task(toolset.get_tools())
+        waiting = [asyncio.create_task(toolset.get_tools()) for _ in range(5)]
+        await asyncio.sleep(0.01)
+        cancelled.cancel()
+        results = await asyncio.gather(*waiting)
+        # Fresh now: served from the cache
+        await toolset.get_tools()
+        return results
+
+    assert asyncio.run(main()) == [[]] * 5
+    assert inner.lists == 1
+    assert toolset.discovery_status() == "ok"
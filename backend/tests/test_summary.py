@@ -0,0 +1,23 @@
+import warnings
+from agent.tools.summary import summarize_matrix
+
+
+def test_series_without_values_have_zero_points():
+    data = {"result": [{"metric": {"pod": "a"}, "values": []}, {"metric": {"pod": "b"}}]}
+    assert summarize_matrix(data) == [
+        {"labels": {"pod": "a"}, "points": 0},
+        {"labels": {"pod": "b"}, "points": 0},
+    ]
+
+
+def test_empty_series_next_to_one_with_values():
+    data = {"result": [
+        {"metric": {"pod": "a"}, "values": []},
+        {"metric": {"pod": "b"}, "values": [[0, "1"], [60, "3"]]},
+    ]}
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        empty, full = summarize_matrix(data)
+    assert empty == {"labels": {"pod": "a"}, "points": 0}
+    assert full["points"] == 2 and full["max"] == 3.0 and full["last"] == 3.0
+    assert full["mean"] == 2.0
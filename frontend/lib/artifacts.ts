@@ -0,0 +1,32 @@
+/**
+ * Resolver for graph tool results stored out of band in the backend artifact store
+ * (see backend/agent/tools/artifact_store.py).
+ *
+ * Large results arrive without their "data" and carry an artifact_url instead;
+ * fetching it returns the complete tool result. The browser handles compression
+ * and ETag revalidation.
+ */
+
+export interface ArtifactReference {
+  artifact_id: string;
+  /** Path relative to the backend, e.g. "/api/artifacts/<id>" */
+  artifact_url: string;
+  artifact_bytes: number;
+}
+
+export function isArtifactReference(result: unknown): result is ArtifactReference {
+  return (
+    typeof result === "object" &&
+    result !== null &&
+    typeof (result as { artifact_url?: unknown }).artifact_url === "string"
+  );
+}
+
+export async function resolveArtifact<T>(result: T | ArtifactReference, backendUrl: string): Promise<T> {
+  if (!isArtifactReference(result)) return result;
+  const response = await fetch(new URL(result.artifact_url, backendUrl));
+  if (!response.ok) {
+    throw new Error(`Failed to load artifact ${result.artifact_id}: ${response.status}`);
+  }
+  return (await response.json()) as T;
+}
@@ -0,0 +1,74 @@
+/**
+ * Decoder for the columnar-v1 time-series encoding returned by
+ * graph_timeseries_data(encoding="columnar") (see backend/agent/tools/columnar.py).
+ *
+ * Chart components can consume either the decoded columns directly (shared x axis,
+ * numeric y arrays with NaN gaps) or convert back to Prometheus matrix format.
+ */
+
+export interface ColumnarPayload {
+  encoding: "columnar-v1";
+  resultType: "matrix";
+  /** First timestamp (epoch seconds), then deltas to the previous timestamp */
+  timestamps: number[];
+  /** Labels shared by every series */
+  common_labels: Record<string, string>;
+  series: {
+    labels: Record<string, string>;
+    /** One entry per axis timestamp; null means no sample */
+    values: (number | null)[];
+  }[];
+}
+
+export interface DecodedSeries {
+  labels: Record<string, string>;
+  values: Float64Array;
+}
+
+export interface DecodedColumns {
+  timestamps: Float64Array;
+  series: DecodedSeries[];
+}
+
+export interface MatrixResult {
+  resultType: "matrix";
+  result: { metric: Record<string, string>; values: [number, string][] }[];
+}
+
+export function isColumnar(data: unknown): data is ColumnarPayload {
+  return (
+    typeof data === "object" &&
+    data !== null &&
+    (data as { encoding?: string }).encoding === "columnar-v1"
+  );
+}
+
+export function decodeColumnar(payload: ColumnarPayload): DecodedColumns {
+  const timestamps = new Float64Array(payload.timestamps.length);
+  let t = 0;
+  payload.timestamps.forEach((delta, i) => {
+    t = i === 0 ? delta : t + delta;
+    timestamps[i] = t;
+  });
+
+  const series = payload.series.map((s) => ({
+    labels: { ...payload.common_labels, ...s.labels },
+    values: Float64Array.from(s.values, (v) => (v === null ? NaN : v)),
+  }));
+
+  return { timestamps, series };
+}
+
+export function columnarToMatrix(payload: ColumnarPayload): MatrixResult {
+  const { timestamps, series } = decodeColumnar(payload);
+  return {
+    resultType: "matrix",
+    result: series.map((s) => {
+      const values: [number, string][] = [];
+      s.values.forEach((v, i) => {
+        if (!Number.isNaN(v)) values.push([timestamps[i], String(v)]);
+      });
+      return { metric: s.labels, values };
+    }),
+  };
+}